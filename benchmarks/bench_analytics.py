@@ -0,0 +1,75 @@
+"""
+Time the trend analytics in src/data/analytics.py on synthetic snapshots:
+
+    python -m benchmarks.bench_analytics --rows 1000000 10000000
+
+Text columns are generated as categoricals, as the Parquet cache stores them,
+so 10M rows fit in a few GB of memory.
+"""
+import time
+import argparse
+import resource
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import CATEGORIES
+from src.data import analytics
+
+
+def make_snapshots(rows, videos_per_day=200, seed=0):
+    """Snapshots of about `rows / 4` videos, each trending on several days, with growing counts."""
+    rng = np.random.default_rng(seed)
+    n_videos = max(rows // 4, 1)
+    day = np.arange(rows) // videos_per_day
+    video = rng.integers(0, n_videos, rows)
+    # Views grow with the trending day, so consecutive snapshots have positive velocity
+    base = rng.lognormal(12, 1.5, n_videos)
+    views = (base[video] * (1 + day / day.max() * rng.uniform(0.5, 3, rows))).astype(np.int64)
+
+    video_ids = pd.Categorical.from_codes(video, [f"vid{v:08d}" for v in range(n_videos)])
+    category_codes = video % len(CATEGORIES)
+    return pd.DataFrame({
+        "video_id": video_ids,
+        "title": pd.Categorical.from_codes(video, [f"Synthetic trending video {v}" for v in range(n_videos)]),
+        "channelTitle": pd.Categorical.from_codes(video % 5000, [f"Channel {c}" for c in range(5000)]),
+        "category_name": pd.Categorical.from_codes(category_codes, list(CATEGORIES.values())),
+        "thumbnail_link": pd.Categorical.from_codes(
+            video, [f"https://i.ytimg.com/vi/vid{v:08d}/default.jpg" for v in range(n_videos)]
+        ),
+        "trending_date": pd.Timestamp("2020-08-12", tz="UTC") + pd.to_timedelta(day, unit="D"),
+        "view_count": views,
+        "likes": (views * rng.uniform(0.01, 0.08, rows)).astype(np.int64),
+        "dislikes": (views * rng.uniform(0.0, 0.004, rows)).astype(np.int64),
+        "comment_count": (views * rng.uniform(0.0, 0.01, rows)).astype(np.int64),
+    })
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<32} {seconds:>8.2f} s  {rows / seconds / 1e6:>7.2f} M rows/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = make_snapshots(rows)
+        print(f"{rows:,} rows ({df.memory_usage(deep=True).sum() / 2**20:,.0f} MB)")
+        snapshots, first = timed("sort_snapshots", lambda: analytics.sort_snapshots(df), rows)
+        timed("video_velocity", lambda: analytics.video_velocity(snapshots, presorted=first), rows)
+        timed("engagement_ratios", lambda: analytics.engagement_ratios(df), rows)
+        timed("time_on_trending", lambda: analytics.time_on_trending(snapshots, presorted=first), rows)
+        timed("category_share (weekly)", lambda: analytics.category_share(df, freq="W"), rows)
+        timed("channel_share (weekly, top 20)", lambda: analytics.channel_share(df, freq="W"), rows)
+        timed("rising_scores", lambda: analytics.rising_scores(df), rows)
+        del df, snapshots, first
+        # ru_maxrss is KiB on Linux
+        print(f"  peak RSS so far: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Load-test the streaming /chat/stream endpoint against the LLM stub.
+
+Starts the stub and the API in-process, then runs concurrent chat sessions and
+reports time to first token and total latency. SQL goes to the Postgres
+configured in the environment, or to an in-process fake with --fake-db:
+
+    python -m benchmarks.bench_chat --users 50 --fake-db --db-latency 0.02
+"""
+import os
+import time
+import asyncio
+import argparse
+import threading
+from benchmarks.harness import percentile
+
+
+async def session(client, prompt):
+    started = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/chat/stream", json={"prompt": prompt}) as response:
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event == "token" and first_token is None:
+                first_token = time.perf_counter() - started
+    return first_token, time.perf_counter() - started
+
+
+async def run(args, port):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(session(client, f"top {i % 10 + 1} liked videos") for i in range(args.users)))
+        total = time.perf_counter() - started
+
+    ttft = [first for first, _ in results if first is not None]
+    latency = [elapsed for _, elapsed in results]
+    print(f"{args.users} concurrent sessions in {total:.2f} s ({args.users / total:.1f} chats/s)")
+    print(f"time to first token  p50 {percentile(ttft, 50) * 1000:>7.0f} ms   p99 {percentile(ttft, 99) * 1000:>7.0f} ms")
+    print(f"total latency        p50 {percentile(latency, 50) * 1000:>7.0f} ms   p99 {percentile(latency, 99) * 1000:>7.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--tool-calls", type=int, default=2)
+    parser.add_argument("--fake-db", action="store_true")
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache on (off by default).")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    from benchmarks.stubs import llm_stub
+    stub, _ = llm_stub.serve(latency=args.llm_latency, token_interval=args.token_interval, tool_calls=args.tool_calls)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault("groq_api_key", "stub")
+
+    import uvicorn
+    from src.backend import main as api
+    from src.backend.models import llm_model
+    from src.backend.services.response_cache import ResponseCache
+
+    if not args.cache:
+        # Entries expire immediately, so every session goes to the LLM stub
+        llm_model.response_cache = ResponseCache(ttl=0, similarity_threshold=1.0)
+
+    if args.fake_db:
+        async def fake_query(query, max_rows=None, max_bytes=None):
+            await asyncio.sleep(args.db_latency)
+            return {
+                "columns": ["video_id", "title", "thumbnail_link"],
+                "rows": [("vid00000001", "Synthetic video", "https://i.ytimg.com/vi/vid00000001/default.jpg")],
+            }
+
+        async def no_pool():
+            return None
+
+        llm_model.execute_guarded_query_async = fake_query
+        api.async_db.init_pool = no_pool
+
+    server = uvicorn.Server(uvicorn.Config(api.app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    asyncio.run(run(args, args.port))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Time the SQL the chatbot typically generates against youtube_trending_data.
+
+Run once before and once after `python -m src.backend.database.schema migrate`,
+or pass --migrate to do both in one go:
+
+    python -m benchmarks.bench_chatbot_queries --repeat 20 --migrate
+"""
+import time
+import argparse
+from src.backend.database.db import TABLE, get_connection, close
+from src.backend.database.schema import get_version, migrate
+
+# Written to run on both the TEXT and the typed schema
+QUERIES = {
+    "top liked": f"SELECT video_id, title, thumbnail_link FROM {TABLE} ORDER BY likes DESC LIMIT 5",
+    "top commented": f"SELECT video_id, title, thumbnail_link FROM {TABLE} ORDER BY comment_count DESC LIMIT 5",
+    "top viewed": f"SELECT video_id, title, thumbnail_link FROM {TABLE} ORDER BY view_count DESC LIMIT 10",
+    "category last week": f"""
+        SELECT video_id, title, thumbnail_link FROM {TABLE}
+        WHERE category_name = 'Music'
+          AND trending_date >= (SELECT max(trending_date) FROM {TABLE})::timestamptz - interval '7 days'
+        ORDER BY trending_date DESC LIMIT 10""",
+    "title search": f"SELECT video_id, title, thumbnail_link FROM {TABLE} WHERE title ILIKE '%cricket%' LIMIT 10",
+    "tag search": f"SELECT video_id, title, thumbnail_link FROM {TABLE} WHERE tags ILIKE '%comedy%' LIMIT 10",
+}
+
+
+def run(repeat):
+    results = {}
+    with get_connection() as connection, connection.cursor() as cursor:
+        for name, query in QUERIES.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cursor.execute(query)
+                cursor.fetchall()
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            results[name] = timings[len(timings) // 2]
+        connection.rollback()
+    return results
+
+
+def report(label, results):
+    print(label)
+    for name, seconds in results.items():
+        print(f"  {name:<20} median {seconds * 1000:>9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--migrate", action="store_true", help="Run, migrate to the latest schema, run again.")
+    args = parser.parse_args()
+
+    before = run(args.repeat)
+    report(f"schema version {get_version()}", before)
+
+    if args.migrate:
+        migrate()
+        after = run(args.repeat)
+        report(f"schema version {get_version()}", after)
+        print("speedup")
+        for name in QUERIES:
+            print(f"  {name:<20} {before[name] / after[name]:>9.1f}x")
+
+    close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure get_dataset load time and peak RSS for the raw CSV path and the Parquet cache.
+
+Each scenario runs in a fresh interpreter so peak RSS is not shared between them:
+
+    python -m benchmarks.bench_dataset --rows 1000000
+    python -m benchmarks.bench_dataset --data-dir src/data --columns video_id likes category_name
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+SCENARIOS = ["legacy", "cold", "warm", "warm-projected"]
+
+
+def child(scenario, data_dir, columns):
+    from src.data import dataset
+
+    dataset.DATASET_PATH = os.path.join(data_dir, "IN_youtube_trending_data.csv")
+    dataset.CATEGORY_PATH = os.path.join(data_dir, "IN_category_id.json")
+    dataset.PROCESSED_PATH = os.path.join(data_dir, "processed_dataset.parquet")
+    dataset.PROCESSED_META_PATH = os.path.join(data_dir, "processed_dataset.meta.json")
+
+    if scenario == "cold":
+        for path in (dataset.PROCESSED_PATH, dataset.PROCESSED_META_PATH):
+            if os.path.exists(path):
+                os.remove(path)
+
+    start = time.perf_counter()
+    if scenario == "legacy":
+        df = dataset.get_dataset(use_cache=False)
+    elif scenario == "warm-projected":
+        df = dataset.get_dataset(columns=columns)
+    else:
+        df = dataset.get_dataset()
+    seconds = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux
+    print(json.dumps({
+        "seconds": seconds,
+        "rows": len(df),
+        "frame_mb": df.memory_usage(deep=True).sum() / 2**20,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic rows when --data-dir is not given.")
+    parser.add_argument("--data-dir", help="Directory holding IN_youtube_trending_data.csv and IN_category_id.json.")
+    parser.add_argument("--columns", nargs="+", default=["video_id", "title", "likes", "category_name"])
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        child(args.scenario, args.data_dir, args.columns)
+        return
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        from benchmarks.synthetic import write_raw_dataset
+        data_dir = tempfile.mkdtemp(prefix="bench_dataset_")
+        write_raw_dataset(data_dir, args.rows)
+
+    for scenario in SCENARIOS:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_dataset", "--scenario", scenario,
+             "--data-dir", data_dir, "--columns", *args.columns],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        print(f"{scenario:<15} {result['seconds']:>8.2f} s   frame {result['frame_mb']:>8.1f} MB"
+              f"   peak RSS {result['peak_rss_mb']:>8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
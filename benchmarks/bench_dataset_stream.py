@@ -0,0 +1,83 @@
+"""
+Check that the streaming dataset reader stays within its memory budget on a large CSV.
+
+Generates a synthetic CSV of the requested size (5 GB by default), streams it
+through get_dataset_chunks in a fresh interpreter and fails if the peak RSS
+growth over the post-import baseline exceeds the budget:
+
+    python -m benchmarks.bench_dataset_stream --size-gb 5 --budget-mb 512
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+
+def child(data_dir, budget_mb):
+    from src.data import dataset
+
+    dataset.DATASET_PATH = os.path.join(data_dir, "IN_youtube_trending_data.csv")
+    dataset.CATEGORY_PATH = os.path.join(data_dir, "IN_category_id.json")
+    baseline_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    rows = 0
+    start = time.perf_counter()
+    for chunk in dataset.get_dataset_chunks(max_memory_mb=budget_mb):
+        rows += len(chunk)
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "rows": rows,
+        "seconds": seconds,
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=5.0)
+    parser.add_argument("--budget-mb", type=int, default=512)
+    parser.add_argument("--data-dir", help="Reuse a directory with an existing IN_youtube_trending_data.csv.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.data_dir, args.budget_mb)
+        return
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        from benchmarks.synthetic import write_raw_dataset
+        data_dir = tempfile.mkdtemp(prefix="bench_stream_")
+        # Calibrate rows per byte on a small sample, then write the full file
+        sample_csv, _ = write_raw_dataset(data_dir, 10_000)
+        rows = int(args.size_gb * 2**30 / (os.path.getsize(sample_csv) / 10_000))
+        print(f"Writing {rows:,} synthetic rows to {data_dir} ...")
+        write_raw_dataset(data_dir, rows)
+
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_dataset_stream", "--child",
+         "--data-dir", data_dir, "--budget-mb", str(args.budget_mb)],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip().splitlines()[-1]
+    result = json.loads(output)
+
+    growth = result["peak_rss_mb"] - result["baseline_rss_mb"]
+    size_gb = os.path.getsize(os.path.join(data_dir, "IN_youtube_trending_data.csv")) / 2**30
+    print(f"{size_gb:.2f} GB, {result['rows']:,} rows in {result['seconds']:.1f} s "
+          f"({result['rows'] / result['seconds']:,.0f} rows/s)")
+    print(f"peak RSS {result['peak_rss_mb']:.0f} MB, growth {growth:.0f} MB, budget {args.budget_mb} MB")
+
+    if growth > args.budget_mb:
+        print("FAIL: streaming reader exceeded its memory budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
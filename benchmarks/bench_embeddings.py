@@ -0,0 +1,78 @@
+"""
+Time the embedding index in src/data/embeddings.py on synthetic videos:
+
+    python -m benchmarks.bench_embeddings --videos 100000
+
+Titles and descriptions are drawn from per-topic vocabularies, so the vectors
+cluster the way real trending videos do and IVF recall is meaningful. The
+index is written to a temporary directory.
+"""
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+
+def make_videos(n, topics=100, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = list("abcdefghijklmnopqrstuvwxyz")
+    vocab = np.array(["".join(rng.choice(letters, rng.integers(3, 9))) for _ in range(5000)])
+    topic_vocab = [rng.choice(vocab, 60) for _ in range(topics)]
+    topic = rng.integers(0, topics, n)
+    return pd.DataFrame({
+        "video_id": [f"vid{v:08d}" for v in range(n)],
+        "title": [" ".join([*rng.choice(topic_vocab[t], 6), *rng.choice(vocab, 2)]) for t in topic],
+        "description": [" ".join([*rng.choice(topic_vocab[t], 25), *rng.choice(vocab, 15)]) for t in topic],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["EMBEDDINGS_DIR"] = tempfile.mkdtemp(prefix="embeddings-")
+    from src.data import embeddings
+
+    videos = make_videos(args.videos)
+    initial = videos.iloc[: args.videos * 9 // 10]
+
+    start = time.perf_counter()
+    embeddings.update_embeddings(initial)
+    seconds = time.perf_counter() - start
+    print(f"initial build: {len(initial):,} videos in {seconds:.1f} s ({len(initial) / seconds:,.0f} videos/s)")
+
+    # A refresh sees every video again but only encodes the new tenth
+    start = time.perf_counter()
+    added = embeddings.update_embeddings(videos)
+    print(f"incremental refresh: {added:,} new of {len(videos):,} in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    index = embeddings._load()
+    print(f"index load (mmap): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    queries = [" ".join(title.split()[:3]) for title in videos["title"].sample(args.queries, random_state=1)]
+    vectors = np.asarray(index["vectors"])
+    exact = np.argsort(-(embeddings.encode(queries) @ vectors.T), axis=1)[:, :10]
+
+    start = time.perf_counter()
+    for query in queries:
+        np.argsort(-(vectors @ embeddings.encode([query])[0]))[:10]
+    print(f"exact search: {(time.perf_counter() - start) / len(queries) * 1000:.2f} ms/query")
+
+    for n_probe in (4, 8, 16, 32):
+        start = time.perf_counter()
+        approx = [embeddings.nearest([query], k=10, n_probe=n_probe)[0] for query in queries]
+        ms = (time.perf_counter() - start) / len(queries) * 1000
+        recall = np.mean([
+            len(set(index["ids"][rows]) & {video_id for video_id, _ in found}) / 10
+            for rows, found in zip(exact, approx)
+        ])
+        print(f"IVF n_probe={n_probe:<3} {ms:.2f} ms/query  recall@10 {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure the chatbot's perceived latency as the Streamlit frontend sees it.
+
+Starts the LLM stub and the API in-process (SQL on the embedded DuckDB backend
+over a synthetic dataset), then asks questions through `api_client` three ways:
+
+- blocking: POST /chat, where the first visible text is the whole answer
+- streamed: POST /chat/stream over the pooled keep-alive session
+- streamed, new connection: the same with a fresh session per question
+
+    python -m benchmarks.bench_frontend --questions 20 --llm-latency 0.3 --token-interval 0.02
+"""
+import os
+import time
+import argparse
+import tempfile
+import threading
+from benchmarks.harness import percentile
+
+PROMPT = "which channels had the most trending videos last week"
+
+
+def report(name, first, total):
+    print(f"{name:<26} first visible p50 {percentile(first, 50):>7.0f} ms  p95 {percentile(first, 95):>7.0f} ms"
+          f"   complete p50 {percentile(total, 50):>7.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    from benchmarks.stubs import llm_stub
+    stub, _ = llm_stub.serve(latency=args.llm_latency, token_interval=args.token_interval)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault("groq_api_key", "stub")
+    os.environ["QUERY_BACKEND"] = "duckdb"
+    os.environ["API_URL"] = f"http://127.0.0.1:{args.port}"
+
+    import requests
+    import uvicorn
+    from benchmarks.synthetic import write_raw_dataset
+    from src.data import dataset
+    from src.backend import main as api
+    from src.backend.models import llm_model
+    from src.backend.services.response_cache import ResponseCache
+    from src.frontend.services import api_client
+
+    async def no_pool():
+        return None
+
+    api.async_db.init_pool = no_pool
+    # Entries expire immediately, so every question reaches the LLM stub
+    llm_model.response_cache = ResponseCache(ttl=0, similarity_threshold=1.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_raw_dataset(tmp, args.rows)
+        dataset.DATASET_PATH = os.path.join(tmp, "IN_youtube_trending_data.csv")
+        dataset.CATEGORY_PATH = os.path.join(tmp, "IN_category_id.json")
+        dataset.PROCESSED_PATH = os.path.join(tmp, "processed_dataset.parquet")
+        dataset.PROCESSED_META_PATH = os.path.join(tmp, "processed_dataset.meta.json")
+
+        server = uvicorn.Server(uvicorn.Config(api.app, port=args.port, log_level="warning"))
+        threading.Thread(target=server.run, daemon=True).start()
+        while not server.started:
+            time.sleep(0.05)
+        # Warm the DuckDB database and the schema section
+        api_client.ask(PROMPT)
+
+        blocking = []
+        for _ in range(args.questions):
+            started = time.perf_counter()
+            api_client.ask(PROMPT)
+            blocking.append((time.perf_counter() - started) * 1000)
+        report("blocking /chat", blocking, blocking)
+
+        for name, fresh in (("streamed, pooled", False), ("streamed, new connection", True)):
+            first, total = [], []
+            for _ in range(args.questions):
+                if fresh:
+                    api_client.session = requests.Session()
+                stats = {}
+                for _ in api_client.stream_chat(PROMPT, stats):
+                    pass
+                first.append(stats["time_to_first_token_ms"])
+                total.append(stats["latency_ms"])
+                if fresh:
+                    api_client.session.close()
+            report(name, first, total)
+            api_client.session = None
+
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Check that importing the API app stays fast and free of side effects.
+
+Imports the module in a fresh interpreter under `python -X importtime`, from an
+empty working directory, and fails (exit status 1) when:
+
+- the cold import takes longer than --budget-ms (best of --repeat runs),
+- a module that should only load on first use (pandas, the Groq SDK, ...) was imported,
+- the import created files or directories.
+
+    python -m benchmarks.bench_import_time --budget-ms 800
+    python -m benchmarks.bench_import_time --module src.frontend.app --budget-ms 1500
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy or side-effecting modules the app only needs once a request uses them
+DEFERRED_MODULES = ["pandas", "numpy", "groq", "googleapiclient.discovery", "asyncpg", "duckdb"]
+
+
+def import_once(module, workdir):
+    """Import `module` in a fresh interpreter; return (total microseconds, self/cumulative rows, loaded modules)."""
+    check = f"import sys, {module}; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=workdir, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    if process.returncode != 0:
+        raise SystemExit(process.stderr)
+
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue
+        rows.append((int(fields[0]), int(fields[1]), fields[2].rstrip()))
+    total = next(cumulative for _, cumulative, name in rows if name.strip() == module)
+    loaded = [name for name in process.stdout.strip().split(",") if name]
+    return total, rows, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.backend.main")
+    parser.add_argument("--budget-ms", type=float, default=800)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list.")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [import_once(args.module, workdir) for _ in range(args.repeat)]
+        created = os.listdir(workdir)
+    total, rows, loaded = min(runs, key=lambda run: run[0])
+
+    print(f"{args.module}: {total / 1000:.0f} ms (best of {args.repeat}, budget {args.budget_ms:.0f} ms)")
+    print("slowest imports (self ms, cumulative ms):")
+    for own, cumulative, name in sorted(rows, key=lambda row: row[0], reverse=True)[:args.top]:
+        print(f"  {own / 1000:>8.1f} {cumulative / 1000:>9.1f}  {name.strip()}")
+
+    if total / 1000 > args.budget_ms:
+        failures.append(f"import took {total / 1000:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"imported modules that should load on first use: {', '.join(loaded)}")
+    if created:
+        failures.append(f"import created files: {', '.join(created)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
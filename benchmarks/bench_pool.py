@@ -0,0 +1,86 @@
+"""
+Benchmark concurrent queries through the connection pool against a single shared connection.
+
+Point it at a local Postgres (for example `docker run -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres`)
+using the same `user`, `password`, `host`, `port` and `dbname` variables as the app:
+
+    python -m benchmarks.bench_pool --queries 2000 --concurrency 32
+"""
+import os
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import psycopg2
+from dotenv import load_dotenv
+from benchmarks.harness import percentile
+from src.backend.database.pool import ConnectionPool
+
+load_dotenv()
+
+CONNECT_KWARGS = dict(
+    user=os.getenv("user", "postgres"),
+    password=os.getenv("password", "postgres"),
+    host=os.getenv("host", "localhost"),
+    port=os.getenv("port", "5432"),
+    dbname=os.getenv("dbname", "postgres"),
+)
+
+
+def run(name, worker, queries, concurrency):
+    latencies = []
+    lock = threading.Lock()
+
+    def timed(_):
+        start = time.perf_counter()
+        worker()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(queries)))
+    total = time.perf_counter() - start
+
+    print(f"{name:<20} {queries / total:>10.1f} q/s   p50 {percentile(latencies, 50) * 1000:>8.2f} ms"
+          f"   p99 {percentile(latencies, 99) * 1000:>8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--sleep-ms", type=float, default=2.0, help="Server-side work per query (pg_sleep).")
+    args = parser.parse_args()
+
+    query = "SELECT pg_sleep(%s)"
+    params = (args.sleep_ms / 1000,)
+
+    # Single shared connection: psycopg2 serializes concurrent cursors on one connection
+    shared = psycopg2.connect(**CONNECT_KWARGS)
+    shared.autocommit = True
+
+    def single_worker():
+        with shared.cursor() as cursor:
+            cursor.execute(query, params)
+            cursor.fetchall()
+
+    pool = ConnectionPool(min_size=args.pool_size, max_size=args.pool_size, **CONNECT_KWARGS)
+
+    def pooled_worker():
+        with pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(query, params)
+            cursor.fetchall()
+
+    print(f"{args.queries} queries, concurrency {args.concurrency}, pool size {args.pool_size}")
+    run("single connection", single_worker, args.queries, args.concurrency)
+    run("pooled", pooled_worker, args.queries, args.concurrency)
+
+    shared.close()
+    pool.closeall()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measure LLM prompt tokens and latency per request stage on a fixed prompt set:
+
+    python -m benchmarks.bench_prompt_tokens --rows 50
+
+Conversations run against the LLM stub, and the stub's token counts are
+collected from the stage log. Tool results come from an in-process fake of
+the guarded query that returns `SELECT *`-shaped rows with full descriptions,
+the worst case the compaction has to handle. --raw restores the old payload
+(`json.dumps` results, full conversation resent with the schema prompt) for
+comparison.
+"""
+import os
+import json
+import argparse
+
+PROMPTS = [
+    "show me the top 5 commented videos",
+    "which music videos got the most likes last week",
+    "most viewed gaming videos",
+    "top 10 trending videos by views in Comedy",
+    "which channels had the most trending videos",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="Rows returned by each query.")
+    parser.add_argument("--tool-calls", type=int, default=1)
+    parser.add_argument("--raw", action="store_true", help="Send results and history uncompacted.")
+    args = parser.parse_args()
+
+    from benchmarks.stubs import llm_stub
+    stub, _ = llm_stub.serve(latency=0, token_interval=0, tool_calls=args.tool_calls)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault("groq_api_key", "stub")
+
+    from benchmarks.synthetic import make_frame
+    from src.backend.models import llm_model, prompt
+    from src.backend.services.response_cache import ResponseCache
+
+    frame = make_frame(args.rows)
+    result = {"columns": list(frame.columns), "rows": [tuple(row) for row in frame.itertuples(index=False)]}
+    llm_model.execute_guarded_query = lambda query, max_rows=None, max_bytes=None: result
+    llm_model.response_cache = ResponseCache(ttl=0, similarity_threshold=1.0)
+    # Build the schema from the static definitions, without a database
+    prompt._live_columns = lambda table_name: []
+
+    if args.raw:
+        llm_model.compact_result = lambda value, max_tokens: json.dumps(
+            [list(row) for row in value["rows"]] if isinstance(value, dict) and "rows" in value else value, default=str
+        )
+        llm_model.answer_messages = lambda messages: messages
+
+    totals = []
+    original_log_request = llm_model.log_request
+    llm_model.log_request = lambda stages: totals.append((stages, original_log_request(stages)))
+
+    print(f"{'prompt':<50} {'plan':>7} {'answer':>7} {'total':>7} {'ms':>8}")
+    for text in PROMPTS:
+        llm_model.run_conversation(text)
+        stages, request = totals[-1]
+        tokens = {stage["stage"]: stage.get("prompt_tokens", 0) for stage in stages}
+        print(f"{text:<50} {tokens.get('plan', 0):>7} {tokens.get('answer', 0):>7} "
+              f"{request['prompt_tokens']:>7} {request['ms']:>8.1f}")
+    average = sum(request["prompt_tokens"] for _, request in totals) / len(totals)
+    print(f"average prompt tokens per request: {average:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
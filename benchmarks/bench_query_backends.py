@@ -0,0 +1,81 @@
+"""
+Run the chatbot's query mix on the embedded DuckDB backend and, with
+--postgres, on the configured Postgres database, and compare median latencies:
+
+    python -m benchmarks.bench_query_backends --rows 500000
+    python -m benchmarks.bench_query_backends --data-dir src/data --postgres
+
+DuckDB reads a synthetic dataset unless --data-dir is given. Postgres must
+already hold the same data (see `python -m src.backend.database.loader`).
+"""
+import os
+import time
+import argparse
+import tempfile
+from benchmarks.synthetic import write_raw_dataset
+from benchmarks.bench_chatbot_queries import QUERIES
+from benchmarks.bench_summaries import QUESTIONS
+
+# The raw-table queries the chatbot generates, plus the summary-table answers
+QUERY_MIX = dict(QUERIES)
+QUERY_MIX.update({f"{question} (summary)": summary for question, (_, summary) in QUESTIONS.items()})
+QUERY_MIX["monthly views (to_char)"] = """
+    SELECT to_char(trending_date, 'YYYY-MM') AS month, sum(view_count) FROM youtube_trending_data
+    GROUP BY month ORDER BY month DESC LIMIT 12"""
+QUERY_MIX["regex title match"] = """
+    SELECT video_id, title FROM youtube_trending_data WHERE title ~* 'cricket|vlog' LIMIT 10"""
+
+
+def run(backend, repeat):
+    results = {}
+    for name, query in QUERY_MIX.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = backend.execute_query(query)
+            timings.append(time.perf_counter() - start)
+        if rows is None:
+            print(f"  {name}: failed, see the log")
+        timings.sort()
+        results[name] = timings[len(timings) // 2] * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic rows when --data-dir is not given.")
+    parser.add_argument("--data-dir", help="Directory holding IN_youtube_trending_data.csv and IN_category_id.json.")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--postgres", action="store_true", help="Also run the mix on Postgres.")
+    args = parser.parse_args()
+
+    from src.data import dataset
+    from src.backend.database import duckdb_backend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        if not args.data_dir:
+            write_raw_dataset(data_dir, args.rows)
+        dataset.DATASET_PATH = os.path.join(data_dir, "IN_youtube_trending_data.csv")
+        dataset.CATEGORY_PATH = os.path.join(data_dir, "IN_category_id.json")
+        dataset.PROCESSED_PATH = os.path.join(tmp, "processed_dataset.parquet")
+        dataset.PROCESSED_META_PATH = os.path.join(tmp, "processed_dataset.meta.json")
+
+        start = time.perf_counter()
+        duckdb_backend.connect()
+        print(f"DuckDB load (Parquet cache + summaries): {time.perf_counter() - start:.2f} s")
+        results = {"duckdb": run(duckdb_backend, args.repeat)}
+
+    if args.postgres:
+        from src.backend.database import db
+        results["postgres"] = run(db, args.repeat)
+        db.close()
+
+    backends = list(results)
+    print(f"{'query':<34}" + "".join(f"{name + ' ms':>14}" for name in backends))
+    for name in QUERY_MIX:
+        print(f"{name:<34}" + "".join(f"{results[backend][name]:>14.2f}" for backend in backends))
+
+
+if __name__ == "__main__":
+    main()
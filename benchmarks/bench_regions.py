@@ -0,0 +1,105 @@
+"""
+Measure how multi-region ingestion scales with the number of worker processes.
+
+Writes --regions synthetic regional datasets of --rows rows each, then loads
+them all with `region_loader.load_regions` at each worker count and prints
+throughput, speedup over one worker and parallel efficiency. Postgres comes
+from `benchmarks.postgres_fixture`; every run starts from an empty table.
+
+With --parse-only the database is left out: each worker only parses and cleans
+its region with `iter_dataset`, which isolates the CPU-bound part and runs
+anywhere.
+
+    python -m benchmarks.bench_regions --regions 8 --rows 200000 --workers 1 2 4 8
+    python -m benchmarks.bench_regions --parse-only --regions 4 --rows 100000
+"""
+import os
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+REGIONS = ["IN", "US", "GB", "CA", "DE", "FR", "JP", "KR", "MX", "RU", "BR"]
+
+
+def parse_region(dataset_path, category_path, max_memory_mb):
+    """Parse and clean one region's dataset without loading it; return the row count."""
+    from src.data.dataset import iter_dataset, plan_chunks
+
+    chunksize, dedupe_window = plan_chunks(max_memory_mb, dataset_path=dataset_path)
+    chunks = iter_dataset(chunksize, dedupe_window=dedupe_window, dataset_path=dataset_path, category_path=category_path)
+    return sum(len(chunk) for _, chunk in chunks)
+
+
+def parse_regions(data_dir, workers, max_memory_mb):
+    from src.data.dataset import discover_regions
+
+    regions = discover_regions(data_dir)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(parse_region, *paths, max_memory_mb) for paths in regions.values()]
+        return sum(future.result() for future in futures)
+
+
+def load_regions(data_dir, workers, max_memory_mb):
+    from src.backend.database.db import execute_query
+    from src.backend.database.loader import PROGRESS_TABLE, ensure_progress_table
+    from src.backend.database.region_loader import load_regions
+    from src.backend.database.schema import REGION_TABLE
+
+    execute_query(f"DROP TABLE IF EXISTS {REGION_TABLE} CASCADE;", fetch=None)
+    ensure_progress_table()
+    execute_query(f"DELETE FROM {PROGRESS_TABLE} WHERE table_name LIKE %s", (f"{REGION_TABLE}_%",), fetch=None)
+    stats = load_regions(data_dir=data_dir, workers=workers, max_memory_mb=max_memory_mb, resume=False)
+    if stats["failed"]:
+        raise SystemExit(f"Regions failed: {stats['failed']}")
+    return stats["rows"]
+
+
+def sweep(run, data_dir, worker_counts, max_memory_mb):
+    baseline = None
+    print(f"{'workers':>7} {'rows':>10} {'seconds':>8} {'rows/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for workers in worker_counts:
+        started = time.perf_counter()
+        rows = run(data_dir, workers, max_memory_mb)
+        seconds = time.perf_counter() - started
+        baseline = baseline or seconds
+        speedup = baseline / seconds
+        print(f"{workers:>7} {rows:>10} {seconds:>8.2f} {rows / seconds:>10,.0f} {speedup:>7.2f}x "
+              f"{speedup / workers * worker_counts[0]:>9.0%}")
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", type=int, default=4, help=f"Number of regions, at most {len(REGIONS)}.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per region.")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    parser.add_argument("--memory-mb", type=int, default=256, help="Memory budget per worker.")
+    parser.add_argument("--parse-only", action="store_true", help="Parse and clean only; no database needed.")
+    args = parser.parse_args()
+
+    from benchmarks.synthetic import write_raw_dataset
+
+    print(f"{cores} CPU(s), {args.regions} region(s) x {args.rows} rows, {args.memory_mb} MB per worker")
+    with tempfile.TemporaryDirectory() as data_dir:
+        for seed, region in enumerate(REGIONS[:args.regions]):
+            write_raw_dataset(data_dir, args.rows, seed=seed, region=region)
+
+        if args.parse_only:
+            sweep(parse_regions, data_dir, args.workers, args.memory_mb)
+            return
+
+        from benchmarks.postgres_fixture import PostgresUnavailable, local_postgres
+
+        try:
+            with local_postgres():
+                sweep(load_regions, data_dir, args.workers, args.memory_mb)
+        except PostgresUnavailable as e:
+            raise SystemExit(f"No Postgres available ({e}); run with --parse-only to measure parsing alone.")
+
+
+if __name__ == "__main__":
+    main()
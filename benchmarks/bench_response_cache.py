@@ -0,0 +1,60 @@
+"""
+Measure response cache lookup latency and hit rates on exact and paraphrased prompts.
+
+    python -m benchmarks.bench_response_cache --threshold 0.85
+"""
+import time
+import argparse
+from src.backend.services.response_cache import ResponseCache, MemoryBackend, SIMILARITY_THRESHOLD
+
+PROMPTS = [
+    "show me the top 5 commented videos",
+    "top 10 most liked music videos this week",
+    "which channel has the most views",
+    "most viewed gaming videos",
+    "trending cricket videos",
+]
+
+# (prompt, index of the prompt it should hit, or None if it must miss)
+VARIANTS = [
+    ("Show me the top 5 commented videos!", 0),
+    ("show me top 5 most commented videos", 0),
+    ("top 5 commented videos please", 0),
+    ("show me the top 3 commented videos", None),
+    ("top 10 most liked music videos this week?", 1),
+    ("the top 10 most liked music videos of this week", 1),
+    ("which channel has the most views overall", 2),
+    ("most viewed gaming videos today", 3),
+    ("cricket videos trending", 4),
+    ("least disliked news videos", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    parser.add_argument("--fill", type=int, default=5000, help="Unrelated prompts cached before measuring.")
+    args = parser.parse_args()
+
+    cache = ResponseCache(MemoryBackend(max_entries=args.fill + 100), similarity_threshold=args.threshold,
+                          max_prompts=args.fill + 100)
+    for i in range(args.fill):
+        cache.set_answer(f"filler question number {i} about topic {i * 7}", [], "filler")
+    for index, prompt in enumerate(PROMPTS):
+        cache.set_answer(prompt, [f"SELECT {index}"], f"answer {index}")
+
+    correct = 0
+    start = time.perf_counter()
+    for prompt, expected in VARIANTS:
+        entry = cache.get_answer(prompt)
+        got = int(entry["answer"].split()[-1]) if entry and entry["answer"].startswith("answer") else None
+        correct += got == expected
+        print(f"{'ok ' if got == expected else 'BAD'} {prompt!r:<55} -> {got}")
+    elapsed = (time.perf_counter() - start) / len(VARIANTS)
+
+    print(f"{correct}/{len(VARIANTS)} correct, {elapsed * 1e6:.0f} us per lookup with {args.fill} cached prompts")
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
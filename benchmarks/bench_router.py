@@ -0,0 +1,79 @@
+"""
+Compare the intent router's fast path with the LLM path on a prompt mix:
+
+    python -m benchmarks.bench_router --rows 200000 --llm-latency 0.8 --repeat 3
+
+Routed questions query a synthetic dataset on the embedded DuckDB backend;
+the others go through the LLM stub (two completions of --llm-latency seconds
+each) with an in-process fake of the guarded query. Reports the hit rate and
+p50/p95 latency of both paths from `router_stats`.
+"""
+import os
+import time
+import argparse
+import tempfile
+
+# Templated questions the router should answer, then questions it must leave to the LLM
+PROMPTS = [
+    "show me the top 5 commented videos",
+    "most liked videos",
+    "top 10 most viewed videos",
+    "most liked music videos",
+    "top 3 viewed gaming videos",
+    "what are the top twenty most watched videos in entertainment",
+    "top 5 videos by comments in News & Politics",
+    "which channels had the most trending videos last week",
+    "fastest growing cricket videos",
+    "feel-good family videos trending now",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["QUERY_BACKEND"] = "duckdb"
+    from benchmarks.stubs import llm_stub
+    stub, _ = llm_stub.serve(latency=args.llm_latency, token_interval=0)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault("groq_api_key", "stub")
+
+    from benchmarks.synthetic import write_raw_dataset
+    from src.data import dataset
+    from src.backend.database import duckdb_backend
+    from src.backend.models import llm_model, prompt, router
+    from src.backend.services.response_cache import ResponseCache
+
+    llm_model.response_cache = ResponseCache(ttl=0, similarity_threshold=1.0)
+    llm_model.execute_guarded_query = lambda query, max_rows=None, max_bytes=None: {
+        "columns": ["video_id", "title", "thumbnail_link"],
+        "rows": [("vid00000001", "Synthetic video", "https://i.ytimg.com/vi/vid00000001/default.jpg")],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_raw_dataset(tmp, args.rows)
+        dataset.DATASET_PATH = os.path.join(tmp, "IN_youtube_trending_data.csv")
+        dataset.CATEGORY_PATH = os.path.join(tmp, "IN_category_id.json")
+        dataset.PROCESSED_PATH = os.path.join(tmp, "processed_dataset.parquet")
+        dataset.PROCESSED_META_PATH = os.path.join(tmp, "processed_dataset.meta.json")
+        duckdb_backend.connect()
+        prompt.schema_section()
+
+        for _ in range(args.repeat):
+            for text in PROMPTS:
+                start = time.perf_counter()
+                llm_model.run_conversation(text)
+                path = "routed" if router.parse(text) else "LLM"
+                print(f"{path:<7} {(time.perf_counter() - start) * 1000:>9.1f} ms  {text}")
+
+    stats = router.router_stats()
+    print(f"hit rate {stats['hit_rate']:.0%} ({stats['hits']} routed, {stats['misses']} to the LLM)")
+    print(f"routed p50 {stats['routed_p50_ms']} ms  p95 {stats['routed_p95_ms']} ms")
+    print(f"LLM    p50 {stats['llm_p50_ms']} ms  p95 {stats['llm_p95_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare keyword lookups through `search_videos` with the ILIKE scans the LLM
+used to write, on the configured query backend:
+
+    python -m benchmarks.bench_search --repeat 20 --migrate
+
+--migrate brings the trending table to the latest schema first, which adds the
+search_vector and tag_list columns and their GIN indexes.
+"""
+import time
+import argparse
+from src.backend.database.db import TABLE
+from src.backend.database.backends import QUERY_BACKEND, execute_query
+from src.backend.database.search import search_videos
+
+TERMS = ["cricket", "music video", "bigg boss", "ipl highlights", "comedy", "trailer"]
+
+
+def ilike(term, limit=10):
+    pattern = f"%{term}%"
+    return execute_query(
+        f"""
+        SELECT video_id, title, thumbnail_link FROM {TABLE}
+        WHERE title ILIKE %s OR tags ILIKE %s OR description ILIKE %s
+        ORDER BY view_count DESC LIMIT %s
+        """,
+        (pattern, pattern, pattern, limit),
+    )
+
+
+def median_ms(fn, term, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(term)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--migrate", action="store_true")
+    args = parser.parse_args()
+
+    if args.migrate:
+        from src.backend.database.schema import migrate
+        start = time.perf_counter()
+        print(f"schema version {migrate()} ({time.perf_counter() - start:.1f} s)")
+
+    print(f"backend: {QUERY_BACKEND}")
+    print(f"{'term':<18} {'ILIKE ms':>10} {'search ms':>10} {'speedup':>9} {'hits':>6}")
+    for term in TERMS:
+        ilike_ms = median_ms(ilike, term, args.repeat)
+        search_ms = median_ms(search_videos, term, args.repeat)
+        hits = search_videos(term, limit=50)
+        print(f"{term:<18} {ilike_ms:>10.2f} {search_ms:>10.2f} {ilike_ms / search_ms:>8.1f}x {len(hits):>6}")
+
+
+if __name__ == "__main__":
+    main()
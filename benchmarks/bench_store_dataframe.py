@@ -0,0 +1,55 @@
+"""
+Compare the COPY and execute_batch load paths of store_dataframe at several table sizes.
+
+Requires a local Postgres configured through the app's `user`, `password`, `host`,
+`port` and `dbname` variables:
+
+    python -m benchmarks.bench_store_dataframe --sizes 100000 1000000 5000000
+"""
+import time
+import argparse
+from benchmarks.synthetic import iter_frames
+from src.backend.database.db import (
+    execute_query,
+    get_connection,
+    copy_dataframe,
+    insert_dataframe,
+    create_table_from_dataframe,
+    close,
+)
+
+BENCH_TABLE = "bench_trending_load"
+
+
+def load(rows, method, chunksize):
+    execute_query(f"DROP TABLE IF EXISTS {BENCH_TABLE}", fetch=None)
+    write_chunk = copy_dataframe if method == "copy" else insert_dataframe
+
+    start = time.perf_counter()
+    for index, frame in enumerate(iter_frames(rows, chunksize)):
+        if index == 0:
+            create_table_from_dataframe(frame, BENCH_TABLE)
+        with get_connection() as connection, connection.cursor() as cursor:
+            write_chunk(cursor, frame, BENCH_TABLE)
+            connection.commit()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--methods", nargs="+", default=["copy", "batch"], choices=["copy", "batch"])
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        for method in args.methods:
+            seconds = load(rows, method, args.chunksize)
+            print(f"{rows:>10,} rows  {method:<6} {seconds:>9.2f} s  {rows / seconds:>12,.0f} rows/s")
+
+    execute_query(f"DROP TABLE IF EXISTS {BENCH_TABLE}", fetch=None)
+    close()
+
+
+if __name__ == "__main__":
+    main()
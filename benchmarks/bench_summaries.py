@@ -0,0 +1,87 @@
+"""
+Compare common trend questions answered from the raw trending table and from
+the summary tables, and time full and incremental summary refreshes:
+
+    python -m benchmarks.bench_summaries --repeat 20 --refresh
+
+The target is single-digit milliseconds for every summary query.
+"""
+import time
+import argparse
+from src.backend.database.db import TABLE, get_connection, close
+from src.backend.database.summaries import refresh_summaries
+
+LATEST_WEEK = f"(SELECT max(trending_date) FROM {TABLE}) - interval '7 days'"
+LATEST_WEEK_DAY = "(SELECT max(day) FROM category_daily_stats) - 7"
+
+# question -> (raw table query, summary table query)
+QUESTIONS = {
+    "top channels this week": (
+        f"""SELECT channelId, max(channelTitle), sum(view_count) AS views FROM {TABLE}
+            WHERE trending_date >= {LATEST_WEEK} GROUP BY channelId ORDER BY views DESC LIMIT 10""",
+        f"""SELECT channel_id, max(channel_title), sum(total_views) AS views FROM channel_daily_stats
+            WHERE day >= {LATEST_WEEK_DAY} GROUP BY channel_id ORDER BY views DESC LIMIT 10""",
+    ),
+    "most liked category": (
+        f"""SELECT category_name, sum(likes) AS likes FROM {TABLE}
+            GROUP BY category_name ORDER BY likes DESC LIMIT 1""",
+        """SELECT category_name, sum(total_likes) AS likes FROM category_daily_stats
+            GROUP BY category_name ORDER BY likes DESC LIMIT 1""",
+    ),
+    "fastest-growing videos": (
+        f"""SELECT video_id, max(view_count) - min(view_count) AS gained FROM {TABLE}
+            WHERE trending_date >= {LATEST_WEEK} GROUP BY video_id ORDER BY gained DESC LIMIT 10""",
+        f"""SELECT v.video_id, s.title, v.views_per_day FROM video_velocity v JOIN video_stats s USING (video_id)
+            WHERE v.trending_date >= (SELECT max(trending_date) FROM video_velocity) - interval '7 days'
+            ORDER BY v.views_per_day DESC LIMIT 10""",
+    ),
+    "most viewed videos": (
+        f"""SELECT * FROM (
+                SELECT DISTINCT ON (video_id) video_id, title, view_count FROM {TABLE}
+                ORDER BY video_id, trending_date DESC
+            ) latest ORDER BY view_count DESC LIMIT 10""",
+        """SELECT video_id, title, latest_view_count FROM video_stats ORDER BY latest_view_count DESC LIMIT 10""",
+    ),
+}
+
+
+def median_ms(cursor, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(query)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--refresh", action="store_true", help="Rebuild, then incrementally refresh, the summaries first.")
+    args = parser.parse_args()
+
+    if args.refresh:
+        full = refresh_summaries()
+        print(f"full refresh         {full['seconds']:>9.2f} s")
+        with get_connection() as connection, connection.cursor() as cursor:
+            cursor.execute(f"SELECT max(trending_date) - interval '1 day' FROM {TABLE}")
+            since = cursor.fetchone()[0]
+            connection.rollback()
+        incremental = refresh_summaries(since=since)
+        print(f"refresh of last day  {incremental['seconds']:>9.2f} s")
+
+    print(f"{'question':<24} {'raw ms':>10} {'summary ms':>11} {'speedup':>9}")
+    with get_connection() as connection, connection.cursor() as cursor:
+        for question, (raw, summary) in QUESTIONS.items():
+            raw_ms = median_ms(cursor, raw, args.repeat)
+            summary_ms = median_ms(cursor, summary, args.repeat)
+            print(f"{question:<24} {raw_ms:>10.2f} {summary_ms:>11.2f} {raw_ms / summary_ms:>8.1f}x")
+        connection.rollback()
+
+    close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compare per-ID YouTube lookups with the batched, cached get_video_details path.
+
+Runs against the in-process fake API, so it uses no real quota:
+
+    python -m benchmarks.bench_youtube --latency 0.08
+"""
+import time
+import argparse
+from benchmarks.stubs.fake_youtube import FakeYouTube
+from src.backend.services import youtube_service
+from src.backend.services.video_cache import VideoCache
+
+
+def per_id(video_ids, youtube):
+    """The original lookup: one videos().list call per ID, one after another."""
+    for video_id in video_ids:
+        youtube.videos().list(part="snippet", id=video_id).execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake API latency per call, in seconds.")
+    args = parser.parse_args()
+
+    print(f"{'ids':>5}  {'path':<10} {'latency':>10} {'calls':>6} {'quota':>6}")
+    for size in args.sizes:
+        video_ids = [f"vid{i:08d}" for i in range(size)]
+        youtube_service.video_cache = VideoCache(path=None)
+
+        for name, run in (
+            ("per-id", lambda api: per_id(video_ids, api)),
+            ("batched", lambda api: youtube_service.get_video_details(video_ids, youtube=api)),
+            ("cached", lambda api: youtube_service.get_video_details(video_ids, youtube=api)),
+        ):
+            api = FakeYouTube(latency=args.latency)
+            start = time.perf_counter()
+            run(api)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>5}  {name:<10} {elapsed * 1000:>8.1f}ms {api.calls:>6} {api.quota_used:>6}")
+
+
+if __name__ == "__main__":
+    main()
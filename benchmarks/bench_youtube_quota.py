@@ -0,0 +1,60 @@
+"""
+Drive concurrent, overlapping video lookups through the quota scheduler against a faulty fake API.
+
+Reports latency, API calls, retries, coalesced hits and quota spent:
+
+    python -m benchmarks.bench_youtube_quota --users 20 --error-rate 0.2 --rps 20
+"""
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.stubs.fake_youtube import FakeYouTube
+from src.backend.services import youtube_service
+from src.backend.services.quota import QuotaScheduler, RequestCoalescer
+from src.backend.services.video_cache import VideoCache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Concurrent callers.")
+    parser.add_argument("--ids-per-user", type=int, default=10)
+    parser.add_argument("--id-pool", type=int, default=100, help="Distinct IDs the callers draw from.")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rps", type=float, default=20, help="Scheduler requests per second.")
+    parser.add_argument("--daily-quota", type=int, default=10_000)
+    args = parser.parse_args()
+
+    api = FakeYouTube(latency=args.latency, error_rate=args.error_rate, error_status=args.error_status,
+                      daily_quota=args.daily_quota)
+    youtube_service.video_cache = VideoCache(path=None)
+    youtube_service.coalescer = RequestCoalescer()
+    youtube_service.scheduler = QuotaScheduler(requests_per_second=args.rps, daily_quota=args.daily_quota,
+                                               base_delay=0.05, max_delay=1.0)
+
+    rng = random.Random(0)
+    requests = [[f"vid{rng.randrange(args.id_pool):05d}" for _ in range(args.ids_per_user)] for _ in range(args.users)]
+
+    def lookup(video_ids):
+        start = time.perf_counter()
+        details = youtube_service.get_video_details(video_ids, youtube=api)
+        return time.perf_counter() - start, sum(video_id in details for video_id in video_ids)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        results = list(executor.map(lookup, requests))
+    total = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    resolved = sum(count for _, count in results)
+    print(f"{args.users} callers x {args.ids_per_user} IDs in {total:.2f} s, "
+          f"{resolved}/{args.users * args.ids_per_user} IDs resolved")
+    print(f"p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+    print(f"fake API: {api.calls} calls, {api.errors} injected errors, {api.quota_used} quota units")
+    print(f"scheduler: {youtube_service.scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Timing, percentiles and run metadata shared by the benchmark scenarios."""
+import os
+import sys
+import time
+import platform
+import resource
+import threading
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from src.backend.utils.metrics import percentile
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process; ru_maxrss is KiB on Linux and bytes on macOS."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(operation, iterations=5, concurrency=1, items=1, warmup=1, setup=None):
+    """
+    Run `operation` repeatedly and summarize its latency and throughput.
+
+    :param operation: Callable taking no arguments; one call is one operation.
+    :param iterations: Timed calls in total.
+    :param concurrency: Threads issuing the calls.
+    :param items: Units of work per call (rows, IDs...), for `items_per_s`.
+    :param warmup: Untimed calls made first, to fill pools and caches.
+    :param setup: Untimed callable run before every call, e.g. to drop a cache.
+        Only used with `concurrency=1`.
+    :return: Dict of iterations, concurrency, wall seconds, ops_per_s,
+        items_per_s and mean/p50/p95/p99 latency in ms.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        operation()
+
+    latencies = []
+    lock = threading.Lock()
+
+    def timed(_):
+        if setup and concurrency == 1:
+            setup()
+        started = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    if concurrency == 1:
+        # Setup time is excluded from the wall time as well
+        wall = 0.0
+        for index in range(iterations):
+            timed(index)
+            wall += latencies[-1]
+    else:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, range(iterations)))
+        wall = time.perf_counter() - started
+
+    return {
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "seconds": round(wall, 4),
+        "ops_per_s": round(iterations / wall, 2),
+        "items_per_s": round(iterations * items / wall, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata():
+    """Commit, machine and interpreter details stored with every results file."""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
@@ -0,0 +1,151 @@
+"""
+A throwaway local Postgres for benchmarks.
+
+In order of preference, `local_postgres()` uses:
+
+1. the server named by `BENCH_POSTGRES` (`host:port`, with the app's `user`,
+   `password` and `dbname` variables),
+2. a temporary cluster started with `initdb` and `pg_ctl` when they are on PATH,
+3. a `postgres` Docker container when Docker is available.
+
+It yields the app's connection variables and exports them to `os.environ`,
+so `db` and `async_db` must be imported afterwards (or run in a child process).
+
+    python -m benchmarks.postgres_fixture    # start one and wait, printing the variables
+"""
+import os
+import time
+import shutil
+import socket
+import tempfile
+import subprocess
+from contextlib import contextmanager
+
+PASSWORD = "postgres"
+
+
+class PostgresUnavailable(RuntimeError):
+    pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(settings, timeout=30):
+    import psycopg2
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            psycopg2.connect(**settings, connect_timeout=2).close()
+            return
+        except psycopg2.OperationalError:
+            if time.monotonic() > deadline:
+                raise PostgresUnavailable(f"Postgres on {settings['host']}:{settings['port']} did not come up.")
+            time.sleep(0.5)
+
+
+def _settings(port, host="127.0.0.1", user="postgres", password=PASSWORD, dbname="postgres"):
+    return {"user": user, "password": password, "host": host, "port": str(port), "dbname": dbname}
+
+
+@contextmanager
+def _external():
+    host, _, port = os.environ["BENCH_POSTGRES"].partition(":")
+    settings = _settings(
+        port or "5432", host,
+        user=os.getenv("user", "postgres"),
+        password=os.getenv("password", PASSWORD),
+        dbname=os.getenv("dbname", "postgres"),
+    )
+    _wait_ready(settings, timeout=5)
+    yield settings
+
+
+@contextmanager
+def _temporary_cluster():
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-pg-") as directory:
+        data = os.path.join(directory, "data")
+        password_file = os.path.join(directory, "password")
+        with open(password_file, "w") as f:
+            f.write(PASSWORD)
+        subprocess.run(
+            ["initdb", "-D", data, "-U", "postgres", "--auth=md5", f"--pwfile={password_file}"],
+            check=True, capture_output=True,
+        )
+        # Durability off: the fixture measures the app, not fsync
+        options = f"-p {port} -k {directory} -c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+        subprocess.run(
+            ["pg_ctl", "-D", data, "-o", options, "-l", os.path.join(directory, "log"), "-w", "start"],
+            check=True, capture_output=True,
+        )
+        try:
+            settings = _settings(port)
+            _wait_ready(settings)
+            yield settings
+        finally:
+            subprocess.run(["pg_ctl", "-D", data, "-m", "fast", "stop"], capture_output=True)
+
+
+@contextmanager
+def _docker():
+    port = _free_port()
+    container = subprocess.run(
+        ["docker", "run", "-d", "--rm", "-p", f"127.0.0.1:{port}:5432", "-e", f"POSTGRES_PASSWORD={PASSWORD}",
+         "postgres:16", "-c", "fsync=off", "-c", "synchronous_commit=off"],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    try:
+        settings = _settings(port)
+        _wait_ready(settings, timeout=60)
+        yield settings
+    finally:
+        subprocess.run(["docker", "stop", container], capture_output=True)
+
+
+@contextmanager
+def local_postgres():
+    """
+    Provide a Postgres server for the duration of the block.
+
+    :return: Dict of the app's `user`, `password`, `host`, `port` and `dbname` values.
+    :raises PostgresUnavailable: When no server can be found or started.
+    """
+    if os.getenv("BENCH_POSTGRES"):
+        fixture = _external()
+    elif shutil.which("initdb") and shutil.which("pg_ctl"):
+        fixture = _temporary_cluster()
+    elif shutil.which("docker"):
+        fixture = _docker()
+    else:
+        raise PostgresUnavailable("Set BENCH_POSTGRES, or install Postgres (initdb, pg_ctl) or Docker.")
+
+    try:
+        settings = fixture.__enter__()
+    except subprocess.CalledProcessError as e:
+        raise PostgresUnavailable(f"Could not start Postgres: {e.stderr or e}") from e
+    previous = {name: os.environ.get(name) for name in settings}
+    os.environ.update(settings)
+    try:
+        yield settings
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        fixture.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    with local_postgres() as settings:
+        print(" ".join(f"{name}={value}" for name, value in settings.items()))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,288 @@
+"""
+Run the benchmark scenarios and write the results to a JSON file.
+
+    python -m benchmarks.run --rows 200000
+    python -m benchmarks.run --scenarios execute_query run_conversation --concurrency 1 8 32
+    python -m benchmarks.run --baseline benchmarks/results/<earlier run>.json
+
+Scenarios run on synthetic data from `benchmarks.synthetic`, each in a fresh
+interpreter so its peak RSS is its own. The Groq and YouTube APIs are replaced
+by the local stubs with configurable latency; Postgres comes from
+`benchmarks.postgres_fixture`, and the Postgres cases are skipped when none is
+available. Results go to benchmarks/results/<time>-<commit>.json (or --output)
+together with the commit they were measured on; --baseline prints the change
+against an earlier file.
+"""
+import os
+import sys
+import json
+import argparse
+import itertools
+import tempfile
+import subprocess
+from contextlib import ExitStack
+from benchmarks.harness import measure, peak_rss_mb, run_metadata
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+BENCH_TABLE = "bench_trending_load"
+PROJECTED_COLUMNS = ["video_id", "title", "likes", "category_name"]
+
+# Read queries shaped like the chatbot's, run round-robin by the execute_query scenario
+QUERIES = [
+    ("SELECT video_id, title, likes FROM youtube_trending_data ORDER BY likes DESC LIMIT 10", None),
+    ("SELECT category_name, COUNT(*) FROM youtube_trending_data GROUP BY category_name ORDER BY 2 DESC", None),
+    ("SELECT channel_title, MAX(view_count) FROM youtube_trending_data WHERE category_name = %s "
+     "GROUP BY channel_title ORDER BY 2 DESC LIMIT 10", ("Music",)),
+]
+
+# Prompts answered by the intent router and by the LLM (stub) respectively
+PROMPTS = {
+    "routed": "top 10 most liked videos",
+    "llm": "which channels had the most trending videos last week",
+}
+
+
+def _use_dataset(data_dir):
+    from src.data import dataset
+
+    dataset.DATASET_PATH = os.path.join(data_dir, "IN_youtube_trending_data.csv")
+    dataset.CATEGORY_PATH = os.path.join(data_dir, "IN_category_id.json")
+    dataset.PROCESSED_PATH = os.path.join(data_dir, "processed_dataset.parquet")
+    dataset.PROCESSED_META_PATH = os.path.join(data_dir, "processed_dataset.meta.json")
+    return dataset
+
+
+def _postgres_ready():
+    # Set by the parent only for its own fixture, so a .env pointing at a real database is never used
+    return os.getenv("BENCH_POSTGRES_READY") == "1"
+
+
+def scenario_get_dataset(args):
+    dataset = _use_dataset(args.data_dir)
+
+    def drop_cache():
+        for path in (dataset.PROCESSED_PATH, dataset.PROCESSED_META_PATH):
+            if os.path.exists(path):
+                os.remove(path)
+
+    heavy = min(args.iterations, 3)
+    return [
+        ("cold", measure(dataset.get_dataset, heavy, items=args.rows, setup=drop_cache, warmup=0)),
+        ("warm", measure(dataset.get_dataset, args.iterations, items=args.rows)),
+        ("warm-projected", measure(lambda: dataset.get_dataset(columns=PROJECTED_COLUMNS), args.iterations,
+                                   items=args.rows)),
+    ]
+
+
+def scenario_store_dataframe(args):
+    from benchmarks.synthetic import make_frame
+    from src.backend.database import db
+
+    frame = make_frame(args.rows)
+
+    def drop_table():
+        db.execute_query(f"DROP TABLE IF EXISTS {BENCH_TABLE}", fetch=None)
+
+    results = []
+    for method in ("copy", "batch"):
+        results.append((method, measure(
+            lambda: db.store_dataframe(frame, BENCH_TABLE, method), min(args.iterations, 3),
+            items=len(frame), setup=drop_table, warmup=0,
+        )))
+    drop_table()
+    db.close()
+    return results
+
+
+def scenario_execute_query(args):
+    _use_dataset(args.data_dir)
+    from src.backend.database import backends
+
+    names = ["duckdb"]
+    if _postgres_ready():
+        from src.data.dataset import get_dataset
+        from src.backend.database import db
+
+        # Reuse an existing table rather than touching it
+        if not db.table_exists(db.TABLE):
+            db.store_dataframe(get_dataset(), db.TABLE)
+        names.append("postgres")
+
+    results = []
+    for backend in names:
+        for concurrency in args.concurrency:
+            mix = itertools.cycle(QUERIES)
+
+            def operation():
+                query, params = next(mix)
+                backends.execute_query(query, params, backend=backend)
+
+            results.append((backend, measure(operation, args.queries, concurrency, warmup=len(QUERIES))))
+    return results
+
+
+def scenario_get_video_links(args):
+    from benchmarks.stubs import youtube_stub
+
+    server, api = youtube_stub.serve(latency=args.youtube_latency)
+    os.environ["YOUTUBE_API_ENDPOINT"] = f"http://127.0.0.1:{server.server_port}/youtube/v3/"
+    os.environ["YOUTUBE_API_KEY"] = "stub"
+    from src.backend.services import youtube_service
+    from src.backend.services.video_cache import VideoCache
+
+    video_ids = [f"vid{i:08d}" for i in range(args.video_ids)]
+
+    def drop_cache():
+        youtube_service.video_cache = VideoCache(path=None)
+
+    cold = measure(lambda: youtube_service.get_video_links(video_ids), args.iterations, items=len(video_ids),
+                   setup=drop_cache)
+    cold["api_calls"] = api.calls
+    warm = measure(lambda: youtube_service.get_video_links(video_ids), args.iterations, items=len(video_ids))
+    return [("cold", cold), ("cached", warm)]
+
+
+def scenario_run_conversation(args):
+    from benchmarks.stubs import llm_stub
+
+    stub, config = llm_stub.serve(latency=args.llm_latency, token_interval=0)
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault("groq_api_key", "stub")
+    os.environ["QUERY_BACKEND"] = "duckdb"
+    _use_dataset(args.data_dir)
+    from src.backend.models import llm_model
+    from src.backend.services.response_cache import ResponseCache
+
+    # Entries expire immediately, so every question is answered again
+    llm_model.response_cache = ResponseCache(ttl=0, similarity_threshold=1.0)
+
+    results = []
+    for case, text in PROMPTS.items():
+        for concurrency in args.concurrency:
+            iterations = max(args.iterations, concurrency * 2)
+            results.append((case, measure(lambda: llm_model.run_conversation(text), iterations, concurrency)))
+    results[-1][1]["llm_requests"] = config.requests
+    return results
+
+
+SCENARIOS = {
+    "get_dataset": scenario_get_dataset,
+    "store_dataframe": scenario_store_dataframe,
+    "execute_query": scenario_execute_query,
+    "get_video_links": scenario_get_video_links,
+    "run_conversation": scenario_run_conversation,
+}
+REQUIRES_POSTGRES = {"store_dataframe"}
+
+
+def run_child(args):
+    """Run one scenario in this process and print its results as one JSON line."""
+    results = [{"scenario": args.scenario, "case": case, **result} for case, result in SCENARIOS[args.scenario](args)]
+    peak = round(peak_rss_mb(), 1)
+    for result in results:
+        result["peak_rss_mb"] = peak
+    print(json.dumps(results))
+
+
+def run_scenario(name, data_dir):
+    command = [sys.executable, "-m", "benchmarks.run", *sys.argv[1:], "--scenario", name, "--data-dir", data_dir]
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        return [{"scenario": name, "error": process.stderr.strip().splitlines()[-1:]}]
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def print_row(result):
+    if "case" not in result:
+        reason = result.get("skipped") or result.get("error")
+        print(f"{result['scenario']:<18} {'-':<16} {reason}")
+        return
+    print(f"{result['scenario']:<18} {result['case']:<16} {result['concurrency']:>4} {result['ops_per_s']:>10.1f}"
+          f" {result['items_per_s']:>12.1f} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f}"
+          f" {result['p99_ms']:>10.2f} {result['peak_rss_mb']:>9.0f}")
+
+
+def compare(results, baseline_path):
+    """Print the p50 and throughput change of each case against an earlier results file."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    key = lambda r: (r["scenario"], r.get("case"), r.get("concurrency"))
+    before = {key(r): r for r in baseline["results"] if "case" in r}
+    print(f"\nagainst {baseline_path} (commit {(baseline.get('commit') or '?')[:10]})")
+    for result in results:
+        old = before.get(key(result))
+        if "case" not in result or old is None:
+            continue
+        p50 = (result["p50_ms"] / old["p50_ms"] - 1) * 100 if old["p50_ms"] else 0.0
+        throughput = (result["ops_per_s"] / old["ops_per_s"] - 1) * 100 if old["ops_per_s"] else 0.0
+        print(f"{result['scenario']:<18} {result['case']:<16} {result['concurrency']:>4}"
+              f"   p50 {p50:>+7.1f}%   throughput {throughput:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic dataset size.")
+    parser.add_argument("--data-dir", help="Existing directory with the raw dataset, instead of a synthetic one.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=300, help="Queries per execute_query case.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--video-ids", type=int, default=200)
+    parser.add_argument("--youtube-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--no-postgres", action="store_true", help="Skip the Postgres cases.")
+    parser.add_argument("--output", help="Results file; defaults to benchmarks/results/<time>-<commit>.json.")
+    parser.add_argument("--baseline", help="Earlier results file to compare with.")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_child(args)
+        return
+
+    from benchmarks.postgres_fixture import PostgresUnavailable, local_postgres
+    from benchmarks.synthetic import write_raw_dataset
+
+    metadata = run_metadata()
+    results = []
+    with ExitStack() as stack:
+        data_dir = args.data_dir or stack.enter_context(tempfile.TemporaryDirectory(prefix="bench-data-"))
+        if not args.data_dir:
+            write_raw_dataset(data_dir, args.rows)
+
+        postgres_skip = "--no-postgres" if args.no_postgres else None
+        if not postgres_skip and {"store_dataframe", "execute_query"} & set(args.scenarios):
+            try:
+                stack.enter_context(local_postgres())
+                os.environ["BENCH_POSTGRES_READY"] = "1"
+            except PostgresUnavailable as e:
+                postgres_skip = str(e)
+        if postgres_skip:
+            print(f"Postgres cases skipped: {postgres_skip}")
+
+        print(f"{'scenario':<18} {'case':<16} {'conc':>4} {'ops/s':>10} {'items/s':>12} {'p50 ms':>10}"
+              f" {'p95 ms':>10} {'p99 ms':>10} {'rss MB':>9}")
+        for name in args.scenarios:
+            if name in REQUIRES_POSTGRES and postgres_skip:
+                scenario_results = [{"scenario": name, "skipped": postgres_skip}]
+            else:
+                scenario_results = run_scenario(name, data_dir)
+            for result in scenario_results:
+                print_row(result)
+            results.extend(scenario_results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{metadata['timestamp'].replace(':', '')[:17]}-{(metadata['commit'] or 'nogit')[:10]}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    arguments = {k: v for k, v in vars(args).items() if k not in ("scenario", "output", "baseline")}
+    with open(output, "w") as f:
+        json.dump({**metadata, "arguments": arguments, "results": results}, f, indent=2)
+    print(f"\nresults written to {output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
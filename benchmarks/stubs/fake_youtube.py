@@ -0,0 +1,90 @@
+"""In-process fake of the YouTube Data API `videos().list` endpoint."""
+import json
+import time
+import random
+import threading
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+class _Request:
+    def __init__(self, api, ids):
+        self._api = api
+        self._ids = ids
+
+    def execute(self):
+        return self._api._execute(self._ids)
+
+
+class _Videos:
+    def __init__(self, api):
+        self._api = api
+
+    def list(self, part, id, maxResults=None, **kwargs):
+        ids = id.split(",")
+        if len(ids) > 50:
+            raise ValueError("videos().list accepts at most 50 IDs")
+        return _Request(self._api, ids)
+
+
+class FakeYouTube:
+    """
+    Stand-in for the discovery client that counts calls and quota.
+
+    :param latency: Seconds each `execute()` sleeps, to mimic the network.
+    :param missing: Video IDs reported as not found.
+    :param error_rate: Fraction of calls that fail with `error_status`.
+    :param error_status: 403 (with a rateLimitExceeded reason) or a 5xx status.
+    :param daily_quota: Units after which calls fail with quotaExceeded.
+    :param seed: Seed for the error injection.
+    """
+
+    QUOTA_PER_LIST_CALL = 1
+
+    def __init__(self, latency=0.05, missing=(), error_rate=0.0, error_status=503, daily_quota=None, seed=0):
+        self.latency = latency
+        self.missing = set(missing)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.daily_quota = daily_quota
+        self.calls = 0
+        self.errors = 0
+        self.quota_used = 0
+        self.requested_ids = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _http_error(status, reason):
+        content = json.dumps({"error": {"code": status, "errors": [{"reason": reason}]}}).encode()
+        return HttpError(httplib2.Response({"status": status}), content)
+
+    def videos(self):
+        return _Videos(self)
+
+    def _execute(self, ids):
+        with self._lock:
+            self.calls += 1
+            self.requested_ids.extend(ids)
+            if self.daily_quota is not None and self.quota_used >= self.daily_quota:
+                raise self._http_error(403, "quotaExceeded")
+            self.quota_used += self.QUOTA_PER_LIST_CALL
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(self.latency)
+        if fail:
+            reason = "rateLimitExceeded" if self.error_status == 403 else "backendError"
+            raise self._http_error(self.error_status, reason)
+        return {
+            "items": [
+                {
+                    "id": video_id,
+                    "snippet": {
+                        "title": f"Video {video_id}",
+                        "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{video_id}/default.jpg"}},
+                    },
+                }
+                for video_id in ids if video_id not in self.missing
+            ]
+        }
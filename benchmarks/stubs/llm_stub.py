@@ -0,0 +1,153 @@
+"""
+Local stand-in for the Groq/OpenAI chat completions API.
+
+The first completion of a conversation (tools offered, no tool results yet)
+answers with `execute_query` tool calls; later completions answer with text,
+streamed as SSE chunks when `stream` is set. The tool name, its raw arguments
+and the status of the answer completion can be set to exercise error paths.
+Latencies are configurable:
+
+    python -m benchmarks.stubs.llm_stub --port 8100 --latency 0.3 --token-interval 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8100 uvicorn src.backend.main:app
+"""
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_QUERY = "SELECT video_id, title, thumbnail_link FROM youtube_trending_data ORDER BY comment_count DESC LIMIT 5"
+
+
+class StubConfig:
+    def __init__(self, latency=0.3, token_interval=0.02, tokens=40, tool_calls=1, query=DEFAULT_QUERY,
+                 tool_name="execute_query", arguments=None, answer_status=200):
+        self.latency = latency
+        self.token_interval = token_interval
+        self.tokens = tokens
+        self.tool_calls = tool_calls
+        self.query = query
+        self.tool_name = tool_name
+        # Raw JSON string of the tool arguments; defaults to {"query": query}
+        self.arguments = arguments
+        self.answer_status = answer_status
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def _completion(model, message, finish_reason, prompt_tokens):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 20, "total_tokens": prompt_tokens + 20},
+    }
+
+
+def make_handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with config.lock:
+                config.requests += 1
+
+            model = request.get("model", "stub")
+            messages = request.get("messages", [])
+            prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+            has_tool_results = any(m.get("role") == "tool" for m in messages)
+            time.sleep(config.latency)
+
+            if request.get("tools") and not has_tool_results and config.tool_calls:
+                tool_calls = [
+                    {
+                        "id": f"call_{i}",
+                        "type": "function",
+                        "function": {
+                            "name": config.tool_name,
+                            "arguments": config.arguments if config.arguments is not None
+                            else json.dumps({"query": config.query}),
+                        },
+                    }
+                    for i in range(config.tool_calls)
+                ]
+                self._send_json(_completion(model, {"role": "assistant", "content": None, "tool_calls": tool_calls},
+                                            "tool_calls", prompt_tokens))
+                return
+
+            if config.answer_status != 200:
+                self.send_error(config.answer_status)
+                return
+
+            words = [f"token{i} " for i in range(config.tokens)]
+            if not request.get("stream"):
+                self._send_json(_completion(model, {"role": "assistant", "content": "".join(words)}, "stop", prompt_tokens))
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def send_event(payload):
+                data = f"data: {payload}\n\n".encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            for index, word in enumerate(words + [None]):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"content": word} if word else {},
+                        "finish_reason": None if word else "stop",
+                    }],
+                }
+                send_event(json.dumps(chunk))
+                if word and index < len(words) - 1:
+                    time.sleep(config.token_interval)
+            send_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def serve(port=0, **kwargs):
+    """Start the stub in a background thread and return `(server, config)`; the port is `server.server_port`."""
+    config = StubConfig(**kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--tool-calls", type=int, default=1)
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, latency=args.latency, token_interval=args.token_interval, tool_calls=args.tool_calls)
+    print(f"LLM stub listening on http://127.0.0.1:{server.server_port}")
+    threading.Event().wait()
@@ -0,0 +1,72 @@
+"""
+Local HTTP stand-in for the YouTube Data API `videos().list` endpoint.
+
+Serves the responses of `FakeYouTube` over HTTP, so the real discovery client,
+its HTTP stack and `get_youtube_service` are exercised without quota:
+
+    python -m benchmarks.stubs.youtube_stub --port 8200 --latency 0.08
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8200/youtube/v3/ YOUTUBE_API_KEY=stub uvicorn src.backend.main:app
+"""
+import json
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from googleapiclient.errors import HttpError
+from benchmarks.stubs.fake_youtube import FakeYouTube
+
+
+def make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.rstrip("/").endswith("/videos"):
+                self.send_error(404)
+                return
+            ids = ",".join(parse_qs(url.query).get("id", [])).split(",")
+            try:
+                response = api._execute([video_id for video_id in ids if video_id])
+            except HttpError as e:
+                self._send(e.resp.status, e.content)
+                return
+            self._send(200, json.dumps(response).encode())
+
+    return Handler
+
+
+def serve(port=0, **kwargs):
+    """
+    Start the stub in a background thread.
+
+    :param kwargs: `FakeYouTube` options: latency, missing, error_rate, error_status, daily_quota.
+    :return: `(server, api)`; the endpoint is `http://127.0.0.1:{server.server_port}/youtube/v3/`
+        and `api` holds the call and quota counters.
+    """
+    api = FakeYouTube(**kwargs)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(api))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, api
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"YouTube stub listening on http://127.0.0.1:{server.server_port}/youtube/v3/")
+    threading.Event().wait()
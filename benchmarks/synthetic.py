@@ -0,0 +1,99 @@
+"""
+Synthetic data shaped like the IN trending dataset.
+
+    python -m benchmarks.synthetic --rows 1000000 --out /tmp/trending --region IN
+"""
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+
+CATEGORIES = {
+    "1": "Film & Animation", "2": "Autos & Vehicles", "10": "Music", "15": "Pets & Animals",
+    "17": "Sports", "19": "Travel & Events", "20": "Gaming", "22": "People & Blogs",
+    "23": "Comedy", "24": "Entertainment", "25": "News & Politics", "26": "Howto & Style",
+    "27": "Education", "28": "Science & Technology",
+}
+
+
+def make_frame(rows, seed=0, start_row=0, videos_per_day=200):
+    """
+    Build a DataFrame with the columns and dtypes of `get_dataset()`.
+
+    Rows are grouped into trending days of `videos_per_day` snapshots, and
+    `start_row` lets consecutive calls produce a continuous dataset.
+    """
+    rng = np.random.default_rng(seed + start_row)
+    index = np.arange(start_row, start_row + rows)
+    day = index // videos_per_day
+    video = rng.integers(0, max(videos_per_day * 5, rows // 4 + 1), rows)
+    category_ids = np.array(list(CATEGORIES))
+    category = category_ids[rng.integers(0, len(category_ids), rows)]
+    trending = pd.Timestamp("2020-08-12", tz="UTC") + pd.to_timedelta(day, unit="D")
+    views = rng.lognormal(12, 1.5, rows).astype(np.int64)
+
+    return pd.DataFrame({
+        "video_id": [f"vid{v:08d}" for v in video],
+        "title": [f"Synthetic trending video {v} cricket music vlog" for v in video],
+        "publishedAt": (trending - pd.to_timedelta(rng.integers(1, 72, rows), unit="h")).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "channelId": [f"UC{v % 5000:06d}" for v in video],
+        "channelTitle": [f"Channel {v % 5000}" for v in video],
+        "categoryId": category,
+        "trending_date": trending.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "tags": ["cricket|music|vlog|india" if v % 3 else "[None]" for v in video],
+        "view_count": views,
+        "likes": (views * rng.uniform(0.01, 0.08, rows)).astype(np.int64),
+        "dislikes": (views * rng.uniform(0.0, 0.004, rows)).astype(np.int64),
+        "comment_count": (views * rng.uniform(0.0, 0.01, rows)).astype(np.int64),
+        "thumbnail_link": [f"https://i.ytimg.com/vi/vid{v:08d}/default.jpg" for v in video],
+        "comments_disabled": rng.random(rows) < 0.02,
+        "ratings_disabled": rng.random(rows) < 0.01,
+        "description": ["A synthetic description with enough text to resemble the real column. " * 4] * rows,
+        "category_name": [CATEGORIES[c] for c in category],
+    })
+
+
+def iter_frames(rows, chunksize=100_000, seed=0):
+    """Yield `make_frame` chunks adding up to `rows` rows."""
+    for start in range(0, rows, chunksize):
+        yield make_frame(min(chunksize, rows - start), seed=seed, start_row=start)
+
+
+def write_raw_dataset(directory, rows, chunksize=100_000, seed=0, region="IN"):
+    """
+    Write a raw `<region>_youtube_trending_data.csv` and `<region>_category_id.json` pair.
+
+    The CSV has the column layout of the Kaggle export (no `category_name`), so
+    it exercises the full `get_dataset` processing path.
+
+    :return: Tuple of the CSV and JSON paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, f"{region}_youtube_trending_data.csv")
+    json_path = os.path.join(directory, f"{region}_category_id.json")
+
+    for index, frame in enumerate(iter_frames(rows, chunksize, seed)):
+        frame = frame.drop(columns=["category_name"])
+        frame["categoryId"] = frame["categoryId"].astype(int)
+        frame.to_csv(csv_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+
+    items = [{"kind": "youtube#videoCategory", "id": key, "snippet": {"title": title, "assignable": True}}
+             for key, title in CATEGORIES.items()]
+    with open(json_path, "w") as f:
+        json.dump({"kind": "youtube#videoCategoryListResponse", "items": items}, f)
+
+    return csv_path, json_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", required=True, help="Directory for the CSV and category JSON.")
+    parser.add_argument("--region", default="IN")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for path in write_raw_dataset(args.out, args.rows, args.chunksize, args.seed, args.region):
+        print(path)
@@ -0,0 +1,94 @@
+import os
+import re
+import asyncio
+from src.backend.utils.env import load_env
+from src.backend.utils.logger import get_logger
+
+load_env()
+logger = get_logger()
+
+USER = os.getenv("user")
+PASSWORD = os.getenv("password")
+HOST = os.getenv("host")
+PORT = os.getenv("port")
+DBNAME = os.getenv("dbname")
+
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def init_pool():
+    """Create the asyncpg pool, once per process (or event loop)."""
+    global pool
+    async with _pool_lock:
+        if pool is None:
+            import asyncpg
+
+            pool = await asyncpg.create_pool(
+                user=USER,
+                password=PASSWORD,
+                host=HOST,
+                port=PORT,
+                database=DBNAME,
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                # Supabase's transaction pooler does not support prepared statements
+                statement_cache_size=0,
+            )
+            logger.info("Async database pool established successfully.")
+    return pool
+
+
+async def close_pool():
+    """Close the asyncpg pool."""
+    global pool
+    async with _pool_lock:
+        if pool is not None:
+            await pool.close()
+            pool = None
+            logger.info("Async database pool closed.")
+
+
+def _to_numbered_params(query):
+    """Rewrite psycopg2-style `%s` placeholders into asyncpg's `$1, $2, ...`."""
+    counter = iter(range(1, query.count("%s") + 1))
+    return re.sub(r"%s", lambda _: f"${next(counter)}", query)
+
+
+async def execute_query_async(query, params=None, fetch="all"):
+    """
+    Async counterpart of `db.execute_query` with the same contract.
+
+    :param query: SQL query to execute, with psycopg2-style `%s` placeholders.
+    :param params: Tuple of parameters for the query.
+    :param fetch: Mode for fetching results - "all" (default), "one", or None for no fetching.
+    :return: Rows as tuples if fetching is enabled, else None. None on error.
+    """
+    if not query:
+        logger.error("Query is empty. Aborting execution.")
+        return None
+
+    try:
+        db_pool = await init_pool()
+        sql = _to_numbered_params(query) if params else query
+        async with db_pool.acquire(timeout=POOL_TIMEOUT) as connection:
+            logger.debug("Executing query: %s with params: %s", query, params)
+            if fetch == "all":
+                result = [tuple(row) for row in await connection.fetch(sql, *(params or ()))]
+                logger.debug("Fetched %d rows.", len(result))
+            elif fetch == "one":
+                row = await connection.fetchrow(sql, *(params or ()))
+                result = tuple(row) if row is not None else None
+                logger.debug("Fetched 1 row.")
+            else:
+                await connection.execute(sql, *(params or ()))
+                result = None
+            return result
+
+    except Exception as e:
+        logger.error(f"Query execution failed: {e}")
+        return None
@@ -0,0 +1,69 @@
+import os
+import time
+import asyncio
+from src.backend.utils.tracing import profile_query, span
+
+# Where the chatbot's read queries run: "postgres" (the Supabase database) or
+# "duckdb" (an in-process copy of the processed dataset, no network needed).
+# Ingestion and schema management always use Postgres.
+QUERY_BACKEND = os.getenv("QUERY_BACKEND", "postgres").lower()
+
+BACKENDS = ("postgres", "duckdb")
+
+
+def get_backend(name=None):
+    """Return the module implementing `execute_query` for a backend name, by default `QUERY_BACKEND`."""
+    name = name or QUERY_BACKEND
+    if name == "postgres":
+        from src.backend.database import db
+        return db
+    if name == "duckdb":
+        from src.backend.database import duckdb_backend
+        return duckdb_backend
+    raise ValueError(f"Unknown query backend: {name}. Expected one of {', '.join(BACKENDS)}.")
+
+
+def get_data_version(backend=None):
+    """
+    Return a token that changes whenever the data behind a backend changes.
+
+    Postgres reports its last committed load; DuckDB the Parquet cache it was
+    loaded from, so cached results follow the backend that produced them.
+    """
+    if (backend or QUERY_BACKEND) == "duckdb":
+        return get_backend("duckdb").data_version()
+    from src.backend.database.loader import get_data_version as get_load_version
+    return get_load_version()
+
+
+def _profile(query, params, fetch, backend, started, result, fields):
+    rows = len(result) if fetch == "all" and result is not None else None
+    fields["rows"] = rows
+    profile_query(query, params, time.perf_counter() - started, rows, source="app", backend=backend)
+
+
+def execute_query(query, params=None, fetch="all", backend=None):
+    """
+    Run a read query on the configured backend, with the contract of `db.execute_query`.
+
+    The query is timed as an "sql" span of the current request and checked
+    against the slow-query threshold.
+    """
+    with span("sql", source="app", backend=backend or QUERY_BACKEND) as fields:
+        started = time.perf_counter()
+        result = get_backend(backend).execute_query(query, params, fetch)
+        _profile(query, params, fetch, backend, started, result, fields)
+    return result
+
+
+async def execute_query_async(query, params=None, fetch="all", backend=None):
+    """Async counterpart of `execute_query`."""
+    if (backend or QUERY_BACKEND) != "postgres":
+        return await asyncio.to_thread(execute_query, query, params, fetch, backend)
+
+    from src.backend.database.async_db import execute_query_async as execute_postgres
+    with span("sql", source="app", backend="postgres") as fields:
+        started = time.perf_counter()
+        result = await execute_postgres(query, params, fetch)
+        _profile(query, params, fetch, backend, started, result, fields)
+    return result
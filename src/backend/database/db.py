@@ -1,42 +1,81 @@
+from __future__ import annotations
+
+import io
 import os
+import threading
+from typing import TYPE_CHECKING
 import psycopg2
-from dotenv import load_dotenv
-import pandas as pd
-from src.data.dataset import get_dataset
+import psycopg2.errors
+import psycopg2.extras
+from src.backend.database.pool import ConnectionPool
+from src.backend.utils.env import load_env
 from src.backend.utils.logger import get_logger
 
-connection = None 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Load environment variables from .env
-load_dotenv()
+load_env()
 
 # Configure logging
 logger = get_logger()
 
 TABLE = 'youtube_trending_data'
 
+# Natural key of a trending snapshot
+KEY_COLUMNS = ("video_id", "trending_date")
+
 """Initialize the database connection."""
 USER = os.getenv("user")
 PASSWORD = os.getenv("password")
 HOST = os.getenv("host")
 PORT = os.getenv("port")
 DBNAME = os.getenv("dbname")
-connection = None
+
+# Connection pool settings
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "60"))
+
+pool = None
+_pool_lock = threading.Lock()
 
 def connect():
-    """Establish a connection to the Supabase database."""
-    global connection
-    try:
-        connection = psycopg2.connect(
-            user=USER,
-            password=PASSWORD,
-            host=HOST,
-            port=PORT,
-            dbname=DBNAME
-        )
-        logger.info("Database connection established successfully.")
-    except Exception as e:
-        logger.error(f"Failed to connect to the database: {e}")
-        connection = None
+    """Create the connection pool for the Supabase database."""
+    global pool
+    with _pool_lock:
+        if pool is not None:
+            return pool
+        try:
+            pool = ConnectionPool(
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                timeout=POOL_TIMEOUT,
+                health_check_interval=POOL_HEALTH_CHECK_INTERVAL,
+                user=USER,
+                password=PASSWORD,
+                host=HOST,
+                port=PORT,
+                dbname=DBNAME
+            )
+            logger.info("Database connection pool established successfully.")
+        except Exception as e:
+            logger.error(f"Failed to connect to the database: {e}")
+            pool = None
+        return pool
+
+def get_connection():
+    """
+    Check out a pooled connection as a context manager.
+
+    The transaction is rolled back if the block raises, and the connection is
+    always returned to the pool.
+    """
+    db_pool = connect()
+    if db_pool is None:
+        raise psycopg2.OperationalError("Failed to establish database connection.")
+    return db_pool.connection()
 
 def execute_query(query, params=None, fetch="all"):
     """
@@ -47,30 +86,26 @@ def execute_query(query, params=None, fetch="all"):
     :param fetch: Mode for fetching results - "all" (default), "one", or None for no fetching.
     :return: Query result if fetching is enabled, else None.
     """
-    global connection  
-
     if not query:
         logger.error("Query is empty. Aborting execution.")
         return None  
 
-    if connection is None:
-        logger.warning("Database connection is not initialized. Attempting to reconnect.")
-        connect()
-        if connection is None:
-            logger.error("Failed to establish database connection.")
-            return None
+    db_pool = connect()
+    if db_pool is None:
+        logger.error("Failed to establish database connection.")
+        return None
 
     try:
-        with connection.cursor() as cursor:
-            logger.info(f"Executing query: {query} with params: {params}")  
+        with db_pool.connection() as connection, connection.cursor() as cursor:
+            logger.debug("Executing query: %s with params: %s", query, params)
             cursor.execute(query, params if params else ())
             # Fetch results if required
             if fetch == "all":
                 result = cursor.fetchall()
-                logger.info(f"Fetched {len(result)} rows.")
+                logger.debug("Fetched %d rows.", len(result))
             elif fetch == "one":
                 result = cursor.fetchone()
-                logger.info("Fetched 1 row.")
+                logger.debug("Fetched 1 row.")
             else:
                 result = None
 
@@ -84,21 +119,15 @@ def execute_query(query, params=None, fetch="all"):
     except Exception as e:
         logger.error(f"Query execution failed: {e}")
         return None
-    finally:
-        if cursor:
-            cursor.close()
 
 def table_exists(table_name: str) -> bool:
     """Check if a table exists in the database."""
     query = "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = %s);"
-    result = execute_query(query, (table_name.lower(),), fetch=True)
+    result = execute_query(query, (table_name.lower(),), fetch="all")
     return result[0][0] if result else False
 
 def create_table_from_dataframe(df: pd.DataFrame, table_name: str):
     """Dynamically create a table based on the DataFrame columns if it doesn't exist."""
-    if connection is None:
-        connect()
-
     if table_exists(table_name):
         logger.warning(f"Table '{table_name}' already exists.")
         return
@@ -119,42 +148,179 @@ def create_table_from_dataframe(df: pd.DataFrame, table_name: str):
         
         column_definitions.append(f"{column} {pg_type}")
 
+    if all(key in df.columns for key in KEY_COLUMNS):
+        column_definitions.append(f"PRIMARY KEY ({', '.join(KEY_COLUMNS)})")
+
     create_query = f"CREATE TABLE {table_name} ({', '.join(column_definitions)});"
 
     try:
-        execute_query(create_query)
+        execute_query(create_query, fetch=None)
         logger.info(f"Table '{table_name}' created successfully.")
     except Exception as e:
         logger.error(f"Failed to create table: {e}")
 
-def store_dataframe(df: pd.DataFrame, table_name: str):
-    """Store a Pandas DataFrame into a Supabase PostgreSQL table."""
+# Marker for missing values in COPY buffers; an unquoted empty field would also read as NULL
+COPY_NULL = r"\N"
+
+def dataframe_to_copy_buffer(df: pd.DataFrame) -> io.StringIO:
+    """
+    Serialize a DataFrame into an in-memory CSV buffer suitable for `COPY ... FROM STDIN`.
+
+    Float columns holding only whole numbers (integer columns that picked up NaNs
+    in a chunk) are written without a decimal part so they still load into BIGINT.
+    Missing values are written as `COPY_NULL`, so empty strings stay empty
+    strings, as with `insert_dataframe`, instead of loading as NULL.
+    """
+    out = df
+    for column in df.columns:
+        series = df[column]
+        if series.dtype.kind == "f":
+            values = series.dropna()
+            if (values == values.round()).all():
+                if out is df:
+                    out = df.copy(deep=False)
+                out[column] = series.astype("Int64")
+
+    buffer = io.StringIO()
+    out.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+    return buffer
+
+def copy_dataframe(cursor, df: pd.DataFrame, table_name: str):
+    """Load a DataFrame into an existing table with `COPY FROM STDIN` on the given cursor."""
+    columns = ', '.join(df.columns)
+    copy_query = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    cursor.copy_expert(copy_query, dataframe_to_copy_buffer(df))
+
+def insert_dataframe(cursor, df: pd.DataFrame, table_name: str):
+    """Insert a DataFrame into an existing table with `execute_batch` on the given cursor."""
+    # Generate column names dynamically
+    columns = ', '.join(df.columns)
+    values = ', '.join(['%s' for _ in df.columns])
+    insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
+
+    # Insert all rows in bulk
+    psycopg2.extras.execute_batch(cursor, insert_query, df.values)
+
+def ensure_unique_key(table_name: str, key_columns=KEY_COLUMNS):
+    """
+    Make sure `table_name` has a unique index on the natural key, as required by `ON CONFLICT`.
+
+    Tables created before the key existed get the index added; this fails if they
+    already hold duplicate snapshots.
+    """
+    index_name = f"{table_name}_{'_'.join(key_columns)}_key"
+    execute_query(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(key_columns)});",
+        fetch=None,
+    )
+
+# Row number of the staging table, filled in COPY order, so the last snapshot of a key wins
+STAGING_ROW_COLUMN = "staging_row"
+
+def upsert_dataframe(cursor, df: pd.DataFrame, table_name: str, key_columns=KEY_COLUMNS) -> int:
+    """
+    Upsert a DataFrame into an existing table on the given cursor.
+
+    Rows are COPYed into a temporary staging table and merged with
+    `INSERT ... ON CONFLICT`, so re-loading the same snapshots updates them in
+    place instead of duplicating them. When the DataFrame itself repeats a key,
+    its last row wins: the staging table numbers rows in COPY order.
+
+    :return: Number of rows inserted or updated.
+    """
+    staging_table = f"{table_name}_staging"
+    columns = ', '.join(df.columns)
+    keys = ', '.join(key_columns)
+    updates = ', '.join(
+        f"{column} = EXCLUDED.{column}" for column in df.columns if column not in key_columns
+    )
+
+    cursor.execute(
+        f"CREATE TEMP TABLE {staging_table} "
+        f"(LIKE {table_name} INCLUDING DEFAULTS, {STAGING_ROW_COLUMN} BIGSERIAL) ON COMMIT DROP;"
+    )
+    copy_dataframe(cursor, df, staging_table)
+    cursor.execute(
+        f"""
+        INSERT INTO {table_name} ({columns})
+        SELECT DISTINCT ON ({keys}) {columns} FROM {staging_table}
+        ORDER BY {keys}, {STAGING_ROW_COLUMN} DESC
+        ON CONFLICT ({keys}) DO UPDATE SET {updates};
+        """
+    )
+    return cursor.rowcount
+
+def copy_or_upsert_dataframe(cursor, df: pd.DataFrame, table_name: str, key_columns=KEY_COLUMNS):
+    """
+    Load a DataFrame with `COPY FROM STDIN`, falling back to an upsert when a key already exists.
+
+    The chunk is copied under a savepoint. If it repeats a (video_id, trending_date)
+    key, within the chunk or against rows already loaded, the copy is rolled back
+    to the savepoint and the chunk is merged with `upsert_dataframe` instead, so
+    later snapshots of a key win rather than failing the load on every retry.
+    """
+    cursor.execute("SAVEPOINT copy_chunk;")
     try:
-        if connection is None:
-            connect()
+        copy_dataframe(cursor, df, table_name)
+    except psycopg2.errors.UniqueViolation:
+        cursor.execute("ROLLBACK TO SAVEPOINT copy_chunk;")
+        logger.info(f"Chunk repeats keys already in '{table_name}'; upserting it instead.")
+        upsert_dataframe(cursor, df, table_name, key_columns)
+    cursor.execute("RELEASE SAVEPOINT copy_chunk;")
 
-        create_table_from_dataframe(df, table_name)
+def store_dataframe(df, table_name: str, method: str = "copy"):
+    """
+    Store a Pandas DataFrame into a Supabase PostgreSQL table.
 
-        with connection.cursor() as cursor:
-            # Generate column names dynamically
-            columns = ', '.join(df.columns)
-            values = ', '.join(['%s' for _ in df.columns])
-            insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
+    :param df: DataFrame to store, or an iterable of DataFrame chunks such as
+        `get_dataset_chunks()`. Each chunk is committed on its own, so memory
+        and transaction size stay bounded by the chunk size.
+    :param table_name: Target table, created from the DataFrame columns if missing.
+    :param method: "copy" (default) to stream the rows with `COPY FROM STDIN`
+        (upserting chunks that repeat a key),
+        "batch" to fall back to `execute_batch` inserts, or "upsert" to merge
+        on the natural key so that repeated loads stay idempotent.
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method: {method}")
 
-            # Insert all rows in bulk
-            psycopg2.extras.execute_batch(cursor, insert_query, df.values)
+    import pandas as pd
 
-        connection.commit()
-        logger.info(f"Data inserted successfully into '{table_name}'!")
+    chunks = [df] if isinstance(df, pd.DataFrame) else df
+
+    try:
+        rows = 0
+        for index, chunk in enumerate(chunks):
+            if index == 0:
+                create_table_from_dataframe(chunk, table_name)
+                if method == "upsert":
+                    ensure_unique_key(table_name)
+
+            with get_connection() as connection, connection.cursor() as cursor:
+                LOAD_METHODS[method](cursor, chunk, table_name)
+                connection.commit()
+            rows += len(chunk)
+
+        logger.info(f"{rows} rows inserted successfully into '{table_name}'!")
 
     except Exception as e:
         logger.error(f"Failed to insert data: {e}")
 
+LOAD_METHODS = {
+    "copy": copy_or_upsert_dataframe,
+    "batch": insert_dataframe,
+    "upsert": upsert_dataframe,
+}
+
 def close():
-    """Close the database connection."""
-    if connection:
-        connection.close()
-        logger.info("Connection closed.")
+    """Close the database connection pool."""
+    global pool
+    with _pool_lock:
+        if pool:
+            pool.closeall()
+            pool = None
+            logger.info("Connection pool closed.")
 
 # if __name__ == "__main__":
 #     # db = Database()
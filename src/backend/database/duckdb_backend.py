@@ -0,0 +1,221 @@
+import os
+import re
+import time
+import threading
+import duckdb
+from src.data import dataset
+from src.backend.database.db import TABLE
+from src.backend.database.schema import COLUMNS
+from src.backend.database.summaries import (
+    SUMMARY_TABLES,
+    VIDEO_STATS_TABLE,
+    CHANNEL_DAILY_TABLE,
+    CATEGORY_DAILY_TABLE,
+    VIDEO_VELOCITY_TABLE,
+)
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "1GB")
+THREADS = int(os.getenv("DUCKDB_THREADS", str(os.cpu_count() or 1)))
+# Seconds between checks that the Parquet cache is still current
+CACHE_CHECK_INTERVAL = float(os.getenv("DUCKDB_CACHE_CHECK_SECONDS", "30"))
+
+# Same rows as the Postgres summary tables, computed in one pass over the dataset
+SUMMARY_QUERIES = {
+    VIDEO_STATS_TABLE: f"""
+        SELECT video_id, arg_max(title, trending_date), arg_max(channelId, trending_date),
+               arg_max(channelTitle, trending_date), arg_max(category_name, trending_date),
+               arg_max(thumbnail_link, trending_date), min(trending_date), max(trending_date), count(*),
+               arg_max(view_count, trending_date), arg_max(likes, trending_date),
+               arg_max(comment_count, trending_date), max(view_count), max(likes), max(comment_count)
+        FROM {TABLE} GROUP BY video_id
+    """,
+    CHANNEL_DAILY_TABLE: f"""
+        SELECT channelId, trending_date::DATE, max(channelTitle), count(DISTINCT video_id),
+               sum(view_count), sum(likes), sum(comment_count)
+        FROM {TABLE} WHERE channelId IS NOT NULL GROUP BY channelId, trending_date::DATE
+    """,
+    CATEGORY_DAILY_TABLE: f"""
+        SELECT category_name, trending_date::DATE, count(DISTINCT video_id),
+               sum(view_count), sum(likes), sum(comment_count)
+        FROM {TABLE} WHERE category_name IS NOT NULL GROUP BY category_name, trending_date::DATE
+    """,
+    VIDEO_VELOCITY_TABLE: f"""
+        SELECT video_id, trending_date, view_count, view_count - previous_views, likes - previous_likes,
+               comment_count - previous_comments,
+               (view_count - previous_views) / greatest(date_diff('second', previous_date, trending_date) / 86400.0, 1)
+        FROM (
+            SELECT video_id, trending_date, view_count, likes, comment_count,
+                   lag(trending_date) OVER w AS previous_date, lag(view_count) OVER w AS previous_views,
+                   lag(likes) OVER w AS previous_likes, lag(comment_count) OVER w AS previous_comments
+            FROM {TABLE}
+            WINDOW w AS (PARTITION BY video_id ORDER BY trending_date)
+        )
+        WHERE previous_date IS NOT NULL
+    """,
+}
+
+# Postgres to_char patterns and their strftime equivalents, longest first
+_TO_CHAR_FORMATS = [
+    ("YYYY", "%Y"), ("Month", "%B"), ("Mon", "%b"), ("HH24", "%H"), ("Day", "%A"), ("Dy", "%a"),
+    ("MM", "%m"), ("DD", "%d"), ("MI", "%M"), ("SS", "%S"), ("YY", "%y"),
+]
+_TO_CHAR = re.compile(r"\bto_char\s*\(\s*(.+?)\s*,\s*'([^']*)'\s*\)", re.I | re.S)
+_REGEX_OPERATOR = re.compile(r"([\w.]+)\s*(!?)~(\*?)\s*('(?:[^']|'')*')")
+_DATE_TRUNC_TZ = re.compile(r"\bdate_trunc\s*\(\s*('[^']*')\s*,\s*(.+?)\s*,\s*'[^']*'\s*\)", re.I | re.S)
+_FETCH_FIRST = re.compile(r"\bfetch\s+(?:first|next)\s+(\d+)\s+rows?\s+only\b", re.I)
+
+database = None
+_database_mtime = None
+_database_checked_at = 0.0
+_database_lock = threading.Lock()
+_local = threading.local()
+
+
+def _column_type(pg_type):
+    return pg_type.replace(" PRIMARY KEY", "").replace(" NOT NULL", "")
+
+
+def _load(path):
+    """Build an in-memory database holding the processed dataset and its summary tables."""
+    connection = duckdb.connect(config={"memory_limit": MEMORY_LIMIT, "threads": THREADS})
+    # Match Postgres semantics for the SQL the LLM writes against either backend
+    connection.execute("SET TimeZone = 'UTC'")
+    connection.execute("SET integer_division = true")
+    connection.execute("SET default_null_order = 'nulls_last_on_asc_first_on_desc'")
+
+    available = {row[0] for row in connection.execute("SELECT name FROM parquet_schema(?)", [path]).fetchall()}
+    columns = ", ".join(
+        f"CAST({name} AS {_column_type(pg_type)}) AS {name}"
+        for name, pg_type in COLUMNS.items() if name in available
+    )
+    # Same derived tag array as the generated tag_list column in Postgres
+    tag_list = "CASE WHEN tags IS NULL OR tags = '[None]' THEN []::VARCHAR[] ELSE string_split(lower(tags), '|') END"
+    connection.execute(
+        f"CREATE TABLE {TABLE} AS SELECT {columns}, {tag_list} AS tag_list FROM read_parquet(?)", [path]
+    )
+
+    for table_name, spec in SUMMARY_TABLES.items():
+        definition = ", ".join(f"{name} {_column_type(pg_type)}" for name, pg_type in spec["columns"].items())
+        connection.execute(f"CREATE TABLE {table_name} ({definition})")
+        connection.execute(f"INSERT INTO {table_name} {SUMMARY_QUERIES[table_name]}")
+
+    # The database is a read-only snapshot: no file access, no settings changes
+    connection.execute("SET enable_external_access = false")
+    connection.execute("SET lock_configuration = true")
+    return connection
+
+
+def connect():
+    """
+    Return the in-process DuckDB database, (re)loading it when the processed dataset changes.
+
+    The Parquet cache written by `get_dataset` is loaded into memory with the
+    Postgres column types, and the summary tables are computed from it, so the
+    same queries run against both backends. Whether the cache is still current
+    is checked at most every `CACHE_CHECK_INTERVAL` seconds, not on every query,
+    and by one thread at a time, so the cache and the database are rebuilt once.
+
+    A replaced database is not closed: closing it would also close the cursors
+    other threads may still be running queries on. DuckDB frees it once the
+    last of those cursors has been swapped for one on the new database.
+    """
+    global database, _database_mtime, _database_checked_at
+    if database is not None and time.monotonic() - _database_checked_at < CACHE_CHECK_INTERVAL:
+        return database
+    with _database_lock:
+        # Another thread may have checked while this one waited for the lock
+        if database is not None and time.monotonic() - _database_checked_at < CACHE_CHECK_INTERVAL:
+            return database
+        path = dataset.ensure_processed_cache()
+        mtime = os.path.getmtime(path)
+        if database is None or mtime != _database_mtime:
+            logger.info(f"Loading {path} into DuckDB.")
+            database = _load(path)
+            _database_mtime = mtime
+            logger.info("DuckDB database ready.")
+        _database_checked_at = time.monotonic()
+        return database
+
+
+def data_version():
+    """Return a token that changes whenever the database is reloaded from a new Parquet cache."""
+    connect()
+    return f"parquet:{_database_mtime}"
+
+
+def get_connection():
+    """Return this thread's DuckDB connection to the current database."""
+    current = connect()
+    if getattr(_local, "database", None) is not current:
+        _local.database = current
+        _local.connection = current.cursor()
+    return _local.connection
+
+
+def _to_char(match):
+    expression, pattern = match.groups()
+    for pg_format, strftime_format in _TO_CHAR_FORMATS:
+        pattern = pattern.replace(pg_format, strftime_format)
+    return f"strftime({expression}, '{pattern}')"
+
+
+def _regex_operator(match):
+    left, negate, insensitive, pattern = match.groups()
+    options = ", 'i'" if insensitive else ""
+    return f"{'NOT ' if negate else ''}regexp_matches({left}, {pattern}{options})"
+
+
+def translate(query, params=None):
+    """
+    Rewrite Postgres-flavoured SQL into DuckDB's dialect.
+
+    Covers the constructs the chatbot's SQL uses that DuckDB spells differently:
+    psycopg2 `%s` placeholders, `to_char`, the regex match operators (`~` is a
+    full match in DuckDB), `date_trunc` with a time zone and `FETCH FIRST`.
+    Everything else (`ILIKE`, `::` casts, intervals, `DISTINCT ON`, `FILTER`)
+    is shared by both dialects.
+    """
+    if params:
+        query = query.replace("%s", "?").replace("%%", "%")
+    query = _TO_CHAR.sub(_to_char, query)
+    query = _REGEX_OPERATOR.sub(_regex_operator, query)
+    query = _DATE_TRUNC_TZ.sub(r"date_trunc(\1, \2)", query)
+    query = _FETCH_FIRST.sub(r"LIMIT \1", query)
+    return query
+
+
+def execute_query(query, params=None, fetch="all"):
+    """
+    Run a read query on the embedded DuckDB copy of the dataset.
+
+    Same contract as `db.execute_query`.
+
+    :param query: SQL query to execute, in the Postgres dialect.
+    :param params: Tuple of parameters for the query.
+    :param fetch: Mode for fetching results - "all" (default), "one", or None for no fetching.
+    :return: Query result if fetching is enabled, else None. None on error.
+    """
+    if not query:
+        logger.error("Query is empty. Aborting execution.")
+        return None
+
+    try:
+        connection = get_connection()
+        logger.debug("Executing query on DuckDB: %s with params: %s", query, params)
+        connection.execute(translate(query, params), list(params) if params else None)
+        if fetch == "all":
+            result = connection.fetchall()
+            logger.debug("Fetched %d rows.", len(result))
+        elif fetch == "one":
+            result = connection.fetchone()
+            logger.debug("Fetched 1 row.")
+        else:
+            result = None
+        return result
+
+    except Exception as e:
+        logger.error(f"Query execution failed: {e}")
+        return None
@@ -0,0 +1,305 @@
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import threading
+from src.backend.database.db import TABLE, get_connection
+from src.backend.database.backends import QUERY_BACKEND
+from src.backend.database.schema import REGION_TABLE, REGIONS_VIEW
+from src.backend.database.summaries import SUMMARY_TABLES
+from src.backend.utils.logger import get_logger
+from src.backend.utils.tracing import profile_query, span
+
+logger = get_logger()
+
+# Relations LLM-generated SQL may read; other modules register theirs with `allow_table`
+ALLOWED_TABLES = {TABLE, REGIONS_VIEW, *SUMMARY_TABLES}
+# Relations allowed by name pattern: EXPLAIN expands the all-regions view into
+# its partitioned table and one youtube_trending_regions_<xx> partition per
+# region, which are created by the loader after this process started
+ALLOWED_TABLE_PATTERNS = [re.compile(rf"{REGION_TABLE}(_[a-z]{{2}})?")]
+ALLOWED_SCHEMAS = {"public"}
+
+MAX_ROWS = int(os.getenv("SQL_MAX_ROWS", "100"))
+MAX_RESULT_BYTES = int(os.getenv("SQL_MAX_RESULT_BYTES", "32768"))
+MAX_COST = float(os.getenv("SQL_MAX_COST", "500000"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("SQL_STATEMENT_TIMEOUT_MS", "5000"))
+FETCH_SIZE = int(os.getenv("SQL_FETCH_SIZE", "100"))
+
+# Functions with side effects or access outside the allowed tables
+DENIED_FUNCTIONS = {
+    "pg_sleep", "pg_read_file", "pg_read_binary_file", "pg_ls_dir", "pg_stat_file", "lo_import",
+    "lo_export", "dblink", "dblink_exec", "set_config", "pg_terminate_backend", "pg_cancel_backend",
+    "pg_reload_conf", "pg_advisory_lock", "txid_current", "nextval", "setval",
+}
+DENIED_KEYWORDS = {
+    "insert", "update", "delete", "merge", "drop", "alter", "create", "truncate", "grant", "revoke",
+    "copy", "call", "do", "execute", "vacuum", "analyze", "refresh", "lock", "set", "reset",
+    "comment", "listen", "notify", "into",
+}
+# Plan nodes that write or lock rows
+DENIED_PLAN_NODES = {"ModifyTable", "LockRows"}
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\$.*?\$\$", re.S)
+_TRAILING_LIMIT = re.compile(r"\blimit\s+(\d+)(\s+offset\s+\d+)?\s*$", re.I)
+
+
+class QueryRejected(Exception):
+    """Raised when generated SQL is not allowed to run. The message is safe to show the model."""
+
+
+def allow_table(*table_names):
+    """Let generated SQL read the given tables or views."""
+    ALLOWED_TABLES.update(name.lower() for name in table_names)
+
+
+def is_allowed_table(name):
+    """Whether generated SQL may read the named table, view or partition."""
+    name = name.lower()
+    return name in ALLOWED_TABLES or any(pattern.fullmatch(name) for pattern in ALLOWED_TABLE_PATTERNS)
+
+
+def check_query(query, max_rows=MAX_ROWS):
+    """
+    Validate generated SQL lexically and cap the rows it can return.
+
+    Only a single SELECT (or WITH ... SELECT) statement passes, without
+    write keywords or dangerous functions. The rows are capped by wrapping the
+    statement in an outer `LIMIT`, unless it already ends in a smaller one.
+
+    :return: The SQL to run.
+    :raises QueryRejected: If the statement is not a read-only query.
+    """
+    if not query or not query.strip():
+        raise QueryRejected("The query is empty.")
+
+    sql = _COMMENTS.sub(" ", query).strip().rstrip(";").strip()
+    # Analyse the statement with string literals blanked out, so their contents never match
+    code = _LITERALS.sub("''", sql).lower()
+
+    if ";" in code:
+        raise QueryRejected("Only a single statement is allowed.")
+
+    words = re.findall(r"[a-z_][a-z0-9_]*", code)
+    if not words or words[0] not in ("select", "with"):
+        raise QueryRejected("Only SELECT queries are allowed.")
+
+    denied = DENIED_KEYWORDS.intersection(words)
+    if denied:
+        raise QueryRejected(f"Keyword not allowed: {sorted(denied)[0].upper()}.")
+
+    for function in re.findall(r"([a-z_][a-z0-9_.]*)\s*\(", code):
+        if function.split(".")[-1] in DENIED_FUNCTIONS:
+            raise QueryRejected(f"Function not allowed: {function}.")
+
+    if re.search(r"\bfor\s+(update|share|no\s+key\s+update|key\s+share)\b", code):
+        raise QueryRejected("Row locking is not allowed.")
+
+    limit = _TRAILING_LIMIT.search(code)
+    if limit and int(limit.group(1)) <= max_rows and not limit.group(2):
+        return sql
+    return f"SELECT * FROM ({sql}) AS guarded_query LIMIT {max_rows}"
+
+
+def _walk_plan(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_plan(child)
+
+
+def check_plan(plan, max_cost=MAX_COST):
+    """
+    Validate the `EXPLAIN (FORMAT JSON, VERBOSE)` output of a query.
+
+    Postgres resolves views, CTEs and aliases, so the relations in the plan are
+    exactly the tables the query would read.
+
+    :raises QueryRejected: If the plan reads other relations, writes, or costs more than `max_cost`.
+    """
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]["Plan"]
+
+    for node in _walk_plan(root):
+        if node.get("Node Type") in DENIED_PLAN_NODES:
+            raise QueryRejected("The query would modify or lock rows.")
+        relation = node.get("Relation Name")
+        if relation is not None:
+            schema = node.get("Schema", "public")
+            if not is_allowed_table(relation) or schema not in ALLOWED_SCHEMAS:
+                raise QueryRejected(f"Table not allowed: {relation}. Allowed: {', '.join(sorted(ALLOWED_TABLES))}.")
+        function = node.get("Function Name")
+        if function is not None and function in DENIED_FUNCTIONS:
+            raise QueryRejected(f"Function not allowed: {function}.")
+
+    cost = root.get("Total Cost", 0)
+    if cost > max_cost:
+        raise QueryRejected(
+            f"The query is too expensive (estimated cost {cost:,.0f} > {max_cost:,.0f}). "
+            "Filter on indexed columns or aggregate instead of scanning the table."
+        )
+    return cost
+
+
+def _row_size(row):
+    return len(json.dumps(row, default=str))
+
+
+def _collect_rows(fetchmany, max_rows, max_bytes):
+    """Fetch rows in batches of `FETCH_SIZE` until the row or byte budget is spent."""
+    rows, size = [], 0
+    while len(rows) < max_rows:
+        batch = fetchmany(min(FETCH_SIZE, max_rows - len(rows)))
+        if not batch:
+            break
+        for row in batch:
+            size += _row_size(row)
+            if size > max_bytes:
+                logger.warning(f"Result truncated at {len(rows)} rows ({max_bytes} bytes).")
+                return rows
+            rows.append(tuple(row))
+    return rows
+
+
+def _execute_guarded_duckdb(sql, max_rows, max_bytes):
+    """
+    Run checked SQL on the embedded DuckDB backend.
+
+    The database only holds the allowlisted tables and cannot touch files, so
+    the plan check is not needed; the timeout interrupts the statement instead.
+    """
+    import duckdb
+    from src.backend.database import duckdb_backend
+
+    connection = duckdb_backend.get_connection()
+    timer = threading.Timer(STATEMENT_TIMEOUT_MS / 1000, connection.interrupt)
+    timer.start()
+    try:
+        connection.execute(duckdb_backend.translate(sql))
+        columns = [column[0] for column in connection.description]
+        rows = _collect_rows(connection.fetchmany, max_rows, max_bytes)
+    except duckdb.InterruptException as e:
+        raise QueryRejected(f"The query took longer than {STATEMENT_TIMEOUT_MS} ms.") from e
+    except duckdb.Error as e:
+        raise QueryRejected(f"The query is invalid: {str(e).strip()}") from e
+    finally:
+        timer.cancel()
+
+    logger.info(f"Guarded query returned {len(rows)} rows from DuckDB.")
+    return {"columns": columns, "rows": rows}
+
+
+def _execute_guarded_postgres(sql, max_rows, max_bytes):
+    """Run checked SQL on Postgres, behind the plan check and a read-only transaction."""
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute("SET LOCAL statement_timeout = %s", (STATEMENT_TIMEOUT_MS,))
+            try:
+                cursor.execute(f"EXPLAIN (FORMAT JSON, VERBOSE) {sql}")
+            except Exception as e:
+                raise QueryRejected(f"The query is invalid: {str(e).strip()}") from e
+            cost = check_plan(cursor.fetchone()[0])
+
+        try:
+            with connection.cursor(name=f"guarded_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = FETCH_SIZE
+                cursor.execute(sql)
+                rows = _collect_rows(cursor.fetchmany, max_rows, max_bytes)
+                columns = [column.name for column in cursor.description]
+        except Exception as e:
+            if "statement timeout" in str(e):
+                raise QueryRejected(f"The query took longer than {STATEMENT_TIMEOUT_MS} ms.") from e
+            raise
+        finally:
+            connection.rollback()
+
+    logger.info(f"Guarded query returned {len(rows)} rows (estimated cost {cost:,.0f}).")
+    return {"columns": columns, "rows": rows}
+
+
+async def _execute_guarded_postgres_async(sql, max_rows, max_bytes):
+    """Async counterpart of `_execute_guarded_postgres`, running on the asyncpg pool."""
+    import asyncpg
+    from src.backend.database import async_db
+
+    db_pool = await async_db.init_pool()
+
+    async with db_pool.acquire(timeout=async_db.POOL_TIMEOUT) as connection:
+        async with connection.transaction(readonly=True):
+            await connection.execute(f"SET LOCAL statement_timeout = {int(STATEMENT_TIMEOUT_MS)}")
+            try:
+                plan = await connection.fetchval(f"EXPLAIN (FORMAT JSON, VERBOSE) {sql}")
+            except asyncpg.PostgresError as e:
+                raise QueryRejected(f"The query is invalid: {str(e).strip()}") from e
+            cost = check_plan(plan)
+
+            rows, size = [], 0
+            try:
+                statement = await connection.prepare(sql)
+                columns = [attribute.name for attribute in statement.get_attributes()]
+                async for record in statement.cursor(prefetch=FETCH_SIZE):
+                    row = tuple(record)
+                    size += _row_size(row)
+                    if size > max_bytes:
+                        logger.warning(f"Result truncated at {len(rows)} rows ({max_bytes} bytes).")
+                        break
+                    rows.append(row)
+                    if len(rows) >= max_rows:
+                        break
+            except asyncpg.QueryCanceledError as e:
+                raise QueryRejected(f"The query took longer than {STATEMENT_TIMEOUT_MS} ms.") from e
+
+    logger.info(f"Guarded query returned {len(rows)} rows (estimated cost {cost:,.0f}).")
+    return {"columns": columns, "rows": rows}
+
+
+def execute_guarded_query(query, max_rows=MAX_ROWS, max_bytes=MAX_RESULT_BYTES):
+    """
+    Run LLM-generated SQL behind the guardrails.
+
+    The statement is checked by `check_query`, planned with `EXPLAIN` and checked
+    by `check_plan`, then executed in a read-only transaction with a
+    `statement_timeout`. Rows are streamed through a named server-side cursor
+    and collection stops at `max_rows` rows or `max_bytes` of JSON, so large
+    results never reach client memory or the model prompt. With
+    `QUERY_BACKEND=duckdb` the query runs on the embedded engine instead.
+
+    :return: Dict with the result's column names and its list of row tuples.
+    :raises QueryRejected: If the query fails a check or times out.
+    """
+    sql = check_query(query, max_rows)
+    with span("sql", source="llm", backend=QUERY_BACKEND) as fields:
+        started = time.perf_counter()
+        run = _execute_guarded_duckdb if QUERY_BACKEND == "duckdb" else _execute_guarded_postgres
+        result = None
+        try:
+            result = run(sql, max_rows, max_bytes)
+            fields["rows"] = len(result["rows"])
+        finally:
+            # Also when rejected, so queries cut off by statement_timeout reach the slow-query log
+            rows = len(result["rows"]) if result else None
+            profile_query(sql, None, time.perf_counter() - started, rows, source="llm")
+    return result
+
+
+async def execute_guarded_query_async(query, max_rows=MAX_ROWS, max_bytes=MAX_RESULT_BYTES):
+    """Async counterpart of `execute_guarded_query`, running on the asyncpg pool."""
+    if QUERY_BACKEND == "duckdb":
+        # DuckDB releases the GIL while it runs, so a worker thread does not block the loop
+        return await asyncio.to_thread(execute_guarded_query, query, max_rows, max_bytes)
+
+    sql = check_query(query, max_rows)
+    with span("sql", source="llm", backend=QUERY_BACKEND) as fields:
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await _execute_guarded_postgres_async(sql, max_rows, max_bytes)
+            fields["rows"] = len(result["rows"])
+        finally:
+            rows = len(result["rows"]) if result else None
+            profile_query(sql, None, time.perf_counter() - started, rows, source="llm")
+    return result
@@ -0,0 +1,316 @@
+import os
+import time
+import argparse
+from src.data.dataset import DATASET_PATH, iter_dataset
+from src.data.embeddings import update_embeddings
+from src.backend.database.db import (
+    TABLE,
+    execute_query,
+    LOAD_METHODS,
+    get_connection,
+    upsert_dataframe,
+)
+from src.backend.database.schema import migrate
+from src.backend.database.summaries import refresh_summaries
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+PROGRESS_TABLE = "ingestion_progress"
+WATERMARK_TABLE = "ingestion_watermark"
+
+
+def ensure_progress_table():
+    """Create the table that records the last committed chunk per load."""
+    execute_query(
+        f"""
+        CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+            table_name TEXT NOT NULL,
+            source TEXT NOT NULL,
+            last_chunk INTEGER NOT NULL,
+            rows_loaded BIGINT NOT NULL,
+            chunksize INTEGER,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (table_name, source)
+        );
+        ALTER TABLE {PROGRESS_TABLE} ADD COLUMN IF NOT EXISTS chunksize INTEGER;
+        """,
+        fetch=None,
+    )
+
+
+def get_last_chunk(table_name: str, source: str, chunksize: int = None) -> int:
+    """
+    Return the index of the last committed chunk, or -1 if nothing was loaded yet.
+
+    Chunk indexes only line up between runs that read the same number of rows
+    per chunk, so resuming with a different `chunksize` than the recorded one
+    would skip or repeat rows.
+
+    :raises ValueError: If `chunksize` differs from the one the progress was recorded with.
+    """
+    result = execute_query(
+        f"SELECT last_chunk, chunksize FROM {PROGRESS_TABLE} WHERE table_name = %s AND source = %s",
+        (table_name, source),
+        fetch="one",
+    )
+    if not result:
+        return -1
+    last_chunk, recorded = result
+    if chunksize is not None and recorded is not None and recorded != chunksize:
+        raise ValueError(
+            f"'{table_name}' was loaded from '{source}' in chunks of {recorded} rows up to chunk {last_chunk}; "
+            f"resuming with chunks of {chunksize} rows would skip or repeat rows. "
+            f"Use the same chunk size, or start over without resuming."
+        )
+    return last_chunk
+
+
+def reset_progress(table_name: str, source: str):
+    """Forget the recorded progress so the next load starts from the first chunk."""
+    execute_query(
+        f"DELETE FROM {PROGRESS_TABLE} WHERE table_name = %s AND source = %s",
+        (table_name, source),
+        fetch=None,
+    )
+
+
+def record_progress(cursor, table_name: str, source: str, chunk_index: int, rows: int, chunksize: int):
+    """Record a committed chunk and the chunk size it was read with, in the same transaction as its rows."""
+    cursor.execute(
+        f"""
+        INSERT INTO {PROGRESS_TABLE} (table_name, source, last_chunk, rows_loaded, chunksize)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (table_name, source) DO UPDATE
+        SET last_chunk = EXCLUDED.last_chunk,
+            rows_loaded = {PROGRESS_TABLE}.rows_loaded + EXCLUDED.rows_loaded,
+            chunksize = EXCLUDED.chunksize,
+            updated_at = now()
+        """,
+        (table_name, source, chunk_index, rows, chunksize),
+    )
+
+
+def embed_chunk(chunk):
+    """
+    Add the chunk's new videos to the embedding index.
+
+    The index is secondary to the table, so a failure is logged rather than
+    aborting the load; `python -m src.data.embeddings` catches up later.
+    """
+    try:
+        update_embeddings(chunk)
+    except Exception as e:
+        logger.error(f"Embedding update failed: {e}")
+
+
+def load_dataset(table_name: str = TABLE, chunksize: int = 100_000, method: str = "copy", resume: bool = True):
+    """
+    Stream the trending dataset into a table chunk by chunk.
+
+    Each chunk is written and its progress row updated in the same transaction,
+    so an interrupted load can be resumed from the last committed chunk without
+    duplicating or losing rows. New videos are embedded for semantic search as
+    their chunk commits, and the summary tables are rebuilt once the load finishes.
+
+    :param table_name: Target table, created or migrated to the latest schema first.
+    :param chunksize: Number of raw CSV rows per chunk.
+    :param method: "copy" (default) for `COPY FROM STDIN`, upserting chunks that
+        repeat a key, "batch" for `execute_batch` inserts or "upsert" to merge on
+        (video_id, trending_date).
+    :param resume: Skip chunks already committed by a previous run, which must
+        have used the same `chunksize`.
+    :return: Dict with the rows and chunks loaded, elapsed seconds and rows per second.
+    :raises ValueError: If resuming a load that used a different `chunksize`.
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method: {method}")
+
+    write_chunk = LOAD_METHODS[method]
+    source = DATASET_PATH
+
+    migrate(table_name)
+    ensure_progress_table()
+    if not resume:
+        reset_progress(table_name, source)
+    last_chunk = get_last_chunk(table_name, source, chunksize)
+    if last_chunk >= 0:
+        logger.info(f"Resuming load of '{table_name}' after chunk {last_chunk}.")
+
+    rows_loaded = 0
+    chunks_loaded = 0
+    start = time.perf_counter()
+
+    for chunk_index, chunk in iter_dataset(chunksize):
+        if chunk_index <= last_chunk or chunk.empty:
+            continue
+
+        with get_connection() as connection, connection.cursor() as cursor:
+            write_chunk(cursor, chunk, table_name)
+            record_progress(cursor, table_name, source, chunk_index, len(chunk), chunksize)
+            connection.commit()
+
+        embed_chunk(chunk)
+        rows_loaded += len(chunk)
+        chunks_loaded += 1
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Chunk {chunk_index} committed: {rows_loaded} rows loaded "
+            f"({rows_loaded / elapsed:,.0f} rows/s)."
+        )
+
+    if chunks_loaded:
+        refresh_summaries(table_name)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "rows": rows_loaded,
+        "chunks": chunks_loaded,
+        "seconds": elapsed,
+        "rows_per_second": rows_loaded / elapsed if elapsed else 0.0,
+    }
+    logger.info(f"Finished loading '{table_name}': {stats}")
+    return stats
+
+
+def ensure_watermark_table():
+    """Create the table that records how far each table has been incrementally loaded."""
+    execute_query(
+        f"""
+        CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+            table_name TEXT NOT NULL,
+            source TEXT NOT NULL,
+            max_trending_date TEXT,
+            byte_offset BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (table_name, source)
+        );
+        """,
+        fetch=None,
+    )
+
+
+def get_watermark(table_name: str, source: str):
+    """Return `(max_trending_date, byte_offset)` of the last incremental load, or `(None, 0)`."""
+    result = execute_query(
+        f"SELECT max_trending_date, byte_offset FROM {WATERMARK_TABLE} WHERE table_name = %s AND source = %s",
+        (table_name, source),
+        fetch="one",
+    )
+    return (result[0], result[1]) if result else (None, 0)
+
+
+def load_incremental(table_name: str = TABLE, chunksize: int = 100_000):
+    """
+    Load only the trending snapshots added since the previous incremental load.
+
+    The watermark stores the newest `trending_date` loaded and the byte size of
+    the CSV at that point. The trending CSV is append-only, so the next run
+    seeks straight to that offset and parses only the new rows. If the file
+    shrank (it was replaced), the whole file is scanned instead and rows before
+    the watermark date are skipped; rows of the watermark day itself are kept,
+    since snapshots of that day may have arrived late. Rows are upserted on
+    (video_id, trending_date), so overlapping or repeated runs never duplicate data.
+    The summary tables are then refreshed for the new rows only.
+
+    :param table_name: Target table, created or migrated to the latest schema first.
+    :param chunksize: Number of raw CSV rows per chunk.
+    :return: Dict with the rows upserted, the new watermark date and elapsed seconds.
+    """
+    source = DATASET_PATH
+    migrate(table_name)
+    ensure_watermark_table()
+    max_date, offset = get_watermark(table_name, source)
+
+    source_size = os.path.getsize(source)
+    if offset > source_size:
+        logger.warning(f"'{source}' is smaller than at the last load; rescanning from {max_date}.")
+        offset = 0
+    elif offset == source_size:
+        logger.info(f"No new rows in '{source}' since {max_date}.")
+        return {"rows": 0, "max_trending_date": max_date, "seconds": 0.0}
+
+    rows_upserted = 0
+    new_max_date = max_date
+    new_min_date = None
+    start = time.perf_counter()
+
+    for chunk_index, chunk in iter_dataset(chunksize, start_offset=offset):
+        if max_date is not None:
+            chunk = chunk[chunk["trending_date"].astype(str) >= max_date]
+        if chunk.empty:
+            continue
+
+        with get_connection() as connection, connection.cursor() as cursor:
+            rows_upserted += upsert_dataframe(cursor, chunk, table_name)
+            connection.commit()
+        embed_chunk(chunk)
+
+        chunk_max = str(chunk["trending_date"].max())
+        if new_max_date is None or chunk_max > new_max_date:
+            new_max_date = chunk_max
+        chunk_min = str(chunk["trending_date"].min())
+        if new_min_date is None or chunk_min < new_min_date:
+            new_min_date = chunk_min
+        logger.info(f"Chunk {chunk_index} upserted: {rows_upserted} rows so far.")
+
+    # Advance the watermark only once every chunk is committed
+    execute_query(
+        f"""
+        INSERT INTO {WATERMARK_TABLE} (table_name, source, max_trending_date, byte_offset)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (table_name, source) DO UPDATE
+        SET max_trending_date = EXCLUDED.max_trending_date,
+            byte_offset = EXCLUDED.byte_offset,
+            updated_at = now()
+        """,
+        (table_name, source, new_max_date, source_size),
+        fetch=None,
+    )
+    if new_min_date is not None:
+        refresh_summaries(table_name, since=new_min_date)
+
+    stats = {"rows": rows_upserted, "max_trending_date": new_max_date, "seconds": time.perf_counter() - start}
+    logger.info(f"Incremental load of '{table_name}' finished: {stats}")
+    return stats
+
+
+def get_data_version():
+    """
+    Return a token that changes whenever any load commits new data.
+
+    Used to key caches of query results and answers, so an ingestion run
+    invalidates them without an explicit flush. Runs on the chat path, so it
+    only reads: before the first load, when the tables don't exist yet, it
+    returns "initial".
+    """
+    existing = execute_query(
+        "SELECT to_regclass(%s) IS NOT NULL, to_regclass(%s) IS NOT NULL",
+        (PROGRESS_TABLE, WATERMARK_TABLE),
+        fetch="one",
+    )
+    if not existing:
+        return "initial"
+    parts = [
+        f"(SELECT max(updated_at) FROM {name})"
+        for name, exists in zip((PROGRESS_TABLE, WATERMARK_TABLE), existing) if exists
+    ]
+    if not parts:
+        return "initial"
+    result = execute_query(f"SELECT greatest({', '.join(parts)})", fetch="one")
+    return str(result[0]) if result and result[0] else "initial"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the trending dataset into Postgres.")
+    parser.add_argument("--table", default=TABLE)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--method", choices=list(LOAD_METHODS), default="copy")
+    parser.add_argument("--no-resume", action="store_true", help="Start from the first chunk.")
+    parser.add_argument("--incremental", action="store_true", help="Upsert only rows newer than the watermark.")
+    args = parser.parse_args()
+
+    if args.incremental:
+        load_incremental(args.table, chunksize=args.chunksize)
+    else:
+        load_dataset(args.table, chunksize=args.chunksize, method=args.method, resume=not args.no_resume)
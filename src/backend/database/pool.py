@@ -0,0 +1,169 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of psycopg2 connections.
+
+    `min_size` connections are opened up front and more are opened lazily up
+    to `max_size`. Every checkout verifies the connection is still
+    usable, and every check-in leaves it outside of any open transaction so
+    the next caller never inherits a failed or half-finished one.
+
+    :param min_size: Number of connections opened when the pool is created.
+    :param max_size: Upper bound on connections opened at the same time.
+    :param timeout: Seconds to wait for a free connection before giving up.
+    :param health_check_interval: Idle seconds after which a connection is
+        pinged with `SELECT 1` on checkout.
+    :param connect_kwargs: Keyword arguments passed to `psycopg2.connect`.
+    """
+
+    def __init__(self, min_size=1, max_size=10, timeout=30.0, health_check_interval=60.0, **connect_kwargs):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect_kwargs = connect_kwargs
+
+        self._idle = deque()  # (connection, returned_at)
+        self._opened = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._opened += 1
+
+    def _open(self):
+        return psycopg2.connect(**self._connect_kwargs)
+
+    def _release_slot(self, connection=None):
+        """Give back a connection slot, closing the connection if given."""
+        with self._cond:
+            self._opened -= 1
+            self._cond.notify()
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, connection, idle_for):
+        if connection.closed:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy database connection: {e}")
+            return False
+
+    def getconn(self):
+        """Check out a connection, opening a new one if the pool has room."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection = None
+            with self._cond:
+                while not self._idle and self._opened >= self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(f"No database connection available after {self.timeout}s.")
+                    self._cond.wait(remaining)
+
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed.")
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                else:
+                    self._opened += 1
+
+            # Network round trips happen outside the lock
+            if connection is None:
+                try:
+                    return self._open()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            if self._is_healthy(connection, time.monotonic() - returned_at):
+                return connection
+            self._release_slot(connection)
+
+    def putconn(self, connection, discard=False):
+        """Return a connection to the pool, rolling back any open transaction."""
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception as e:
+                logger.warning(f"Rollback on check-in failed, discarding connection: {e}")
+                discard = True
+
+        with self._cond:
+            if not (discard or connection.closed or self._closed):
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+                return
+        self._release_slot(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager yielding a pooled connection.
+
+        On error the transaction is rolled back; connections that are broken
+        (closed or failing at the protocol level) are dropped and replaced by
+        a fresh connection on a later checkout.
+        """
+        connection = self.getconn()
+        discard = False
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.putconn(connection, discard=discard)
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {"opened": self._opened, "idle": len(self._idle), "max_size": self.max_size}
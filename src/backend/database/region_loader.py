@@ -0,0 +1,271 @@
+import os
+import time
+import argparse
+import functools
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from src.data.dataset import DATA_DIR, DEFAULT_MEMORY_MB, discover_regions, iter_dataset, plan_chunks
+from src.backend.database.db import LOAD_METHODS, execute_query, get_connection
+from src.backend.database.schema import (
+    REGION_TABLE,
+    REGION_KEY_COLUMNS,
+    ensure_region_table,
+    region_partition,
+)
+from src.backend.database.loader import (
+    PROGRESS_TABLE,
+    ensure_progress_table,
+    get_last_chunk,
+    record_progress,
+    reset_progress,
+)
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+# One worker per core by default; each one parses and loads a whole region
+DEFAULT_WORKERS = int(os.getenv("INGEST_WORKERS", "0")) or os.cpu_count() or 1
+# Attempts per region, and the delay before the first retry (doubled after each failure)
+MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+RETRY_DELAY = float(os.getenv("INGEST_RETRY_DELAY", "5"))
+
+
+def load_region(region: str, dataset_path: str, category_path: str, max_memory_mb: int = DEFAULT_MEMORY_MB,
+                method: str = "copy", resume: bool = True):
+    """
+    Parse, clean and load one region's dataset into its partition. Runs in a worker process.
+
+    Chunks are sized from `max_memory_mb` with `plan_chunks`, so every worker
+    stays within its own memory budget whatever the size of its file. Each chunk
+    is written straight into the region's partition and its progress row updated
+    in the same transaction, so a failed attempt resumes after the last
+    committed chunk. `max_memory_mb` sets the chunk boundaries, so resuming
+    with a different budget is refused.
+
+    :param region: Region code, e.g. "IN".
+    :param dataset_path: The region's trending CSV.
+    :param category_path: The region's category JSON.
+    :param max_memory_mb: Working-memory budget of this worker.
+    :param method: "copy", "batch" or "upsert", as for `load_dataset`.
+    :param resume: Skip chunks already committed by a previous run.
+    :return: Dict with the region, rows and chunks loaded, elapsed seconds and rows per second.
+    """
+    partition = region_partition(region)
+    if method == "batch":
+        write_chunk = LOAD_METHODS[method]
+    else:
+        write_chunk = functools.partial(LOAD_METHODS[method], key_columns=REGION_KEY_COLUMNS)
+
+    if not resume:
+        reset_progress(partition, dataset_path)
+    chunksize, dedupe_window = plan_chunks(max_memory_mb, dataset_path=dataset_path)
+    last_chunk = get_last_chunk(partition, dataset_path, chunksize)
+    if last_chunk >= 0:
+        logger.info(f"[{region}] Resuming after chunk {last_chunk}.")
+
+    rows_loaded = 0
+    chunks_loaded = 0
+    start = time.perf_counter()
+
+    chunks = iter_dataset(
+        chunksize, dedupe_window=dedupe_window, dataset_path=dataset_path, category_path=category_path
+    )
+    for chunk_index, chunk in chunks:
+        if chunk_index <= last_chunk or chunk.empty:
+            continue
+        chunk.insert(0, "region", region)
+
+        with get_connection() as connection, connection.cursor() as cursor:
+            write_chunk(cursor, chunk, partition)
+            record_progress(cursor, partition, dataset_path, chunk_index, len(chunk), chunksize)
+            connection.commit()
+
+        rows_loaded += len(chunk)
+        chunks_loaded += 1
+        logger.info(f"[{region}] Chunk {chunk_index} committed: {rows_loaded} rows loaded.")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "region": region,
+        "rows": rows_loaded,
+        "chunks": chunks_loaded,
+        "seconds": elapsed,
+        "rows_per_second": rows_loaded / elapsed if elapsed else 0.0,
+    }
+
+
+def load_regions(regions=None, data_dir: str = DATA_DIR, workers: int = DEFAULT_WORKERS,
+                 max_memory_mb: int = DEFAULT_MEMORY_MB, method: str = "copy", resume: bool = True,
+                 max_attempts: int = MAX_ATTEMPTS):
+    """
+    Load every regional trending dataset in `data_dir` in parallel, one region per worker process.
+
+    The partitioned table, one partition per region, the progress table and the
+    combined `REGIONS_VIEW` are created up front; the workers then only write
+    rows. Regions are independent, so throughput grows with the number of
+    workers until the disk or the database saturates. A region that fails is
+    retried up to `max_attempts` times, resuming from its last committed chunk;
+    a crashed worker (e.g. killed for running out of memory) only costs the
+    regions it was running, and the pool is restarted for the rest.
+
+    :param regions: Region codes to load; defaults to every pair found in `data_dir`.
+    :param data_dir: Directory holding the `<REGION>_youtube_trending_data.csv`
+        and `<REGION>_category_id.json` files.
+    :param workers: Number of worker processes, capped at the number of regions.
+    :param max_memory_mb: Working-memory budget of each worker.
+    :param method: "copy" (default), "batch" or "upsert", as for `load_dataset`.
+    :param resume: Skip chunks already committed by a previous run.
+    :param max_attempts: Attempts per region before giving up on it.
+    :return: Dict with per-region results (`regions`), the regions that failed
+        (`failed`, region to error) and the total rows, seconds and rows per second.
+    """
+    if method not in LOAD_METHODS:
+        raise ValueError(f"Unknown load method: {method}")
+
+    found = discover_regions(data_dir)
+    if regions:
+        missing = sorted(set(regions) - set(found))
+        if missing:
+            raise FileNotFoundError(f"No dataset for region(s) {', '.join(missing)} in {data_dir}")
+        found = {region: found[region] for region in regions}
+    if not found:
+        logger.warning(f"No regional datasets found in '{data_dir}'.")
+        return {"regions": {}, "failed": {}, "rows": 0, "seconds": 0.0, "rows_per_second": 0.0}
+
+    ensure_region_table(found)
+    ensure_progress_table()
+
+    workers = max(1, min(workers, len(found)))
+    logger.info(f"Loading {len(found)} region(s) with {workers} worker(s): {', '.join(found)}.")
+
+    results = {}
+    failed = {}
+    attempts = dict.fromkeys(found, 0)
+    # (ready_at, region) of the regions waiting to start. Retries wait out their
+    # backoff here, in the parent, rather than holding a worker while they sleep.
+    queued = [(0.0, region) for region in found]
+    start = time.perf_counter()
+
+    def submit(executor, region):
+        dataset_path, category_path = found[region]
+        # Retries always resume, so chunks committed before the failure are kept
+        future = executor.submit(
+            load_region, region, dataset_path, category_path, max_memory_mb, method, resume or attempts[region] > 0
+        )
+        attempts[region] += 1
+        return future
+
+    def retry(region, error):
+        if attempts[region] >= max_attempts:
+            logger.error(f"[{region}] Giving up after {attempts[region]} attempts: {error}")
+            failed[region] = str(error) or type(error).__name__
+            return
+        delay = RETRY_DELAY * 2 ** (attempts[region] - 1)
+        logger.warning(f"[{region}] Attempt {attempts[region]} failed, retrying in {delay:g}s: {error}")
+        queued.append((time.monotonic() + delay, region))
+
+    context = multiprocessing.get_context("spawn")
+    while queued:
+        broken = False
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            running = {}
+            while running or (queued and not broken):
+                now = time.monotonic()
+                for item in sorted(queued):
+                    if broken or item[0] > now:
+                        break
+                    try:
+                        running[submit(executor, item[1])] = item[1]
+                    except BrokenProcessPool:
+                        broken = True
+                        break
+                    queued.remove(item)
+
+                timeout = None if broken or not queued else max(0.0, min(queued)[0] - now)
+                if not running:
+                    time.sleep(timeout or 0.0)
+                    continue
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    region = running.pop(future)
+                    try:
+                        results[region] = future.result()
+                    except BrokenProcessPool as e:
+                        # Every running region fails with the pool; they are retried in a new one
+                        broken = True
+                        retry(region, e)
+                        continue
+                    except Exception as e:
+                        retry(region, e)
+                        continue
+                    logger.info(
+                        f"[{region}] Loaded {results[region]['rows']} rows in {results[region]['seconds']:.1f}s "
+                        f"({len(results) + len(failed)}/{len(found)} regions done)."
+                    )
+        if queued:
+            logger.warning(f"Worker pool crashed; restarting it for {', '.join(region for _, region in queued)}.")
+
+    if any(result["chunks"] for result in results.values()):
+        execute_query(f"ANALYZE {REGION_TABLE};", fetch=None)
+
+    elapsed = time.perf_counter() - start
+    rows = sum(result["rows"] for result in results.values())
+    stats = {
+        "regions": results,
+        "failed": failed,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0.0,
+    }
+    logger.info(
+        f"Finished loading {len(results)}/{len(found)} region(s): {rows} rows in {elapsed:.1f}s "
+        f"({stats['rows_per_second']:,.0f} rows/s)."
+    )
+    return stats
+
+
+def region_progress(data_dir: str = DATA_DIR):
+    """
+    Report the committed progress of each region found in `data_dir`.
+
+    :return: Dict mapping each region to its last committed chunk, rows loaded
+        and last update time (None for regions not loaded yet).
+    """
+    ensure_progress_table()
+    progress = {}
+    for region, (dataset_path, _) in discover_regions(data_dir).items():
+        row = execute_query(
+            f"SELECT last_chunk, rows_loaded, updated_at FROM {PROGRESS_TABLE} WHERE table_name = %s AND source = %s",
+            (region_partition(region), dataset_path),
+            fetch="one",
+        )
+        progress[region] = (
+            {"last_chunk": row[0], "rows_loaded": row[1], "updated_at": str(row[2])} if row else None
+        )
+    return progress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the regional trending datasets into Postgres in parallel.")
+    parser.add_argument("--regions", nargs="+", help="Region codes to load (default: every dataset found).")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB, help="Memory budget per worker.")
+    parser.add_argument("--method", choices=list(LOAD_METHODS), default="copy")
+    parser.add_argument("--no-resume", action="store_true", help="Start every region from the first chunk.")
+    parser.add_argument("--status", action="store_true", help="Print the progress of each region and exit.")
+    args = parser.parse_args()
+
+    if args.status:
+        for region, progress in region_progress(args.data_dir).items():
+            print(f"{region}: {progress or 'not loaded'}")
+    else:
+        load_regions(
+            [region.upper() for region in args.regions] if args.regions else None,
+            data_dir=args.data_dir,
+            workers=args.workers,
+            max_memory_mb=args.memory_mb,
+            method=args.method,
+            resume=not args.no_resume,
+        )
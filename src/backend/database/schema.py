@@ -0,0 +1,251 @@
+import re
+import argparse
+from src.backend.database.db import TABLE, KEY_COLUMNS, get_connection
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# Explicit column types for the trending table. Timestamps are parsed from the
+# ISO strings in the CSV, and categoryId is a small integer code next to the
+# low-cardinality category_name label.
+COLUMNS = {
+    "video_id": "TEXT NOT NULL",
+    "title": "TEXT",
+    "publishedAt": "TIMESTAMPTZ",
+    "channelId": "TEXT",
+    "channelTitle": "TEXT",
+    "categoryId": "SMALLINT",
+    "trending_date": "TIMESTAMPTZ NOT NULL",
+    "tags": "TEXT",
+    "view_count": "BIGINT",
+    "likes": "BIGINT",
+    "dislikes": "BIGINT",
+    "comment_count": "BIGINT",
+    "thumbnail_link": "TEXT",
+    "comments_disabled": "BOOLEAN",
+    "ratings_disabled": "BOOLEAN",
+    "description": "TEXT",
+    "category_name": "TEXT",
+}
+
+
+def _column_types(cursor, table_name):
+    cursor.execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s",
+        (table_name.lower(),),
+    )
+    return dict(cursor.fetchall())
+
+
+def _has_primary_key(cursor, table_name):
+    cursor.execute(
+        """
+        SELECT EXISTS (
+            SELECT FROM information_schema.table_constraints
+            WHERE table_name = %s AND constraint_type = 'PRIMARY KEY'
+        )
+        """,
+        (table_name.lower(),),
+    )
+    return cursor.fetchone()[0]
+
+
+def _typed_columns(cursor, table_name):
+    """Create the table with explicit types, or convert the TEXT columns of an existing one."""
+    existing = _column_types(cursor, table_name)
+    if not existing:
+        columns = ', '.join(f"{name} {pg_type}" for name, pg_type in COLUMNS.items())
+        cursor.execute(
+            f"CREATE TABLE {table_name} ({columns}, PRIMARY KEY ({', '.join(KEY_COLUMNS)}));"
+        )
+        return
+
+    conversions = {
+        "publishedat": ("timestamp with time zone", "TIMESTAMPTZ USING publishedAt::timestamptz"),
+        "trending_date": ("timestamp with time zone", "TIMESTAMPTZ USING trending_date::timestamptz"),
+        "categoryid": ("smallint", "SMALLINT USING categoryId::smallint"),
+    }
+    alterations = [
+        f"ALTER COLUMN {column} TYPE {target}"
+        for column, (data_type, target) in conversions.items()
+        if column in existing and existing[column] != data_type
+    ]
+    if alterations:
+        cursor.execute(f"ALTER TABLE {table_name} {', '.join(alterations)};")
+
+
+def _query_indexes(cursor, table_name):
+    """Add the primary key and the indexes behind the chatbot's sort and filter patterns."""
+    keys = ', '.join(KEY_COLUMNS)
+    if not _has_primary_key(cursor, table_name):
+        # Older append-only loads may hold repeated snapshots; keep one of each
+        cursor.execute(
+            f"""
+            DELETE FROM {table_name} a USING {table_name} b
+            WHERE a.ctid < b.ctid AND a.video_id = b.video_id AND a.trending_date = b.trending_date;
+            """
+        )
+        cursor.execute(f"ALTER TABLE {table_name} ADD PRIMARY KEY ({keys});")
+    # Superseded by the primary key
+    cursor.execute(f"DROP INDEX IF EXISTS {table_name}_{'_'.join(KEY_COLUMNS)}_key;")
+
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for statement in (
+        f"CREATE INDEX IF NOT EXISTS {table_name}_view_count_idx ON {table_name} (view_count DESC);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_likes_idx ON {table_name} (likes DESC);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_comment_count_idx ON {table_name} (comment_count DESC);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_category_trending_idx ON {table_name} (category_name, trending_date DESC);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_trending_date_idx ON {table_name} (trending_date DESC);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_title_trgm_idx ON {table_name} USING GIN (title gin_trgm_ops);",
+        f"CREATE INDEX IF NOT EXISTS {table_name}_tags_trgm_idx ON {table_name} USING GIN (tags gin_trgm_ops);",
+    ):
+        cursor.execute(statement)
+    cursor.execute(f"ANALYZE {table_name};")
+
+
+# Text search configuration. 'simple' only lowercases, which suits the mix of
+# English, Hindi and other languages in the IN dataset better than stemming.
+SEARCH_CONFIG = "simple"
+
+
+def _search_columns(cursor, table_name):
+    """Add generated tag array and weighted full-text columns, each with a GIN index."""
+    cursor.execute(
+        f"""
+        ALTER TABLE {table_name}
+        ADD COLUMN IF NOT EXISTS tag_list TEXT[] GENERATED ALWAYS AS (
+            CASE WHEN tags IS NULL OR tags = '[None]' THEN '{{}}'::text[]
+                 ELSE string_to_array(lower(tags), '|') END
+        ) STORED,
+        ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', replace(coalesce(nullif(tags, '[None]'), ''), '|', ' ')), 'B')
+            || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')
+        ) STORED;
+        """
+    )
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_search_idx ON {table_name} USING GIN (search_vector);")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_tag_list_idx ON {table_name} USING GIN (tag_list);")
+    cursor.execute(f"ANALYZE {table_name};")
+
+
+# Ordered (version, description, function) migrations. Each runs in its own
+# transaction together with the version bump.
+MIGRATIONS = [
+    (1, "typed columns", _typed_columns),
+    (2, "primary key and query indexes", _query_indexes),
+    (3, "full-text search and tag array", _search_columns),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(table_name: str = TABLE) -> int:
+    """Return the schema version applied to `table_name`, 0 if none."""
+    with get_connection() as connection, connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """
+        )
+        cursor.execute(f"SELECT version FROM {SCHEMA_VERSION_TABLE} WHERE table_name = %s", (table_name,))
+        result = cursor.fetchone()
+        connection.commit()
+    return result[0] if result else 0
+
+
+def migrate(table_name: str = TABLE, target: int = LATEST_VERSION) -> int:
+    """
+    Bring `table_name` up to the `target` schema version.
+
+    Works for a missing table (it is created with the explicit schema) as well
+    as for tables created by the old dtype-inferred loader, whose TEXT columns
+    are converted in place.
+
+    :return: The schema version after migrating.
+    """
+    version = get_version(table_name)
+    for migration_version, description, apply in MIGRATIONS:
+        if migration_version <= version or migration_version > target:
+            continue
+        logger.info(f"Migrating '{table_name}' to schema version {migration_version}: {description}.")
+        with get_connection() as connection, connection.cursor() as cursor:
+            apply(cursor, table_name)
+            cursor.execute(
+                f"""
+                INSERT INTO {SCHEMA_VERSION_TABLE} (table_name, version) VALUES (%s, %s)
+                ON CONFLICT (table_name) DO UPDATE SET version = EXCLUDED.version, applied_at = now()
+                """,
+                (table_name, migration_version),
+            )
+            connection.commit()
+        version = migration_version
+    return version
+
+
+# Trending snapshots of every region, list-partitioned by region code. Each
+# region is loaded into its own partition; the chatbot reads them all through
+# the REGIONS_VIEW view.
+REGION_TABLE = "youtube_trending_regions"
+REGIONS_VIEW = "trending_all_regions"
+REGION_KEY_COLUMNS = ("region", *KEY_COLUMNS)
+
+
+def region_partition(region: str) -> str:
+    """Return the partition of `REGION_TABLE` holding a region, e.g. youtube_trending_regions_in."""
+    if not re.fullmatch(r"[A-Za-z]{2}", region):
+        raise ValueError(f"Invalid region code: {region}")
+    return f"{REGION_TABLE}_{region.lower()}"
+
+
+def ensure_region_table(regions=()):
+    """
+    Create the region-partitioned table, a partition for each region and the combined view.
+
+    Indexes declared on the partitioned table are created on every partition,
+    including ones added later. Safe to call repeatedly.
+
+    :param regions: Region codes, e.g. ["IN", "US"].
+    """
+    columns = ', '.join(f"{name} {pg_type}" for name, pg_type in COLUMNS.items())
+    with get_connection() as connection, connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {REGION_TABLE} (
+                region TEXT NOT NULL, {columns}, PRIMARY KEY ({', '.join(REGION_KEY_COLUMNS)})
+            ) PARTITION BY LIST (region);
+            """
+        )
+        for statement in (
+            f"CREATE INDEX IF NOT EXISTS {REGION_TABLE}_view_count_idx ON {REGION_TABLE} (view_count DESC);",
+            f"CREATE INDEX IF NOT EXISTS {REGION_TABLE}_likes_idx ON {REGION_TABLE} (likes DESC);",
+            f"CREATE INDEX IF NOT EXISTS {REGION_TABLE}_comment_count_idx ON {REGION_TABLE} (comment_count DESC);",
+            f"CREATE INDEX IF NOT EXISTS {REGION_TABLE}_category_trending_idx ON {REGION_TABLE} (category_name, trending_date DESC);",
+        ):
+            cursor.execute(statement)
+        for region in regions:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {region_partition(region)} PARTITION OF {REGION_TABLE} FOR VALUES IN (%s);",
+                (region.upper(),),
+            )
+        cursor.execute(f"CREATE OR REPLACE VIEW {REGIONS_VIEW} AS SELECT region, {', '.join(COLUMNS)} FROM {REGION_TABLE};")
+        connection.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the trending table schema.")
+    parser.add_argument("command", choices=["migrate", "status"])
+    parser.add_argument("--table", default=TABLE)
+    parser.add_argument("--target", type=int, default=LATEST_VERSION)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        print(f"'{args.table}' is at schema version {migrate(args.table, args.target)}.")
+    else:
+        print(f"'{args.table}' is at schema version {get_version(args.table)} (latest {LATEST_VERSION}).")
@@ -0,0 +1,166 @@
+import re
+from src.backend.database.db import TABLE
+from src.backend.database.schema import SEARCH_CONFIG
+from src.backend.database.summaries import VIDEO_STATS_TABLE
+from src.backend.database.backends import QUERY_BACKEND, execute_query
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+MAX_RESULTS = 50
+RESULT_COLUMNS = ["video_id", "title", "thumbnail_link", "channelTitle", "category_name", "view_count", "rank"]
+
+# Per-field weights of the DuckDB fallback, matching the A/B/C weights of search_vector
+_FIELD_WEIGHTS = {"title": 1.0, "tags": 0.4, "description": 0.2}
+
+
+def _postgres_search(query, limit, category, tags):
+    filters, params = [], [query]
+    if category:
+        filters.append("AND lower(t.category_name) = lower(%s)")
+        params.append(category)
+    if tags:
+        filters.append("AND t.tag_list && %s::text[]")
+        params.append([tag.lower() for tag in tags])
+    params.append(limit)
+
+    # Matches come from the GIN index; each video is reported once, at its latest snapshot
+    return execute_query(
+        f"""
+        SELECT video_id, title, thumbnail_link, channelTitle, category_name, view_count, rank
+        FROM (
+            SELECT DISTINCT ON (t.video_id) t.video_id, t.title, t.thumbnail_link, t.channelTitle,
+                   t.category_name, t.view_count, ts_rank(t.search_vector, q.query) AS rank
+            FROM {TABLE} t, websearch_to_tsquery('{SEARCH_CONFIG}', %s) AS q(query)
+            WHERE t.search_vector @@ q.query {' '.join(filters)}
+            ORDER BY t.video_id, t.trending_date DESC
+        ) hits
+        ORDER BY rank DESC, view_count DESC
+        LIMIT %s
+        """,
+        tuple(params),
+        backend="postgres",
+    )
+
+
+def _duckdb_search(query, limit, category, tags):
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return []
+
+    scores, params = [], []
+    for term in terms:
+        scores.append(
+            f"{_FIELD_WEIGHTS['title']} * contains(lower(title), %s)::INT"
+            f" + {_FIELD_WEIGHTS['tags']} * list_contains(tag_list, %s)::INT"
+            f" + {_FIELD_WEIGHTS['description']} * contains(lower(description), %s)::INT"
+        )
+        params += [term, term, term]
+    filters = []
+    if category:
+        filters.append("AND lower(category_name) = lower(%s)")
+        params.append(category)
+    if tags:
+        filters.append("AND list_has_any(tag_list, %s)")
+        params.append([tag.lower() for tag in tags])
+    params.append(limit)
+
+    return execute_query(
+        f"""
+        SELECT video_id, title, thumbnail_link, channelTitle, category_name, view_count, rank
+        FROM (
+            SELECT DISTINCT ON (video_id) video_id, title, thumbnail_link, channelTitle, category_name,
+                   view_count, ({' + '.join(scores)})::DOUBLE / {len(terms)} AS rank
+            FROM {TABLE}
+            WHERE 1 = 1 {' '.join(filters)}
+            ORDER BY video_id, trending_date DESC
+        ) hits
+        WHERE rank > 0
+        ORDER BY rank DESC, view_count DESC
+        LIMIT %s
+        """,
+        tuple(params),
+        backend="duckdb",
+    )
+
+
+def search_videos(query, limit=10, category=None, tags=None):
+    """
+    Full-text search over video titles, tags and descriptions.
+
+    On Postgres, `query` is parsed with `websearch_to_tsquery` (quoted phrases,
+    `or`, `-word`) and matched against the weighted `search_vector` column
+    through its GIN index. Title hits rank above tag hits, which rank above
+    description hits. On the DuckDB backend the same weights are applied to
+    plain term matches.
+
+    :param query: Search words, e.g. "cricket highlights".
+    :param limit: Number of videos to return, at most `MAX_RESULTS`.
+    :param category: Only videos of this category_name.
+    :param tags: Only videos carrying at least one of these tags.
+    :return: List of result dicts, best match first, one per video.
+    """
+    limit = max(1, min(int(limit), MAX_RESULTS))
+    search = _duckdb_search if QUERY_BACKEND == "duckdb" else _postgres_search
+    rows = search(query, limit, category, tags)
+    if rows is None:
+        return {"error": "Search failed."}
+    logger.info(f"Search for '{query}' returned {len(rows)} videos.")
+    return [dict(zip(RESULT_COLUMNS, row)) for row in rows]
+
+
+def semantic_search(queries, limit=10, category=None):
+    """
+    Find videos whose title and description are closest in meaning to the queries.
+
+    For vague requests that keywords miss. All queries are embedded and looked
+    up in the local embedding index in one batch; a video matching several
+    queries keeps its best similarity. Details come from the video_stats
+    summary table, so each video is reported at its latest snapshot.
+
+    :param queries: One or more descriptions of the videos wanted, e.g.
+        ["feel-good family videos", "wholesome comedy"].
+    :param limit: Number of videos to return, at most `MAX_RESULTS`.
+    :param category: Only videos of this category_name.
+    :return: List of result dicts, most similar first, one per video.
+    """
+    if isinstance(queries, str):
+        queries = [queries]
+    # The index (numpy, pandas) is only imported by the first semantic search
+    from src.data import embeddings
+
+    limit = max(1, min(int(limit), MAX_RESULTS))
+    # Over-fetch when filtering, since the index does not know categories
+    try:
+        neighbours = embeddings.nearest(queries, k=limit * 4 if category else limit)
+    except FileNotFoundError as e:
+        logger.error(f"Semantic search unavailable: {e}")
+        return {"error": "Semantic search is not available: the embedding index has not been built."}
+
+    similarity = {}
+    for matches in neighbours:
+        for video_id, score in matches:
+            similarity[video_id] = max(score, similarity.get(video_id, 0.0))
+    if not similarity:
+        return []
+
+    params = list(similarity)
+    category_filter = ""
+    if category:
+        category_filter = "AND lower(category_name) = lower(%s)"
+        params.append(category)
+    rows = execute_query(
+        f"""
+        SELECT video_id, title, thumbnail_link, channel_title, category_name, latest_view_count
+        FROM {VIDEO_STATS_TABLE}
+        WHERE video_id IN ({', '.join(['%s'] * len(similarity))}) {category_filter}
+        """,
+        tuple(params),
+    )
+    if rows is None:
+        return {"error": "Semantic search failed."}
+
+    results = [dict(zip(RESULT_COLUMNS, (*row, round(similarity[row[0]], 4)))) for row in rows]
+    results.sort(key=lambda result: result["rank"], reverse=True)
+    logger.info(f"Semantic search for {queries} returned {len(results[:limit])} videos.")
+    return results[:limit]
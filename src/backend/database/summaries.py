@@ -0,0 +1,264 @@
+import time
+import argparse
+from src.backend.database.db import TABLE, get_connection
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+VIDEO_STATS_TABLE = "video_stats"
+CHANNEL_DAILY_TABLE = "channel_daily_stats"
+CATEGORY_DAILY_TABLE = "category_daily_stats"
+VIDEO_VELOCITY_TABLE = "video_velocity"
+
+# Summary tables precomputed from the trending table: description, columns and
+# the indexes behind the questions they answer. The descriptions and columns
+# are also what the chatbot's system prompt advertises.
+SUMMARY_TABLES = {
+    VIDEO_STATS_TABLE: {
+        "description": "one row per video: its latest and peak stats over all trending days",
+        "columns": {
+            "video_id": "TEXT PRIMARY KEY",
+            "title": "TEXT",
+            "channel_id": "TEXT",
+            "channel_title": "TEXT",
+            "category_name": "TEXT",
+            "thumbnail_link": "TEXT",
+            "first_trending_date": "TIMESTAMPTZ",
+            "last_trending_date": "TIMESTAMPTZ",
+            "days_trending": "INTEGER",
+            "latest_view_count": "BIGINT",
+            "latest_likes": "BIGINT",
+            "latest_comment_count": "BIGINT",
+            "peak_view_count": "BIGINT",
+            "peak_likes": "BIGINT",
+            "peak_comment_count": "BIGINT",
+        },
+        "indexes": [
+            "latest_view_count DESC",
+            "latest_likes DESC",
+            "latest_comment_count DESC",
+            "category_name, latest_view_count DESC",
+            "channel_id",
+            "last_trending_date DESC",
+        ],
+    },
+    CHANNEL_DAILY_TABLE: {
+        "description": "one row per channel per trending day (UTC)",
+        "columns": {
+            "channel_id": "TEXT NOT NULL",
+            "day": "DATE NOT NULL",
+            "channel_title": "TEXT",
+            "videos": "INTEGER",
+            "total_views": "BIGINT",
+            "total_likes": "BIGINT",
+            "total_comments": "BIGINT",
+        },
+        "primary_key": ("channel_id", "day"),
+        "indexes": ["day, total_views DESC"],
+    },
+    CATEGORY_DAILY_TABLE: {
+        "description": "one row per category per trending day (UTC)",
+        "columns": {
+            "category_name": "TEXT NOT NULL",
+            "day": "DATE NOT NULL",
+            "videos": "INTEGER",
+            "total_views": "BIGINT",
+            "total_likes": "BIGINT",
+            "total_comments": "BIGINT",
+        },
+        "primary_key": ("category_name", "day"),
+        "indexes": ["day"],
+    },
+    VIDEO_VELOCITY_TABLE: {
+        "description": "growth of a video since its previous trending snapshot; join video_stats for titles",
+        "columns": {
+            "video_id": "TEXT NOT NULL",
+            "trending_date": "TIMESTAMPTZ NOT NULL",
+            "view_count": "BIGINT",
+            "views_gained": "BIGINT",
+            "likes_gained": "BIGINT",
+            "comments_gained": "BIGINT",
+            "views_per_day": "DOUBLE PRECISION",
+        },
+        "primary_key": ("video_id", "trending_date"),
+        "indexes": ["trending_date DESC, views_per_day DESC", "views_per_day DESC"],
+    },
+}
+
+# Refreshes take the newest rows to fold in as `%(since)s`, or NULL to rebuild
+# from the whole table. Daily rollups are recomputed for whole days, so a
+# partially loaded day is never left half counted.
+_SINCE = "(%(since)s::timestamptz IS NULL OR t.trending_date >= %(since)s::timestamptz)"
+_SINCE_DAY = (
+    "(%(since)s::timestamptz IS NULL OR t.trending_date >= "
+    "date_trunc('day', %(since)s::timestamptz, 'UTC'))"
+)
+_DAY = "(t.trending_date AT TIME ZONE 'UTC')::date"
+
+
+def _upsert_clause(columns, keys):
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns if column not in keys)
+    return f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+
+
+def _refresh_statements(source):
+    """The statements that fold `source` rows newer than `%(since)s` into the summary tables."""
+    touched = f"SELECT DISTINCT t.video_id FROM {source} t WHERE {_SINCE}"
+    video_columns = list(SUMMARY_TABLES[VIDEO_STATS_TABLE]["columns"])
+    velocity_columns = list(SUMMARY_TABLES[VIDEO_VELOCITY_TABLE]["columns"])
+
+    return {
+        # Touched videos are recomputed over their whole history, through the primary key
+        VIDEO_STATS_TABLE: f"""
+            WITH touched AS ({touched}),
+            latest AS (
+                SELECT DISTINCT ON (t.video_id) t.video_id, t.title, t.channelId, t.channelTitle,
+                       t.category_name, t.thumbnail_link, t.view_count, t.likes, t.comment_count
+                FROM {source} t JOIN touched USING (video_id)
+                ORDER BY t.video_id, t.trending_date DESC
+            ),
+            totals AS (
+                SELECT t.video_id, min(t.trending_date) AS first_trending_date,
+                       max(t.trending_date) AS last_trending_date, count(*) AS days_trending,
+                       max(t.view_count) AS peak_view_count, max(t.likes) AS peak_likes,
+                       max(t.comment_count) AS peak_comment_count
+                FROM {source} t JOIN touched USING (video_id)
+                GROUP BY t.video_id
+            )
+            INSERT INTO {VIDEO_STATS_TABLE} ({', '.join(video_columns)})
+            SELECT l.video_id, l.title, l.channelId, l.channelTitle, l.category_name, l.thumbnail_link,
+                   s.first_trending_date, s.last_trending_date, s.days_trending,
+                   l.view_count, l.likes, l.comment_count,
+                   s.peak_view_count, s.peak_likes, s.peak_comment_count
+            FROM latest l JOIN totals s USING (video_id)
+            {_upsert_clause(video_columns, ("video_id",))}
+        """,
+        CHANNEL_DAILY_TABLE: f"""
+            INSERT INTO {CHANNEL_DAILY_TABLE}
+                (channel_id, day, channel_title, videos, total_views, total_likes, total_comments)
+            SELECT t.channelId, {_DAY}, max(t.channelTitle), count(DISTINCT t.video_id),
+                   sum(t.view_count), sum(t.likes), sum(t.comment_count)
+            FROM {source} t
+            WHERE t.channelId IS NOT NULL AND {_SINCE_DAY}
+            GROUP BY t.channelId, {_DAY}
+        """,
+        CATEGORY_DAILY_TABLE: f"""
+            INSERT INTO {CATEGORY_DAILY_TABLE}
+                (category_name, day, videos, total_views, total_likes, total_comments)
+            SELECT t.category_name, {_DAY}, count(DISTINCT t.video_id),
+                   sum(t.view_count), sum(t.likes), sum(t.comment_count)
+            FROM {source} t
+            WHERE t.category_name IS NOT NULL AND {_SINCE_DAY}
+            GROUP BY t.category_name, {_DAY}
+        """,
+        # The previous snapshot of a touched video may predate `since`, so the
+        # window runs over its whole history and only the new rows are kept
+        VIDEO_VELOCITY_TABLE: f"""
+            WITH touched AS ({touched}),
+            snapshots AS (
+                SELECT t.video_id, t.trending_date, t.view_count, t.likes, t.comment_count,
+                       lag(t.trending_date) OVER w AS previous_date,
+                       lag(t.view_count) OVER w AS previous_views,
+                       lag(t.likes) OVER w AS previous_likes,
+                       lag(t.comment_count) OVER w AS previous_comments
+                FROM {source} t JOIN touched USING (video_id)
+                WINDOW w AS (PARTITION BY t.video_id ORDER BY t.trending_date)
+            )
+            INSERT INTO {VIDEO_VELOCITY_TABLE} ({', '.join(velocity_columns)})
+            SELECT t.video_id, t.trending_date, t.view_count,
+                   t.view_count - t.previous_views,
+                   t.likes - t.previous_likes,
+                   t.comment_count - t.previous_comments,
+                   (t.view_count - t.previous_views)::double precision
+                       / greatest(extract(epoch FROM t.trending_date - t.previous_date) / 86400, 1)
+            FROM snapshots t
+            WHERE t.previous_date IS NOT NULL AND {_SINCE}
+            {_upsert_clause(velocity_columns, ("video_id", "trending_date"))}
+        """,
+    }
+
+
+def ensure_summary_tables(cursor):
+    """Create the summary tables and their indexes if they do not exist."""
+    for table_name, spec in SUMMARY_TABLES.items():
+        columns = [f"{name} {pg_type}" for name, pg_type in spec["columns"].items()]
+        if "primary_key" in spec:
+            columns.append(f"PRIMARY KEY ({', '.join(spec['primary_key'])})")
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns)});")
+        for position, index in enumerate(spec["indexes"]):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_{position}_idx ON {table_name} ({index});")
+
+
+def refresh_summaries(source: str = TABLE, since=None):
+    """
+    Fold newly loaded rows of the trending table into the summary tables.
+
+    With `since`, only videos with a snapshot at or after it are recomputed and
+    the daily rollups of the days from `since` on are rebuilt; earlier rows are
+    untouched, so the cost follows the size of the load, not of the table. With
+    `since=None` every summary is rebuilt from scratch. Everything runs in one
+    transaction, so readers see either the old or the new summaries.
+
+    :param source: The trending table to summarize.
+    :param since: Earliest `trending_date` of the rows loaded since the last refresh, or None.
+    :return: Dict of rows written per summary table, plus elapsed seconds.
+    """
+    start = time.perf_counter()
+    params = {"since": since}
+    stats = {}
+
+    with get_connection() as connection, connection.cursor() as cursor:
+        ensure_summary_tables(cursor)
+        if since is None:
+            for table_name in SUMMARY_TABLES:
+                cursor.execute(f"DELETE FROM {table_name};")
+        else:
+            # Daily rollups from the first affected day are recomputed in full
+            for table_name in (CHANNEL_DAILY_TABLE, CATEGORY_DAILY_TABLE):
+                cursor.execute(
+                    f"DELETE FROM {table_name} WHERE day >= (%(since)s::timestamptz AT TIME ZONE 'UTC')::date",
+                    params,
+                )
+
+        for table_name, statement in _refresh_statements(source).items():
+            cursor.execute(statement, params)
+            stats[table_name] = cursor.rowcount
+
+        for table_name in SUMMARY_TABLES:
+            cursor.execute(f"ANALYZE {table_name};")
+        connection.commit()
+
+    stats["seconds"] = time.perf_counter() - start
+    logger.info(f"Summary tables refreshed {'in full' if since is None else f'since {since}'}: {stats}")
+    return stats
+
+
+def describe_summaries() -> str:
+    """The summary table schemas, formatted for the chatbot's system prompt."""
+    lines = []
+    for table_name, spec in SUMMARY_TABLES.items():
+        lines.append(f"**Table: {table_name}** ({spec['description']})")
+        lines.extend(
+            f"- {name} ({pg_type.replace(' PRIMARY KEY', '').replace(' NOT NULL', '')})"
+            for name, pg_type in spec["columns"].items()
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the trend summary tables.")
+    parser.add_argument("--table", default=TABLE)
+    parser.add_argument("--since", help="Fold in rows trending at or after this timestamp only.")
+    parser.add_argument("--every", type=float, help="Keep refreshing every N seconds, from the newest summarized day.")
+    args = parser.parse_args()
+
+    since = args.since
+    while True:
+        refresh_summaries(args.table, since)
+        if not args.every:
+            break
+        time.sleep(args.every)
+        with get_connection() as connection, connection.cursor() as cursor:
+            cursor.execute(f"SELECT max(day) FROM {CATEGORY_DAILY_TABLE}")
+            since = cursor.fetchone()[0]
+            connection.rollback()
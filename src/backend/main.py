@@ -1,13 +1,118 @@
-from fastapi import FastAPI
-from utils import logger
-from schemas.api_response import APIResponse
+import json
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from src.backend.utils import logger
+from src.backend.utils.metrics import Counter, Histogram, register_collector, render
+from src.backend.schemas.api_response import APIResponse
+from src.backend.schemas.chat import ChatRequest, ChatResponse
+from src.backend.database import async_db
+from src.backend.models import llm_model
+from src.backend.models.llm_model import ERROR_ANSWER, arun_conversation, stream_conversation
+from src.backend.models.router import router_stats
+from src.backend.services import youtube_service
 
 logger = logger.get_logger()
 
-app = FastAPI(title="YouTube Trend Insights API", description="API for YouTube Trend Analysis", version="1.0")
+HTTP_REQUESTS = Counter("youtrend_http_requests_total", "HTTP requests by path and status.", ["path", "status"])
+HTTP_SECONDS = Histogram("youtrend_http_request_duration_seconds", "HTTP request latency by path.", ["path"])
+
+def collect_service_metrics():
+    """Response cache, intent router and YouTube quota counters, which their modules keep themselves."""
+    cache = llm_model.get_response_cache().stats()
+    router = router_stats()
+    quota = youtube_service.scheduler.stats()
+    return [
+        ("youtrend_response_cache_total", "counter", "Response cache lookups by result.",
+         [({"result": name}, value) for name, value in cache.items()]),
+        ("youtrend_router_total", "counter", "Questions answered by the intent router or passed to the LLM.",
+         [({"result": "hit"}, router["hits"]), ({"result": "miss"}, router["misses"])]),
+        ("youtrend_youtube_calls_total", "counter",
+         "YouTube Data API calls made, retried, refused for lack of quota, or saved by sharing an in-flight lookup.",
+         [({"result": name}, quota[name]) for name in ("calls", "retries", "rejected", "coalesced")]),
+        ("youtrend_youtube_throttled_seconds_total", "counter", "Seconds YouTube calls waited for the rate limit.",
+         [({}, quota["throttled_seconds"])]),
+        ("youtrend_youtube_quota_used", "gauge", "YouTube quota units spent today (Pacific Time).",
+         [({}, quota["quota_used"])]),
+        ("youtrend_youtube_quota_limit", "gauge", "YouTube quota units available per day.",
+         [({}, quota["daily_quota"])]),
+    ]
+
+register_collector(collect_service_metrics)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the LLM clients and open the async database pool on startup; close the pool on shutdown."""
+    await asyncio.to_thread(llm_model.init)
+    try:
+        await async_db.init_pool()
+    except Exception as e:
+        # Queries retry the pool lazily; the API can still serve non-SQL answers
+        logger.error(f"Failed to open the async database pool: {e}")
+    yield
+    await async_db.close_pool()
+
+app = FastAPI(title="YouTube Trend Insights API", description="API for YouTube Trend Analysis", version="1.0", lifespan=lifespan)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count and time every request, keyed by route template so IDs don't explode the label set."""
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    HTTP_REQUESTS.inc(path=path, status=response.status_code)
+    HTTP_SECONDS.observe(time.perf_counter() - started, path=path)
+    return response
 
 @app.get("/", response_model=APIResponse, status_code=200, tags=["Root"])
 async def root():
     """Root endpoint for API health check and welcome message."""
     logger.info("API root accessed")
-    return APIResponse(message="Welcome to YouTube Trend Insights API")
\ No newline at end of file
+    return APIResponse(message="Welcome to YouTube Trend Insights API")
+
+@app.post("/chat", response_model=ChatResponse, status_code=200, tags=["Chat"])
+async def chat(request: ChatRequest):
+    """Answer a question about YouTube trends."""
+    started = time.perf_counter()
+    message = await arun_conversation(request.prompt)
+    return ChatResponse(message=message, latency_ms=(time.perf_counter() - started) * 1000)
+
+@app.post("/chat/stream", tags=["Chat"])
+async def chat_stream(request: ChatRequest):
+    """
+    Answer a question about YouTube trends as Server-Sent Events.
+
+    Each `token` event carries a JSON-encoded text fragment as soon as the model
+    produces it; a final `done` event reports the time to first token, the total
+    latency and whether the answer ended in an error.
+    """
+    async def events():
+        started = time.perf_counter()
+        first_token_ms = None
+        error = False
+        async for token in stream_conversation(request.prompt):
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            error = error or token == ERROR_ANSWER
+            yield f"event: token\ndata: {json.dumps(token)}\n\n"
+        done = {
+            "time_to_first_token_ms": first_token_ms,
+            "latency_ms": (time.perf_counter() - started) * 1000,
+            "error": error,
+        }
+        yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/chat/router", tags=["Chat"])
+async def chat_router():
+    """Hit rate of the intent router and latency of routed versus LLM answers."""
+    return router_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request, stage, token and cache metrics in the Prometheus text format."""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
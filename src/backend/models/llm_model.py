@@ -1,23 +1,43 @@
 import os
 import json
-from groq import Groq
-from dotenv import load_dotenv
-from src.backend.database.db import execute_query
+import time
+import asyncio
+import threading
+from src.backend.database.guardrails import QueryRejected, execute_guarded_query, execute_guarded_query_async
+from src.backend.database.search import search_videos, semantic_search
+from src.backend.models import router
+from src.backend.models.prompt import (
+    answer_messages, build_messages, compact_result, log_request, log_stage, message_tokens, result_budget
+)
 from src.backend.utils import logger
+from src.backend.utils.env import load_env
+from src.backend.utils.tracing import annotate, record_span, trace
 
-load_dotenv()
+load_env()
 logger = logger.get_logger()
 
-client = Groq(api_key=os.getenv('groq_api_key'))
+# Optional override, e.g. to point at a local stub of the chat completions API
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL')
 
 MODEL = "llama-3.3-70b-versatile"
 
+# Answer given when the model can't be reached or fails mid-answer
+ERROR_ANSWER = "An error occurred while processing your request."
+
+# Created on first use (or in the API's lifespan hook), so importing this module
+# makes no connections and does not import the Groq SDK, numpy or pandas
+client = None
+async_client = None
+response_cache = None
+_tool_functions = None
+_init_lock = threading.Lock()
+
 tools = [
     {
         "type": "function",
         "function": {
             "name": "execute_query",
-            "description": "Executes SQL queries on the youtube_trending_data table based on user requirements.",
+            "description": "Executes SQL queries on youtube_trending_data and its summary tables based on user requirements.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -32,91 +52,471 @@ tools = [
     }
 ]
 
+_LIMIT = {"type": "integer", "description": "Number of results to return (default 10)."}
+_CATEGORY = {"type": "string", "description": "Only this category_name, e.g. 'Music'."}
+_METRIC = {"type": "string", "enum": ["view_count", "likes", "comment_count"], "description": "Metric to share out (default view_count)."}
+_FREQ = {"type": "string", "enum": ["D", "W", "M"], "description": "Period: day, week or month (default W)."}
+_PERIODS = {"type": "integer", "description": "Number of most recent periods (default 4)."}
+
+# Precomputed trend analytics over the full dataset, next to free-form SQL
+analytics_tools = {
+    "rising_videos": (
+        "Videos climbing fastest right now, scored on view velocity, relative growth and like rate.",
+        {"limit": _LIMIT, "category": _CATEGORY,
+         "window_days": {"type": "number", "description": "Only videos trending in the last N days (default 3)."}},
+    ),
+    "fastest_growing_videos": (
+        "Videos that gained the most views, likes or comments per day between trending snapshots.",
+        {"limit": _LIMIT, "category": _CATEGORY,
+         "metric": {"type": "string", "enum": ["views", "likes", "comments"], "description": "Default views."},
+         "days": {"type": "number", "description": "Only snapshots from the last N days (default 7)."}},
+    ),
+    "top_engagement_videos": (
+        "Videos with the highest likes per view at their latest snapshot.",
+        {"limit": _LIMIT, "category": _CATEGORY,
+         "min_views": {"type": "integer", "description": "Minimum views to qualify (default 10000)."}},
+    ),
+    "longest_trending_videos": (
+        "Videos that stayed on the trending list for the most days.",
+        {"limit": _LIMIT, "category": _CATEGORY},
+    ),
+    "category_share_over_time": (
+        "Each category's share of views, likes or comments per day, week or month.",
+        {"metric": _METRIC, "freq": _FREQ, "periods": _PERIODS},
+    ),
+    "channel_share_over_time": (
+        "The top channels' share of views, likes or comments per day, week or month.",
+        {"metric": _METRIC, "freq": _FREQ, "periods": _PERIODS,
+         "top": {"type": "integer", "description": "Channels per period (default 10)."}},
+    ),
+}
+tools.append(
+    {
+        "type": "function",
+        "function": {
+            "name": "search_videos",
+            "description": "Keyword search over video titles, tags and descriptions, best match first. "
+                           "Supports quoted phrases, 'or' and '-word'.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Search words, e.g. 'cricket highlights'."},
+                    "limit": _LIMIT,
+                    "category": _CATEGORY,
+                    "tags": {"type": "array", "items": {"type": "string"}, "description": "Only videos with any of these tags."},
+                },
+                "required": ["query"]
+            }
+        }
+    }
+)
+tools.append(
+    {
+        "type": "function",
+        "function": {
+            "name": "semantic_search",
+            "description": "Finds videos by meaning rather than exact words, for vague or descriptive requests "
+                           "such as 'feel-good family videos'. Several phrasings are searched in one batch.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "queries": {"type": "array", "items": {"type": "string"},
+                                "description": "One or more descriptions of the videos wanted."},
+                    "limit": _LIMIT,
+                    "category": _CATEGORY,
+                },
+                "required": ["queries"]
+            }
+        }
+    }
+)
+tools += [
+    {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties, "required": []},
+        },
+    }
+    for name, (description, properties) in analytics_tools.items()
+]
+
+def get_client():
+    """The Groq client, created on first use."""
+    global client
+    with _init_lock:
+        if client is None:
+            from groq import Groq
+
+            client = Groq(api_key=os.getenv('groq_api_key'), base_url=GROQ_BASE_URL)
+        return client
+
+def get_async_client():
+    """The async Groq client, created on first use."""
+    global async_client
+    with _init_lock:
+        if async_client is None:
+            from groq import AsyncGroq
+
+            async_client = AsyncGroq(api_key=os.getenv('groq_api_key'), base_url=GROQ_BASE_URL)
+        return async_client
+
+def get_response_cache():
+    """The process-wide response cache, created on first use."""
+    global response_cache
+    with _init_lock:
+        if response_cache is None:
+            from src.backend.services.response_cache import create_response_cache
+
+            response_cache = create_response_cache()
+        return response_cache
+
+def get_tool_functions():
+    """Tools other than execute_query, by name; the analytics module (pandas) is imported on first use."""
+    global _tool_functions
+    with _init_lock:
+        if _tool_functions is None:
+            from src.data.analytics import TOOL_FUNCTIONS as ANALYTICS_FUNCTIONS
+
+            _tool_functions = {"search_videos": search_videos, "semantic_search": semantic_search, **ANALYTICS_FUNCTIONS}
+        return _tool_functions
+
+def init():
+    """Create the clients, the response cache and the tool table ahead of the first request."""
+    get_client()
+    get_async_client()
+    get_response_cache()
+    get_tool_functions()
+
+def check_query_argument(query):
+    """Return the error result for a `query` argument that is not a non-empty string, else None."""
+    if not isinstance(query, str) or not query.strip():
+        logger.warning(f"Invalid query argument: {query!r}")
+        return {"error": "Invalid arguments: query must be a non-empty SQL string"}
+    return None
+
+def cached_query(query):
+    """
+    Run model-generated SQL behind the guardrails, through the SQL result tier of the response cache.
+
+    Returns `{"columns": [...], "rows": [...]}`. A missing or rejected query
+    returns `{"error": reason}` so the model can correct it.
+    """
+    error = check_query_argument(query)
+    if error:
+        return error
+    rows = get_response_cache().get_rows(query)
+    if rows is not None:
+        record_span("sql_cache", 0.0, rows=len(rows["rows"]))
+    else:
+        try:
+            rows = execute_guarded_query(query)
+        except QueryRejected as e:
+            logger.warning(f"Rejected generated query: {e}")
+            return {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            return None
+        get_response_cache().set_rows(query, rows)
+    return rows
+
+async def cached_query_async(query):
+    """Async counterpart of `cached_query`."""
+    error = check_query_argument(query)
+    if error:
+        return error
+    rows = await asyncio.to_thread(get_response_cache().get_rows, query)
+    if rows is not None:
+        record_span("sql_cache", 0.0, rows=len(rows["rows"]))
+    else:
+        try:
+            rows = await execute_guarded_query_async(query)
+        except QueryRejected as e:
+            logger.warning(f"Rejected generated query: {e}")
+            return {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Query execution failed: {e}")
+            return None
+        await asyncio.to_thread(get_response_cache().set_rows, query, rows)
+    return rows
+
+def call_tool(function_to_call, function_args):
+    """Call a tool with the model's arguments, returning an error for the model on bad arguments."""
+    try:
+        return function_to_call(**function_args)
+    except (TypeError, ValueError, KeyError) as e:
+        logger.warning(f"Tool call failed: {e}")
+        return {"error": f"Invalid arguments: {e}"}
+
+def tool_failed(result):
+    """Whether a tool result is a failure: None after a database error, or an error for the model."""
+    return result is None or (isinstance(result, dict) and "error" in result)
+
+def parse_arguments(tool_call):
+    """
+    Decode the model's JSON arguments for a tool call.
+
+    :return: Tuple of the arguments dict and None, or None and the error
+        result to send back to the model when they are not a JSON object.
+    """
+    try:
+        function_args = json.loads(tool_call.function.arguments or "{}")
+    except json.JSONDecodeError as e:
+        logger.warning(f"Malformed tool arguments for {tool_call.function.name}: {e}")
+        return None, {"error": f"Invalid arguments: not valid JSON ({e})"}
+    if not isinstance(function_args, dict):
+        return None, {"error": "Invalid arguments: expected a JSON object"}
+    return function_args, None
+
 def run_conversation(user_prompt):
+    """Answer a question, traced as one request."""
+    with trace("chat"):
+        return _run_conversation(user_prompt)
+
+def _run_conversation(user_prompt):
     logger.info(f"Received user prompt: {user_prompt}")
-    messages = [
-        {
-            "role": "system",
-            "content": """
-                You are a helpful assistant providing insights on YouTube trending videos.
-                When asked for videos, decide if an SQL query is needed.
-                If needed, generate the appropriate SQL query and call `execute_query`.
-                If the answer is known or doesn't require a query, respond directly.
-                Always include video_id, title, and thumbnail_link when returning results.
-                You have access to the following database table schema:
-                **Table: youtube_trending_data**
-                - video_id (TEXT)
-                - title (TEXT)
-                - publishedAt (TEXT)
-                - channelid (TEXT)
-                - channeltitle (TEXT)
-                - categoryid (TEXT)
-                - trending_date (TEXT)
-                - tags (TEXT)
-                - view_count (BIGINT)
-                - likes (BIGINT)
-                - dislikes (BIGINT)
-                - comment_count (BIGINT)
-                - thumbnail_link (TEXT)
-                - comments_disabled (BOOLEAN)
-                - ratings_disabled (BOOLEAN)
-                - description (TEXT)
-                - category_name (TEXT)
-            """
-        },
-        {"role": "user", "content": user_prompt},
-    ]
+    cached = get_response_cache().get_answer(user_prompt)
+    if cached is not None:
+        logger.info("Answer served from the response cache.")
+        annotate(path="cache")
+        return cached["answer"]
+
+    routed = router.route(user_prompt)
+    if routed is not None:
+        annotate(path="routed")
+        answer, sql = routed
+        get_response_cache().set_answer(user_prompt, [sql], answer)
+        return answer
+
+    annotate(path="llm")
+    messages = build_messages(user_prompt)
+    executed_sql = []
+    stages = []
 
     try:
-        response = client.chat.completions.create(
+        started = time.perf_counter()
+        response = get_client().chat.completions.create(
             model=MODEL,
             messages=messages,
             tools=tools,
             tool_choice="auto",
             max_completion_tokens=4096
         )
+        log_stage(stages, "plan", started, response)
         logger.info("LLM response received successfully.")
     except Exception as e:
         logger.error(f"Error in LLM query processing: {e}")
-        return "An error occurred while processing your request."
+        return ERROR_ANSWER
     
     response_message = response.choices[0].message
     tool_calls = response_message.tool_calls
 
-    if tool_calls:
-        logger.info(f"Tool calls detected: {tool_calls}")
-        available_functions = {"execute_query": execute_query}
-        messages.append(response_message)
+    if not tool_calls:
+        # The first reply already answers the question
+        router.record_llm_latency(log_request(stages)["ms"] / 1000)
+        answer = response_message.content or ""
+        get_response_cache().set_answer(user_prompt, executed_sql, answer)
+        return answer
+
+    logger.info(f"Tool calls detected: {tool_calls}")
+    available_functions = {"execute_query": cached_query, **get_tool_functions()}
+    messages.append(response_message)
+    budget = result_budget(messages, tool_calls)
+    started = time.perf_counter()
+    result_tokens = 0
+    failed = False
 
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_to_call = available_functions.get(function_name)
+    for tool_call in tool_calls:
+        function_name = tool_call.function.name
+        function_to_call = available_functions.get(function_name)
 
-            if function_to_call:
-                function_args = json.loads(tool_call.function.arguments)
+        if function_to_call is None:
+            # Every tool call needs an answer, or the next completion is refused
+            function_response = {"error": f"Unknown function: {function_name}"}
+        else:
+            function_args, function_response = parse_arguments(tool_call)
+            if function_args is not None:
                 query = function_args.get("query")
-                params = function_args.get("params", None)
-                fetch = function_args.get("operation") == "SELECT"
-                function_response = function_to_call(query)
-
-                messages.append(
-                    {
-                        "role": "tool",
-                        "name": function_name,
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(function_response),
-                    }
-                )
+                function_response = call_tool(function_to_call, function_args)
+                if function_name == "execute_query":
+                    executed_sql.append(query)
+        failed = failed or tool_failed(function_response)
+
+        messages.append(
+            {
+                "role": "tool",
+                "name": function_name,
+                "tool_call_id": tool_call.id,
+                "content": compact_result(function_response, budget),
+            }
+        )
+        result_tokens += message_tokens(messages[-1:])
+    log_stage(stages, "tools", started, calls=len(tool_calls), result_tokens=result_tokens)
 
     # Final response after executing the query
-    second_response = client.chat.completions.create(
-        model=MODEL,
-        messages=messages
-    )
+    try:
+        started = time.perf_counter()
+        second_response = get_client().chat.completions.create(
+            model=MODEL,
+            messages=answer_messages(messages)
+        )
+        log_stage(stages, "answer", started, second_response)
+    except Exception as e:
+        logger.error(f"Error in LLM answer processing: {e}")
+        return ERROR_ANSWER
+    router.record_llm_latency(log_request(stages)["ms"] / 1000)
+
+    answer = second_response.choices[0].message.content
+    # An answer written around a failed tool call is not worth serving again
+    if not failed:
+        get_response_cache().set_answer(user_prompt, executed_sql, answer)
+    return answer
+
+async def _run_tool_call(tool_call, budget):
+    """
+    Run one tool call from the model.
+
+    :return: Tuple of its tool message, compacted to `budget` tokens, and
+        whether the call failed.
+    """
+    available_functions = {"execute_query": cached_query_async}
+    function_name = tool_call.function.name
+    function_to_call = available_functions.get(function_name) or get_tool_functions().get(function_name)
+
+    if function_to_call is None:
+        result = {"error": f"Unknown function: {function_name}"}
+    else:
+        function_args, result = parse_arguments(tool_call)
+        if function_args is not None and function_name == "execute_query":
+            result = await function_to_call(function_args.get("query"))
+        elif function_args is not None:
+            result = await asyncio.to_thread(call_tool, function_to_call, function_args)
+
+    message = {
+        "role": "tool",
+        "name": function_name,
+        "tool_call_id": tool_call.id,
+        "content": compact_result(result, budget),
+    }
+    return message, tool_failed(result)
+
+async def stream_conversation(user_prompt):
+    """
+    Async, streaming variant of `run_conversation`.
+
+    Tool calls from the first completion run concurrently, and the final
+    answer is yielded token by token as the model produces it. When the model
+    answers without calling a tool, its first reply is returned as is, saving
+    the second completion.
+
+    :param user_prompt: The user's question.
+    :return: Async iterator of answer text fragments.
+    """
+    with trace("chat", stream=True):
+        async for token in _stream_conversation(user_prompt):
+            yield token
+
+async def _stream_conversation(user_prompt):
+    logger.info(f"Received user prompt: {user_prompt}")
+    started = time.perf_counter()
+
+    cached = await asyncio.to_thread(get_response_cache().get_answer, user_prompt)
+    if cached is not None:
+        logger.info("Answer served from the response cache.")
+        annotate(path="cache")
+        yield cached["answer"]
+        return
+
+    routed = await asyncio.to_thread(router.route, user_prompt)
+    if routed is not None:
+        annotate(path="routed")
+        answer, sql = routed
+        await asyncio.to_thread(get_response_cache().set_answer, user_prompt, [sql], answer)
+        yield answer
+        return
+
+    annotate(path="llm")
+    messages = build_messages(user_prompt)
+    stages = []
+
+    try:
+        stage_started = time.perf_counter()
+        response = await get_async_client().chat.completions.create(
+            model=MODEL,
+            messages=messages,
+            tools=tools,
+            tool_choice="auto",
+            max_completion_tokens=4096
+        )
+        log_stage(stages, "plan", stage_started, response)
+        logger.info("LLM response received successfully.")
+    except Exception as e:
+        logger.error(f"Error in LLM query processing: {e}")
+        yield ERROR_ANSWER
+        return
+
+    response_message = response.choices[0].message
+    tool_calls = response_message.tool_calls
+
+    if not tool_calls:
+        logger.info(f"Time to first token: {(time.perf_counter() - started) * 1000:.0f} ms (no tool call).")
+        log_request(stages)
+        router.record_llm_latency(time.perf_counter() - started)
+        answer = response_message.content or ""
+        await asyncio.to_thread(get_response_cache().set_answer, user_prompt, [], answer)
+        yield answer
+        return
+
+    logger.info(f"Tool calls detected: {tool_calls}")
+    messages.append(response_message)
+    budget = result_budget(messages, tool_calls)
+    stage_started = time.perf_counter()
+    results = await asyncio.gather(*(_run_tool_call(tool_call, budget) for tool_call in tool_calls))
+    tool_messages = [message for message, _ in results]
+    failed = any(call_failed for _, call_failed in results)
+    messages.extend(tool_messages)
+    log_stage(stages, "tools", stage_started, calls=len(tool_calls), result_tokens=message_tokens(tool_messages))
+
+    try:
+        stage_started = time.perf_counter()
+        stream = await get_async_client().chat.completions.create(
+            model=MODEL,
+            messages=answer_messages(messages),
+            stream=True
+        )
+        first_token = True
+        answer = []
+        async for chunk in stream:
+            token = chunk.choices[0].delta.content if chunk.choices else None
+            if not token:
+                continue
+            if first_token:
+                logger.info(f"Time to first token: {(time.perf_counter() - started) * 1000:.0f} ms.")
+                first_token = False
+            answer.append(token)
+            yield token
+        # Streamed completions carry no usage; estimate the prompt side
+        log_stage(stages, "answer", stage_started, prompt_tokens=message_tokens(answer_messages(messages)))
+        log_request(stages)
+        router.record_llm_latency(time.perf_counter() - started)
+        if not failed:
+            executed_sql = [
+                (parse_arguments(tool_call)[0] or {}).get("query")
+                for tool_call in tool_calls if tool_call.function.name == "execute_query"
+            ]
+            await asyncio.to_thread(get_response_cache().set_answer, user_prompt, executed_sql, "".join(answer))
+    except Exception as e:
+        logger.error(f"Error while streaming the LLM answer: {e}")
+        yield ERROR_ANSWER
 
-    return second_response.choices[0].message.content
+async def arun_conversation(user_prompt):
+    """Async variant of `run_conversation` returning the complete answer."""
+    with trace("chat"):
+        return "".join([token async for token in _stream_conversation(user_prompt)])
 
-# Example usage
-user_prompt = "show me the top 5 commented videos"
-result = run_conversation(user_prompt)
-print(result)
\ No newline at end of file
+if __name__ == "__main__":
+    # Example usage
+    user_prompt = "show me the top 5 commented videos"
+    result = run_conversation(user_prompt)
+    print(result)
@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import threading
+from src.backend.database.db import TABLE
+from src.backend.database.schema import COLUMNS, REGIONS_VIEW
+from src.backend.database.summaries import SUMMARY_TABLES
+from src.backend.database.backends import execute_query
+from src.backend.database.guardrails import MAX_ROWS
+from src.backend.utils.logger import get_logger
+from src.backend.utils.tracing import record_span
+
+logger = get_logger()
+
+# Prompt tokens allowed per request; tool results share whatever the messages leave
+TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+# Every tool result gets at least this much, even when the budget is spent
+MIN_RESULT_TOKENS = 200
+# Rough size of a token for budgeting; the API reports exact counts afterwards
+CHARS_PER_TOKEN = 4
+
+# Columns never sent back to the model, and text columns cut to a length
+OMITTED_COLUMNS = {"description", "search_vector"}
+TEXT_LIMITS = {"title": 100, "tags": 60, "channelTitle": 40, "channel_title": 40}
+DEFAULT_TEXT_LIMIT = 160
+LIST_LIMIT = 8
+
+# Hints appended to generated column lines
+COLUMN_NOTES = {
+    "tag_list": "lowercase tags, e.g. 'cricket' = ANY(tag_list)",
+    "search_vector": "full-text index of title, tags and description; use search_videos",
+}
+
+_TYPE_NAMES = {
+    "timestamp with time zone": "TIMESTAMPTZ",
+    "character varying": "TEXT",
+    "varchar": "TEXT",
+    "varchar[]": "TEXT[]",
+    "array": "TEXT[]",
+    "double precision": "DOUBLE",
+}
+
+INSTRUCTIONS = """You answer questions about YouTube trending videos {scope}.
+Tools: `execute_query` runs one read-only SELECT (at most {max_rows} rows; aggregate and ORDER BY ... LIMIT in SQL).
+For rising/fastest-growing videos, engagement, time on trending and category or channel share, use the analytics tools.
+For topics or keywords use `search_videos`; for vague descriptions use `semantic_search`. Never write ILIKE searches.
+Prefer the summary tables over youtube_trending_data for rankings and trends.
+Answer directly when no data is needed. Always include video_id, title and thumbnail_link for videos.
+Tool results are JSON with "columns" and "rows".
+
+Tables:
+{schema}
+youtube_trending_data has one row per video per trending day, primary key (video_id, trending_date)."""
+
+# Scope of the data, depending on whether the all-regions view is listed
+SCOPE_INDIA = "in India"
+SCOPE_REGIONS = (
+    f"in several countries: youtube_trending_data and the summary tables cover India, "
+    f"{REGIONS_VIEW} covers every loaded region"
+)
+
+# Second completion: only turns the tool results into an answer, so it needs no schema
+ANSWER_INSTRUCTIONS = (
+    "Answer the user's question about YouTube trending videos from the tool results. "
+    "Always include video_id, title and thumbnail_link for videos. Tool results are JSON with "
+    "\"columns\" and \"rows\"; \"omitted_rows\" counts rows left out for length."
+)
+
+# Seconds a schema section is reused: tables created later, such as the
+# all-regions view, show up once it expires. One built from the static
+# fallback is retried sooner.
+SCHEMA_TTL = float(os.getenv("SCHEMA_TTL", "300"))
+SCHEMA_RETRY_SECONDS = float(os.getenv("SCHEMA_RETRY_SECONDS", "30"))
+
+_schema = None
+_schema_expires = 0.0
+_schema_lock = threading.Lock()
+
+def estimate_tokens(text):
+    """Approximate token count of a string."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def message_tokens(messages):
+    """Approximate prompt tokens of a message list, including tool-call arguments."""
+    total = 0
+    for message in messages:
+        if not isinstance(message, dict):
+            message = message.model_dump(exclude_none=True)
+        total += estimate_tokens(message.get("content") or "") + 4
+        for tool_call in message.get("tool_calls") or []:
+            total += estimate_tokens(tool_call["function"]["arguments"]) + 8
+    return total
+
+def _type_name(data_type):
+    return _TYPE_NAMES.get(data_type.lower(), data_type.upper())
+
+def _table_line(table_name, columns, description=None):
+    parts = [
+        f"{name} {data_type}" + (f" ({COLUMN_NOTES[name]})" if name in COLUMN_NOTES else "")
+        for name, data_type in columns
+    ]
+    header = f"{table_name} ({description})" if description else table_name
+    return f"{header}: {', '.join(parts)}"
+
+def _live_columns(table_name):
+    rows = execute_query(
+        """
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = %s
+        ORDER BY ordinal_position
+        """,
+        (table_name,),
+    )
+    return [(name, _type_name(data_type)) for name, data_type in rows or []]
+
+def _static_columns(columns):
+    return [(name, pg_type.replace(" PRIMARY KEY", "").replace(" NOT NULL", "")) for name, pg_type in columns.items()]
+
+def schema_section():
+    """
+    Describe the queryable tables, one compact block per table.
+
+    Columns and types are read from `information_schema` of the configured
+    query backend and cached for `SCHEMA_TTL` seconds, so the prompt follows
+    the live tables, migrations included. If the database can't be reached,
+    the column definitions in `schema.py` and `summaries.py` are used instead,
+    and the live read is retried after `SCHEMA_RETRY_SECONDS`. The all-regions
+    view is listed only once a region load has created it.
+
+    :return: Schema text for the system prompt.
+    """
+    global _schema, _schema_expires
+    with _schema_lock:
+        if _schema is None or time.monotonic() >= _schema_expires:
+            tables = {TABLE: (None, COLUMNS)}
+            tables.update({name: (spec["description"], spec["columns"]) for name, spec in SUMMARY_TABLES.items()})
+            # Only described once a multi-region load has created it
+            tables[REGIONS_VIEW] = (
+                "trending snapshots of every loaded region, one row per region, video and day; "
+                "filter on region (e.g. 'IN', 'US')",
+                None,
+            )
+            lines = []
+            fallback = False
+            for table_name, (description, columns) in tables.items():
+                live = _live_columns(table_name)
+                if not live and columns is None:
+                    continue
+                if not live:
+                    logger.warning(f"Could not read the columns of '{table_name}'; using the static schema.")
+                    fallback = True
+                lines.append(_table_line(table_name, live or _static_columns(columns), description))
+            _schema = "\n".join(lines)
+            _schema_expires = time.monotonic() + (SCHEMA_RETRY_SECONDS if fallback else SCHEMA_TTL)
+            logger.info(f"Schema section built: ~{estimate_tokens(_schema)} tokens.")
+        return _schema
+
+def system_prompt():
+    """The system prompt of the first completion, with the cached schema section."""
+    schema = schema_section()
+    regions = any(line.startswith(f"{REGIONS_VIEW} ") for line in schema.splitlines())
+    return INSTRUCTIONS.format(max_rows=MAX_ROWS, schema=schema, scope=SCOPE_REGIONS if regions else SCOPE_INDIA)
+
+def build_messages(user_prompt):
+    return [
+        {"role": "system", "content": system_prompt()},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def answer_messages(messages):
+    """
+    Messages for the final completion.
+
+    The long system prompt with the schema only matters for choosing tools and
+    writing SQL, so it is swapped for `ANSWER_INSTRUCTIONS`; the user prompt,
+    the tool calls and their results are kept.
+    """
+    return [{"role": "system", "content": ANSWER_INSTRUCTIONS}, *messages[1:]]
+
+def _compact_value(column, value):
+    if isinstance(value, str):
+        limit = TEXT_LIMITS.get(column, DEFAULT_TEXT_LIMIT)
+        return value if len(value) <= limit else value[:limit - 1] + "…"
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, (list, tuple)) and len(value) > LIST_LIMIT:
+        return list(value[:LIST_LIMIT]) + ["…"]
+    return value
+
+def _dumps(value):
+    # No ASCII escaping: a Hindi title costs one character per letter instead of six
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+
+def compact_result(result, max_tokens):
+    """
+    Serialize a tool result for the model in as few tokens as possible.
+
+    Query results (`{"columns", "rows"}`) and lists of records become columnar
+    JSON: the column names once, then one array per row. Heavy columns
+    (`OMITTED_COLUMNS`) are dropped, long text is cut and floats are rounded.
+    If the result still exceeds `max_tokens`, trailing rows are left out and
+    counted in `omitted_rows`. Anything else, such as an error, is dumped as is.
+
+    :param result: Return value of a tool function.
+    :param max_tokens: Token allowance for this result.
+    :return: JSON string for the tool message.
+    """
+    if isinstance(result, dict) and "columns" in result and "rows" in result:
+        columns, rows = list(result["columns"]), result["rows"]
+    elif isinstance(result, list) and result and all(isinstance(record, dict) for record in result):
+        columns = list(result[0])
+        rows = [[record.get(column) for column in columns] for record in result]
+    else:
+        return _dumps(result)
+
+    keep = [i for i, column in enumerate(columns) if column not in OMITTED_COLUMNS]
+    compact = {
+        "columns": [columns[i] for i in keep],
+        "rows": [[_compact_value(columns[i], row[i]) for i in keep] for row in rows],
+    }
+    content = _dumps(compact)
+    total = len(compact["rows"])
+    while estimate_tokens(content) > max_tokens and compact["rows"]:
+        # Shrink in proportion to the overshoot, always by at least one row
+        keep_rows = min(len(compact["rows"]) - 1, int(len(compact["rows"]) * max_tokens / estimate_tokens(content)))
+        compact["rows"] = compact["rows"][:keep_rows]
+        compact["omitted_rows"] = total - keep_rows
+        content = _dumps(compact)
+    return content
+
+def result_budget(messages, tool_calls):
+    """Tokens each of `tool_calls` results may use, given the messages already in the prompt."""
+    remaining = TOKEN_BUDGET - message_tokens(answer_messages(messages))
+    return max(MIN_RESULT_TOKENS, remaining // max(len(tool_calls), 1))
+
+def log_stage(stages, name, started, response=None, **extra):
+    """
+    Record the latency and token usage of one stage of a request, in the
+    request's stage list and as a span of its trace.
+
+    :param stages: List collecting the request's stages.
+    :param name: Stage name, e.g. "plan", "tools" or "answer".
+    :param started: `time.perf_counter()` at the start of the stage.
+    :param response: Chat completion whose `usage` holds the exact token counts.
+    :param extra: Further numbers to report, e.g. estimated tool result tokens.
+    """
+    seconds = time.perf_counter() - started
+    stage = {"stage": name, "ms": round(seconds * 1000, 1), **extra}
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        stage["prompt_tokens"] = usage.prompt_tokens
+        stage["completion_tokens"] = usage.completion_tokens
+    stages.append(stage)
+    record_span(name, seconds, **{key: value for key, value in stage.items() if key not in ("stage", "ms")})
+    logger.debug(f"Stage {name}: {stage}")
+
+def log_request(stages):
+    """Log the totals of a request's stages and return them."""
+    totals = {
+        "ms": round(sum(stage["ms"] for stage in stages), 1),
+        "prompt_tokens": sum(stage.get("prompt_tokens", 0) for stage in stages),
+        "completion_tokens": sum(stage.get("completion_tokens", 0) for stage in stages),
+    }
+    logger.info(f"Request totals: {totals} over {[stage['stage'] for stage in stages]}")
+    return totals
@@ -0,0 +1,193 @@
+import os
+import re
+import time
+import threading
+from collections import deque
+from src.backend.database.backends import execute_query
+from src.backend.database.summaries import VIDEO_STATS_TABLE
+from src.backend.utils.logger import get_logger
+from src.backend.utils.metrics import percentile
+
+logger = get_logger()
+
+ROUTER_ENABLED = os.getenv("INTENT_ROUTER", "on").lower() not in ("0", "off", "false")
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Metric words and the video_stats column they rank by
+METRICS = {
+    "likes": ("latest_likes", {"like", "likes", "liked"}),
+    "views": ("latest_view_count", {"view", "views", "viewed", "watched"}),
+    "comments": ("latest_comment_count", {"comment", "comments", "commented"}),
+}
+
+# YouTube's category titles and the words people use for them, longest phrase first
+CATEGORY_ALIASES = {
+    "film & animation": "Film & Animation", "film and animation": "Film & Animation", "film": "Film & Animation",
+    "films": "Film & Animation", "movie": "Film & Animation", "movies": "Film & Animation",
+    "animation": "Film & Animation", "autos & vehicles": "Autos & Vehicles", "autos": "Autos & Vehicles",
+    "cars": "Autos & Vehicles", "vehicles": "Autos & Vehicles", "music": "Music", "songs": "Music",
+    "pets & animals": "Pets & Animals", "pets": "Pets & Animals", "animals": "Pets & Animals",
+    "sports": "Sports", "sport": "Sports", "travel & events": "Travel & Events", "travel": "Travel & Events",
+    "gaming": "Gaming", "games": "Gaming", "people & blogs": "People & Blogs", "blogs": "People & Blogs",
+    "vlogs": "People & Blogs", "comedy": "Comedy", "entertainment": "Entertainment",
+    "news & politics": "News & Politics", "news": "News & Politics", "politics": "News & Politics",
+    "howto & style": "Howto & Style", "how to": "Howto & Style", "howto": "Howto & Style",
+    "style": "Howto & Style", "education": "Education", "educational": "Education",
+    "science & technology": "Science & Technology", "science": "Science & Technology",
+    "technology": "Science & Technology", "tech": "Science & Technology",
+}
+_CATEGORY = re.compile(
+    r"\b(" + "|".join(re.escape(alias) for alias in sorted(CATEGORY_ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "fifteen": 15, "twenty": 20, "thirty": 30, "fifty": 50,
+}
+RANK_WORDS = {"top", "most", "highest", "best", "biggest", "greatest", "popular"}
+# Words that don't change the question; any other word sends it to the LLM
+FILLER_WORDS = {
+    "show", "me", "us", "the", "a", "an", "of", "what", "which", "are", "is", "were", "was", "videos",
+    "video", "by", "with", "in", "on", "from", "category", "list", "give", "get", "find", "tell", "all",
+    "time", "ever", "trending", "number", "count", "please", "youtube", "that", "have", "has", "had", "got",
+    "received", "for", "ranked", "rank", "and", "can", "you", "i", "want", "see", "to", "do", "many",
+}
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Rolling latencies of the routed and LLM paths, for `router_stats`
+_latencies = {"routed": deque(maxlen=1000), "llm": deque(maxlen=1000)}
+_counts = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+def parse(prompt):
+    """
+    Recognize "top N videos by likes/views/comments [in category X]".
+
+    The parser accepts a question only when every word is accounted for: one
+    metric, an optional count, an optional category, ranking words and filler.
+    Anything else (time ranges, channels, "who", growth, "least") is a miss, so
+    a routed answer is never a guess. Without a count, a question about "the
+    video" gets one row and one about "videos" gets `DEFAULT_LIMIT`.
+
+    :param prompt: The user's question.
+    :return: Dict with `metric`, `column`, `limit` and `category`, or None.
+    """
+    text = prompt.lower()
+    categories = set(CATEGORY_ALIASES[alias] for alias in _CATEGORY.findall(text))
+    if len(categories) > 1:
+        return None
+    words = _WORD.findall(_CATEGORY.sub(" ", text))
+
+    metrics, limits, ranked = set(), [], False
+    for word in words:
+        metric = next((name for name, (_, forms) in METRICS.items() if word in forms), None)
+        if metric:
+            metrics.add(metric)
+        elif word.isdigit():
+            limits.append(int(word))
+        elif word in NUMBER_WORDS:
+            limits.append(NUMBER_WORDS[word])
+        elif word in RANK_WORDS:
+            ranked = True
+        elif word not in FILLER_WORDS:
+            return None
+
+    if len(metrics) != 1 or len(limits) > 1 or not ranked:
+        return None
+    if limits:
+        limit = limits[0]
+    else:
+        # "the most liked video" asks for one; "the most liked videos" for a list
+        limit = 1 if "video" in words and "videos" not in words else DEFAULT_LIMIT
+    if not 1 <= limit <= MAX_LIMIT:
+        return None
+    metric = metrics.pop()
+    return {
+        "metric": metric,
+        "column": METRICS[metric][0],
+        "limit": limit,
+        "category": categories.pop() if categories else None,
+    }
+
+def build_query(intent):
+    """Parameterized SQL over the video_stats summary table for a parsed intent."""
+    params = []
+    where = ""
+    if intent["category"]:
+        where = "WHERE category_name = %s"
+        params.append(intent["category"])
+    params.append(intent["limit"])
+    query = f"""
+        SELECT video_id, title, thumbnail_link, channel_title, {intent['column']}
+        FROM {VIDEO_STATS_TABLE}
+        {where}
+        ORDER BY {intent['column']} DESC
+        LIMIT %s
+    """
+    return query, tuple(params)
+
+def format_answer(intent, rows):
+    """Render the rows as the chatbot's usual numbered list."""
+    scope = f" in {intent['category']}" if intent["category"] else ""
+    if not rows:
+        return f"I couldn't find any trending videos{scope}."
+    if len(rows) == 1:
+        lines = [f"Here is the top trending video by {intent['metric']}{scope}:", ""]
+    else:
+        lines = [f"Here are the top {len(rows)} trending videos by {intent['metric']}{scope}:", ""]
+    for position, (video_id, title, thumbnail_link, channel_title, value) in enumerate(rows, 1):
+        count = f"{value:,}" if value is not None else "unknown"
+        lines.append(f"{position}. **{title}** by {channel_title} ({count} {intent['metric']})")
+        lines.append(f"   - video_id: {video_id}")
+        lines.append(f"   - thumbnail: {thumbnail_link}")
+    return "\n".join(lines)
+
+def route(prompt):
+    """
+    Answer a templated question without the LLM.
+
+    :param prompt: The user's question.
+    :return: `(answer, sql)` when the prompt matches a known intent and the
+        query succeeds, else None, in which case the caller asks the LLM.
+    """
+    if not ROUTER_ENABLED:
+        return None
+    started = time.perf_counter()
+    intent = parse(prompt)
+    if intent is None:
+        with _stats_lock:
+            _counts["misses"] += 1
+        return None
+
+    query, params = build_query(intent)
+    rows = execute_query(query, params)
+    if rows is None:
+        logger.warning("Routed query failed; falling back to the LLM.")
+        with _stats_lock:
+            _counts["misses"] += 1
+        return None
+
+    answer = format_answer(intent, rows)
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        _counts["hits"] += 1
+        _latencies["routed"].append(elapsed)
+    logger.info(f"Routed {intent} in {elapsed * 1000:.1f} ms.")
+    return answer, query
+
+def record_llm_latency(seconds):
+    """Record the latency of a question answered through the LLM."""
+    with _stats_lock:
+        _latencies["llm"].append(seconds)
+
+def router_stats():
+    """Hit rate of the router and p50/p95 latency in ms of the routed and LLM paths."""
+    with _stats_lock:
+        total = _counts["hits"] + _counts["misses"]
+        stats = {**_counts, "hit_rate": _counts["hits"] / total if total else 0.0}
+        for path, values in _latencies.items():
+            for pct in (50, 95):
+                value = percentile(values, pct)
+                stats[f"{path}_p{pct}_ms"] = round(value * 1000, 2) if value is not None else None
+    return stats
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+# Request and response models for the chat endpoints
+class ChatRequest(BaseModel):
+    prompt: str = Field(..., min_length=1, description="The user's question about YouTube trends.")
+
+class ChatResponse(BaseModel):
+    message: str
+    latency_ms: float
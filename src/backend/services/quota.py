@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import random
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from concurrent.futures import Future
+from googleapiclient.errors import HttpError
+from src.backend.utils import logger
+
+logger = logger.get_logger()
+
+# Quota units charged per call type, from the YouTube Data API v3 quota table
+QUOTA_COSTS = {
+    "videos.list": 1,
+    "channels.list": 1,
+    "videoCategories.list": 1,
+    "search.list": 100,
+}
+
+DAILY_QUOTA = int(os.environ.get("YOUTUBE_DAILY_QUOTA", "10000"))
+REQUESTS_PER_SECOND = float(os.environ.get("YOUTUBE_REQUESTS_PER_SECOND", "10"))
+MAX_RETRIES = int(os.environ.get("YOUTUBE_MAX_RETRIES", "4"))
+
+# The daily quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError"}
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call would exceed the daily quota budget."""
+
+
+def _error_reason(error: HttpError):
+    try:
+        return json.loads(error.content)["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate-limit 403/429 responses and 5xx server errors are worth retrying."""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status >= 500 or status == 429:
+        return True
+    return status == 403 and _error_reason(error) in RETRYABLE_REASONS
+
+
+class QuotaScheduler:
+    """
+    Paces YouTube Data API calls within per-second and daily budgets.
+
+    A token bucket limits the request rate, so bursts are smoothed out instead
+    of spending the daily quota at once. Each call is charged its quota cost up
+    front and refused with `QuotaExceededError` once the daily budget is spent,
+    which lets callers fall back to cached data. Rate-limit and server errors
+    are retried with exponential backoff and full jitter.
+
+    :param requests_per_second: Sustained request rate; also the burst size.
+    :param daily_quota: Quota units available per Pacific Time day.
+    :param max_retries: Retries per call after the first attempt.
+    :param base_delay: First backoff delay, in seconds.
+    :param max_delay: Cap on a single backoff delay, in seconds.
+    :param clock: Monotonic time source, replaceable in tests.
+    :param sleep: Sleep function, replaceable in tests.
+    """
+
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND, daily_quota=DAILY_QUOTA,
+                 max_retries=MAX_RETRIES, base_delay=0.5, max_delay=32.0, clock=time.monotonic, sleep=time.sleep):
+        self.requests_per_second = requests_per_second
+        self.daily_quota = daily_quota
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._tokens = requests_per_second
+        self._refilled_at = clock()
+        self._quota_day = self._today()
+        self.counters = {"calls": 0, "quota_used": 0, "retries": 0, "coalesced": 0, "rejected": 0, "throttled_seconds": 0.0}
+
+    @staticmethod
+    def _today():
+        return datetime.now(QUOTA_TIMEZONE).date()
+
+    def _reserve(self, cost):
+        """Charge `cost` quota units and take a rate token, returning the seconds to wait for it."""
+        with self._lock:
+            today = self._today()
+            if today != self._quota_day:
+                self._quota_day = today
+                self.counters["quota_used"] = 0
+
+            if self.counters["quota_used"] + cost > self.daily_quota:
+                self.counters["rejected"] += 1
+                raise QuotaExceededError(
+                    f"Daily YouTube quota of {self.daily_quota} units spent ({self.counters['quota_used']} used)."
+                )
+
+            now = self._clock()
+            self._tokens = min(self.requests_per_second, self._tokens + (now - self._refilled_at) * self.requests_per_second)
+            self._refilled_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.requests_per_second if self._tokens < 0 else 0.0
+
+            self.counters["calls"] += 1
+            self.counters["quota_used"] += cost
+            self.counters["throttled_seconds"] += wait
+        return wait
+
+    def call(self, operation, fn):
+        """
+        Run `fn()` as one `operation` call (e.g. "videos.list") under the budgets.
+
+        :raises QuotaExceededError: If the daily budget cannot cover the call.
+        :raises HttpError: If the call fails with a non-retryable error or runs out of retries.
+        """
+        cost = QUOTA_COSTS.get(operation, 1)
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(cost)
+            if wait:
+                self._sleep(wait)
+            try:
+                return fn()
+            except Exception as e:
+                if isinstance(e, HttpError) and _error_reason(e) == "quotaExceeded":
+                    # The API's own count is authoritative; stop spending until the reset
+                    with self._lock:
+                        self.counters["quota_used"] = max(self.counters["quota_used"], self.daily_quota)
+                    raise QuotaExceededError("YouTube API reported the daily quota as exceeded.") from e
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                with self._lock:
+                    self.counters["retries"] += 1
+                logger.warning(f"{operation} failed ({e.resp.status}); retry {attempt + 1} in {delay:.2f}s.")
+                self._sleep(delay)
+
+    def record_coalesced(self, count):
+        with self._lock:
+            self.counters["coalesced"] += count
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, daily_quota=self.daily_quota)
+
+
+class RequestCoalescer:
+    """
+    Shares in-flight lookups between concurrent callers.
+
+    A caller claims the keys it needs: keys nobody is fetching become its own
+    to fetch, and keys already being fetched come back as futures to wait on.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def claim(self, keys):
+        """Return `(owned_keys, {key: Future})` for the keys to fetch and the keys to wait on."""
+        owned, waiting = [], {}
+        with self._lock:
+            for key in keys:
+                if key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                else:
+                    self._inflight[key] = Future()
+                    owned.append(key)
+        return owned, waiting
+
+    def resolve(self, results, keys, error=None):
+        """Publish the fetched `results` (or an `error`) for owned `keys` and release them."""
+        with self._lock:
+            futures = [(key, self._inflight.pop(key)) for key in keys if key in self._inflight]
+        for key, future in futures:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(key))
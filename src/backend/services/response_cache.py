@@ -0,0 +1,350 @@
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.backend.utils import logger
+
+logger = logger.get_logger()
+
+CACHE_BACKEND = os.environ.get("RESPONSE_CACHE_BACKEND", "memory")
+CACHE_PATH = os.environ.get("RESPONSE_CACHE_PATH", "src/data/response_cache.sqlite")
+CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+SIMILARITY_THRESHOLD = float(os.environ.get("RESPONSE_CACHE_SIMILARITY", "0.85"))
+# How long the data version is trusted before asking the database again
+DATA_VERSION_TTL = float(os.environ.get("RESPONSE_CACHE_VERSION_TTL", "30"))
+
+EMBEDDING_DIM = 512
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Filler words that do not change what a question asks for
+STOP_WORDS = {
+    "a", "all", "an", "and", "are", "by", "can", "do", "does", "find", "for", "get", "give", "i",
+    "in", "is", "list", "me", "my", "of", "on", "please", "show", "some", "tell", "the", "to",
+    "want", "what", "which", "with", "you",
+}
+
+# Words that flip a ranking; paraphrases must agree on them
+DIRECTION_WORDS = {
+    "top": "desc", "most": "desc", "highest": "desc", "best": "desc", "biggest": "desc",
+    "least": "asc", "lowest": "asc", "bottom": "asc", "fewest": "asc", "worst": "asc",
+}
+
+
+def normalize_prompt(prompt):
+    """Lowercase a prompt and reduce it to its words, so spacing and punctuation do not matter."""
+    return " ".join(_WORD.findall(prompt.lower()))
+
+
+def normalize_sql(query):
+    """Collapse whitespace and a trailing semicolon so formatting differences share a cache entry."""
+    return " ".join(query.split()).rstrip(";").strip()
+
+
+def _stem(word):
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def embed(text, dim=EMBEDDING_DIM):
+    """
+    Embed text with a signed hashing vectorizer.
+
+    Features are stemmed content words, their bigrams and character trigrams
+    (so "viewed" and "views" overlap). Runs on CPU in microseconds and needs
+    no model download. Returns an L2-normalized float32 vector, so dot
+    products are cosine similarities.
+    """
+    words = [_stem(word) for word in _WORD.findall(text.lower()) if word not in STOP_WORDS]
+    features = [(word, 1.0) for word in words]
+    features += [(f"{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"#{word}#"
+        features += [(padded[i:i + 3], 0.3) for i in range(len(padded) - 2)]
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in features:
+        digest = zlib.crc32(feature.encode())
+        vector[digest % dim] += weight if digest & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _guard(normalized):
+    """
+    What a paraphrase hit must match exactly: the numbers, the ranking direction
+    and the stemmed content words of a prompt.
+
+    Similarity alone would let "this month" reuse the answer for "this week",
+    or drop a region or category filter, so only word order, filler words,
+    inflections and direction synonyms ("top" / "most") may differ.
+    """
+    words = [word for word in normalized.split() if word not in STOP_WORDS]
+    return (
+        frozenset(word for word in words if word.isdigit()),
+        frozenset(DIRECTION_WORDS[word] for word in words if word in DIRECTION_WORDS),
+        frozenset(_stem(word) for word in words if not word.isdigit() and word not in DIRECTION_WORDS),
+    )
+
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend(MemoryBackend):
+    """Memory LRU in front of a SQLite file, so entries survive restarts."""
+
+    def __init__(self, path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)")
+        self._db.commit()
+
+    def get(self, key):
+        value = super().get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            row = self._db.execute("SELECT expires_at, value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] <= time.time():
+            return None
+        value = json.loads(row[1])
+        super().set(key, value, row[0] - time.time())
+        return value
+
+    def set(self, key, value, ttl):
+        super().set(key, value, ttl)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, json.dumps(value, default=str)),
+            )
+            self._db.commit()
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+
+class PostgresBackend(MemoryBackend):
+    """Memory LRU in front of a Postgres table, shared by every API worker."""
+
+    TABLE = "response_cache"
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        from src.backend.database.db import execute_query
+        self._execute = execute_query
+        self._execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                key TEXT PRIMARY KEY,
+                expires_at TIMESTAMPTZ NOT NULL,
+                value JSONB NOT NULL
+            );
+            """,
+            fetch=None,
+        )
+
+    def get(self, key):
+        value = super().get(key)
+        if value is not None:
+            return value
+        row = self._execute(
+            f"SELECT value, extract(epoch FROM expires_at - now()) FROM {self.TABLE} WHERE key = %s AND expires_at > now()",
+            (key,),
+            fetch="one",
+        )
+        if not row:
+            return None
+        super().set(key, row[0], float(row[1]))
+        return row[0]
+
+    def set(self, key, value, ttl):
+        super().set(key, value, ttl)
+        self._execute(
+            f"""
+            INSERT INTO {self.TABLE} (key, expires_at, value)
+            VALUES (%s, now() + make_interval(secs => %s), %s)
+            ON CONFLICT (key) DO UPDATE SET expires_at = EXCLUDED.expires_at, value = EXCLUDED.value
+            """,
+            (key, ttl, json.dumps(value, default=str)),
+            fetch=None,
+        )
+
+    def clear(self):
+        super().clear()
+        self._execute(f"DELETE FROM {self.TABLE}", fetch=None)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for chatbot answers.
+
+    Tier 1 maps a normalized prompt to the SQL the model generated and the
+    final answer. Besides exact matches, a prompt whose hashed embedding is
+    at least `similarity_threshold` similar to a cached one (and mentions the
+    same numbers and ranking direction, so "top 5" never answers "top 10" and
+    "most liked" never answers "least liked") is a hit too. Tier 2 maps
+    SQL text to its result rows. Both tiers are keyed on the data version,
+    so a new ingestion invalidates every entry at once.
+
+    :param backend: Storage for both tiers (`MemoryBackend`, `SQLiteBackend` or `PostgresBackend`).
+    :param ttl: Seconds an entry stays valid.
+    :param similarity_threshold: Cosine similarity needed for a paraphrase hit; 1.0 disables it.
+    :param version_source: Callable returning the current data version.
+    """
+
+    def __init__(self, backend=None, ttl=CACHE_TTL, similarity_threshold=SIMILARITY_THRESHOLD,
+                 version_source=None, max_prompts=CACHE_MAX_ENTRIES):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._version_source = version_source
+        self._version = None
+        self._version_checked_at = 0.0
+
+        # Ring buffer of prompt embeddings for the similarity lookup
+        self._vectors = np.zeros((max_prompts, EMBEDDING_DIM), dtype=np.float32)
+        self._prompts = [None] * max_prompts
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+        self.metrics = {
+            "prompt_hits": 0, "prompt_semantic_hits": 0, "prompt_misses": 0,
+            "sql_hits": 0, "sql_misses": 0,
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self.metrics[name] += 1
+
+    def data_version(self):
+        """Return the current data version, re-read at most every `DATA_VERSION_TTL` seconds."""
+        if self._version_source is None:
+            return "static"
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at > DATA_VERSION_TTL:
+            try:
+                self._version = self._version_source()
+            except Exception as e:
+                logger.warning(f"Could not read the data version, keeping '{self._version}': {e}")
+            self._version_checked_at = now
+        return self._version
+
+    def _similar_prompt(self, normalized):
+        query = embed(normalized)
+        guard = _guard(normalized)
+        with self._lock:
+            scores = self._vectors @ query
+            best = np.argpartition(scores, -5)[-5:] if len(scores) > 5 else np.arange(len(scores))
+            for slot in best[np.argsort(scores[best])[::-1]]:
+                candidate = self._prompts[slot]
+                if candidate is None or scores[slot] < self.similarity_threshold:
+                    break
+                if _guard(candidate) == guard:
+                    return candidate
+        return None
+
+    def get_answer(self, prompt):
+        """Return the cached `{"sql": [...], "answer": str}` for a prompt or a paraphrase of it, else None."""
+        version = self.data_version()
+        normalized = normalize_prompt(prompt)
+        entry = self.backend.get(f"prompt:{version}:{normalized}")
+        if entry is not None:
+            self._count("prompt_hits")
+            return entry
+
+        if self.similarity_threshold < 1.0:
+            similar = self._similar_prompt(normalized)
+            if similar is not None:
+                entry = self.backend.get(f"prompt:{version}:{similar}")
+                if entry is not None:
+                    self._count("prompt_semantic_hits")
+                    return entry
+
+        self._count("prompt_misses")
+        return None
+
+    def set_answer(self, prompt, sql, answer):
+        """Cache the SQL statements and final answer produced for a prompt."""
+        normalized = normalize_prompt(prompt)
+        self.backend.set(f"prompt:{self.data_version()}:{normalized}", {"sql": sql, "answer": answer}, self.ttl)
+        vector = embed(normalized)
+        with self._lock:
+            self._vectors[self._next_slot] = vector
+            self._prompts[self._next_slot] = normalized
+            self._next_slot = (self._next_slot + 1) % len(self._prompts)
+
+    def get_rows(self, query):
+        """Return the cached result (column names and rows) of a SQL statement, else None."""
+        rows = self.backend.get(f"result:{self.data_version()}:{normalize_sql(query)}")
+        self._count("sql_hits" if rows is not None else "sql_misses")
+        return rows
+
+    def set_rows(self, query, rows):
+        """Cache the result (column names and rows) of a SQL statement."""
+        if rows is not None:
+            self.backend.set(f"result:{self.data_version()}:{normalize_sql(query)}", rows, self.ttl)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._vectors[:] = 0
+            self._prompts = [None] * len(self._prompts)
+
+
+def create_response_cache(backend=CACHE_BACKEND):
+    """Build the process-wide cache for the configured backend ("memory", "sqlite" or "postgres")."""
+    from src.backend.database.backends import get_data_version
+
+    if backend == "sqlite":
+        storage = SQLiteBackend()
+    elif backend == "postgres":
+        storage = PostgresBackend()
+    else:
+        storage = MemoryBackend()
+    return ResponseCache(storage, version_source=get_data_version)
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from src.backend.utils import logger
+
+logger = logger.get_logger()
+
+CACHE_PATH = os.environ.get("YOUTUBE_CACHE_PATH", "src/data/youtube_cache.sqlite")
+CACHE_MAX_ENTRIES = int(os.environ.get("YOUTUBE_CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL = float(os.environ.get("YOUTUBE_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+class VideoCache:
+    """
+    Thread-safe LRU cache with a TTL for YouTube video metadata.
+
+    Entries live in memory and, when `path` is set, are written through to a
+    SQLite file so they survive restarts and are shared between workers on the
+    same host. A `None` value records a video the API reported as missing.
+
+    :param max_entries: Entries kept in memory before the least recently used is evicted.
+    :param ttl: Seconds an entry stays valid.
+    :param path: SQLite file for persistence, or None for a memory-only cache.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL, path=CACHE_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()  # video_id -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS videos (video_id TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Video cache persistence disabled: {e}")
+                self._db = None
+
+    def _load(self, video_id, now):
+        """Read one entry from SQLite. Must hold the lock."""
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT expires_at, value FROM videos WHERE video_id = ?", (video_id,)
+        ).fetchone()
+        if row is None or row[0] <= now:
+            return None
+        return row[0], json.loads(row[1])
+
+    def get_many(self, video_ids):
+        """
+        Look up several videos at once.
+
+        :return: Tuple of a dict of cached `video_id -> value` and a list of ids
+            that were not cached or have expired.
+        """
+        now = time.time()
+        found, missing = {}, []
+        with self._lock:
+            for video_id in video_ids:
+                entry = self._entries.get(video_id)
+                if entry is None or entry[0] <= now:
+                    entry = self._load(video_id, now)
+                    if entry is None:
+                        missing.append(video_id)
+                        continue
+                    self._entries[video_id] = entry
+                self._entries.move_to_end(video_id)
+                found[video_id] = entry[1]
+            self._evict()
+        return found, missing
+
+    def set_many(self, values):
+        """Store a dict of `video_id -> value`."""
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            for video_id, value in values.items():
+                self._entries[video_id] = (expires_at, value)
+                self._entries.move_to_end(video_id)
+            self._evict()
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO videos (video_id, expires_at, value) VALUES (?, ?, ?)",
+                        [(video_id, expires_at, json.dumps(value)) for video_id, value in values.items()],
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist video cache entries: {e}")
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM videos")
+                self._db.commit()
@@ -1,64 +1,178 @@
 import os
-from googleapiclient.discovery import build
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.errors import HttpError
+from src.backend.services.video_cache import VideoCache
+from src.backend.services.quota import QuotaScheduler, QuotaExceededError, RequestCoalescer
 from src.backend.utils import logger
-from dotenv import load_dotenv
+from src.backend.utils.env import load_env
+from src.backend.utils.tracing import span
 
-load_dotenv()
+load_env()
 logger = logger.get_logger()
 
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")
+# Optional base URL replacing https://youtube.googleapis.com/youtube/v3/, e.g. a local stub
+YOUTUBE_API_ENDPOINT = os.environ.get("YOUTUBE_API_ENDPOINT")
 API_SERVICE_NAME = "youtube"
 API_VERSION = "v3"
 
+# videos().list accepts up to 50 comma-separated IDs per call
+MAX_IDS_PER_REQUEST = 50
+MAX_WORKERS = int(os.environ.get("YOUTUBE_MAX_WORKERS", "4"))
+
+# googleapiclient clients are not thread-safe, so each thread builds and keeps its own
+_local = threading.local()
+# Opens (and creates) its SQLite file, so it is only built by the first lookup
+video_cache = None
+_video_cache_lock = threading.Lock()
+scheduler = QuotaScheduler()
+coalescer = RequestCoalescer()
+
+def get_video_cache():
+    """The process-wide video details cache, created on first use."""
+    global video_cache
+    with _video_cache_lock:
+        if video_cache is None:
+            video_cache = VideoCache()
+        return video_cache
+
 def get_youtube_service():
     """Creates and returns a YouTube API service instance with error handling and retries."""
 
+    youtube = getattr(_local, "youtube", None)
+    if youtube is not None:
+        return youtube
+
     if not YOUTUBE_API_KEY:
         logger.error("YouTube API key is missing. Please set YOUTUBE_API_KEY.")
         return None
 
+    # The discovery client and its auth stack are only imported once a lookup needs them
+    from googleapiclient.discovery import build
+
     try:
-        youtube = build(API_SERVICE_NAME, API_VERSION, developerKey=YOUTUBE_API_KEY, cache_discovery=False)
+        client_options = {"api_endpoint": YOUTUBE_API_ENDPOINT} if YOUTUBE_API_ENDPOINT else None
+        youtube = build(
+            API_SERVICE_NAME, API_VERSION, developerKey=YOUTUBE_API_KEY,
+            cache_discovery=False, client_options=client_options
+        )
         logger.info("YouTube API service initialized successfully.")
+        _local.youtube = youtube
         return youtube
     except HttpError as e:
         logger.error(f"An error occurred: {e}")
         return None
 
-def get_video_links(video_ids: list) -> list:
-    """Fetches YouTube video links for given video IDs."""
-    youtube = get_youtube_service()
+def _fetch_chunk(video_ids: list, youtube=None) -> dict:
+    """Fetches the snippets of up to 50 videos in a single videos().list call."""
+    youtube = youtube or get_youtube_service()
     if not youtube:
-        return ["Failed to initialize YouTube API service."]
-    video_links = []
-    for video_id in video_ids:
-        try:
-            # Fetch video details (title & link)
-            video_request = youtube.videos().list(
-                part="snippet",
-                id=video_id
-            )
-            video_response = video_request.execute()
+        raise RuntimeError("Failed to initialize YouTube API service.")
+
+    request = youtube.videos().list(
+        part="snippet",
+        id=",".join(video_ids),
+        maxResults=MAX_IDS_PER_REQUEST
+    )
+    response = scheduler.call("videos.list", request.execute)
+
+    details = {video_id: None for video_id in video_ids}
+    for item in response.get("items", []):
+        snippet = item["snippet"]
+        thumbnails = snippet.get("thumbnails", {})
+        thumbnail = (thumbnails.get("high") or thumbnails.get("default") or {}).get("url")
+        details[item["id"]] = {
+            "title": snippet["title"],
+            "thumbnail": thumbnail,
+            "url": f"https://www.youtube.com/watch?v={item['id']}",
+        }
+    return details
 
-            if not video_response["items"]:
-                video_links.append(f"Video ID `{video_id}` not found.")
-                continue
+def get_video_details(video_ids: list, youtube=None, max_workers: int = MAX_WORKERS) -> dict:
+    """
+    Fetches title, thumbnail and link for many videos with as few API calls as possible.
 
-            video_title = video_response["items"][0]["snippet"]["title"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
+    Cached videos cost no quota, and videos another caller is already fetching
+    are waited on instead of requested twice. The remaining IDs are split into
+    groups of 50 and fetched concurrently by at most `max_workers` threads,
+    paced by the quota scheduler. Once the daily quota is spent, lookups
+    degrade to whatever is cached.
 
-            video_links.append(f"**[{video_title}]({video_url})**")
+    :param video_ids: YouTube video IDs.
+    :param youtube: Optional client exposing `videos().list`, e.g. a local fake.
+        Defaults to one cached discovery client per worker thread.
+    :param max_workers: Upper bound on concurrent API calls.
+    :return: Dict mapping each video ID to `{"title", "thumbnail", "url"}`, or to
+        None if the video does not exist. IDs whose lookup failed are left out.
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    with span("youtube", videos=len(unique_ids)) as fields:
+        details = _lookup_video_details(unique_ids, youtube, max_workers, fields)
+    return details
 
-        except HttpError as e:
-            logger.error(f"HTTP error while fetching data for video ID {video_id}: {e}")
-            video_links.append(f"Error fetching details for video `{video_id}`: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error while fetching video details for {video_id}: {e}")
-            video_links.append(f"Unexpected error for video `{video_id}`: {e}")
+def _lookup_video_details(unique_ids, youtube, max_workers, fields):
+    details, missing = get_video_cache().get_many(unique_ids)
+    fields["cached"] = len(details)
+    if not missing:
+        return details
+
+    owned, waiting = coalescer.claim(missing)
+    if waiting:
+        scheduler.record_coalesced(len(waiting))
+
+    try:
+        chunks = [owned[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(owned), MAX_IDS_PER_REQUEST)]
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                futures = {executor.submit(_fetch_chunk, chunk, youtube): chunk for chunk in chunks}
+                for future, chunk in futures.items():
+                    try:
+                        fetched = future.result()
+                    except QuotaExceededError as e:
+                        logger.warning(f"Skipping video IDs {chunk}: {e}")
+                        coalescer.resolve({}, chunk, error=e)
+                        continue
+                    except HttpError as e:
+                        logger.error(f"HTTP error while fetching data for video IDs {chunk}: {e}")
+                        coalescer.resolve({}, chunk, error=e)
+                        continue
+                    except Exception as e:
+                        logger.error(f"Unexpected error while fetching video details for {chunk}: {e}")
+                        coalescer.resolve({}, chunk, error=e)
+                        continue
+                    get_video_cache().set_many(fetched)
+                    coalescer.resolve(fetched, chunk)
+                    details.update(fetched)
+    finally:
+        # Never leave other callers waiting on IDs this call failed to resolve
+        coalescer.resolve({}, owned, error=RuntimeError("Video lookup aborted."))
+
+    for video_id, future in waiting.items():
+        try:
+            details[video_id] = future.result()
+        except Exception:
+            # The owning caller already logged the failure
+            pass
+
+    return details
+
+def get_video_links(video_ids: list, youtube=None) -> list:
+    """Fetches YouTube video links for given video IDs."""
+    details = get_video_details(video_ids, youtube=youtube)
+
+    video_links = []
+    for video_id in video_ids:
+        if video_id not in details:
+            video_links.append(f"Error fetching details for video `{video_id}`.")
+        elif details[video_id] is None:
+            video_links.append(f"Video ID `{video_id}` not found.")
+        else:
+            video = details[video_id]
+            video_links.append(f"**[{video['title']}]({video['url']})**")
 
     return video_links
 
 # video_id = ["Iot0eF6EoNA"]
 # result = get_video_links(video_id)
-# print(result)
\ No newline at end of file
+# print(result)
@@ -0,0 +1,10 @@
+_loaded = False
+
+def load_env():
+    """Load `.env` into the environment once per process; later calls do nothing."""
+    global _loaded
+    if not _loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _loaded = True
@@ -1,26 +1,48 @@
 import os
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 log_file = 'youtrend_insights.log'
 log_dir = 'logs/api'
-log_level=logging.INFO
+log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
 
-def get_logger():
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
 
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
 
-    log_file_path = os.path.join(log_dir, log_file)
-    logger = logging.getLogger(__name__)
+class _LogFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates the log directory when the file is first opened."""
 
-    if not logger.hasHandlers():
-        logger.setLevel(log_level)
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _StartingQueueHandler(QueueHandler):
+    """Queue handler that starts the writer thread with the first record, so importing a module starts nothing."""
+
+    def enqueue(self, record):
+        if _listener is None:
+            _start_listener()
+        super().enqueue(record)
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
 
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.DEBUG) 
+        console_handler.setLevel(logging.DEBUG)
 
-        file_handler = RotatingFileHandler(log_file_path, maxBytes=5*1024*1024, backupCount=3)
+        file_handler = _LogFileHandler(
+            os.path.join(log_dir, log_file), maxBytes=5*1024*1024, backupCount=3, delay=True
+        )
         file_handler.setLevel(logging.INFO)
 
         log_format = '%(asctime)s - %(levelname)s - %(message)s'
@@ -28,7 +50,26 @@ def get_logger():
         console_handler.setFormatter(formatter)
         file_handler.setFormatter(formatter)
 
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        listener = QueueListener(_log_queue, console_handler, file_handler, respect_handler_level=True)
+        listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(listener.stop)
+        _listener = listener
+
+
+def get_logger():
+    """
+    Return the application logger.
+
+    Records are put on a queue and written to the console and the log file by
+    a background listener, so request handlers never wait on log I/O. The
+    listener thread and the log directory are only created once something is
+    logged.
+    """
+    logger = logging.getLogger(__name__)
+
+    if not logger.hasHandlers():
+        logger.setLevel(log_level)
+        logger.addHandler(_StartingQueueHandler(_log_queue))
 
-    return logger
\ No newline at end of file
+    return logger
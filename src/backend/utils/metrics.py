@@ -0,0 +1,125 @@
+import os
+import threading
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "on").lower() not in ("0", "off", "false")
+
+# Latency buckets in seconds, from cached lookups to slow LLM completions
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of `values` (0-100), or None when there are none."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else None
+
+
+class Counter:
+    """A monotonically increasing count per label set, in the Prometheus text format."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _label_text(self.labels, key), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """Observations bucketed by upper bound, with their count and sum per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        if not METRICS_ENABLED:
+            return
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[0][i] += 1
+                    break
+            counts[1] += 1
+            counts[2] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (buckets, count, total) in self._values.items():
+                cumulative = 0
+                for bound, bucket in zip(self.buckets, buckets):
+                    cumulative += bucket
+                    labels = _label_text(self.labels + ("le",), key + (repr(bound),))
+                    samples.append((f"{self.name}_bucket", labels, cumulative))
+                samples.append((f"{self.name}_bucket", _label_text(self.labels + ("le",), key + ("+Inf",)), count))
+                samples.append((f"{self.name}_count", _label_text(self.labels, key), count))
+                samples.append((f"{self.name}_sum", _label_text(self.labels, key), total))
+        return samples
+
+
+def register_collector(collect):
+    """
+    Add a callable that reports values owned elsewhere, such as cache counters.
+
+    :param collect: Returns a list of `(name, kind, documentation, samples)`
+        tuples, where `samples` is a list of `(labels_dict, value)` pairs.
+    """
+    _collectors.append(collect)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in _registry:
+        samples = metric.samples()
+        if not samples:
+            continue
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name}{labels} {value}" for name, labels, value in samples)
+    for collect in _collectors:
+        for name, kind, documentation, samples in collect():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(
+                f"{name}{_label_text(list(labels), list(labels.values()))} {value}" for labels, value in samples
+            )
+    return "\n".join(lines) + "\n"
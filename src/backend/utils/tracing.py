@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import uuid
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from src.backend.utils.metrics import Counter, Histogram
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+TRACING_ENABLED = os.getenv("TRACING", "on").lower() not in ("0", "off", "false")
+# Queries slower than this are logged; 0 turns the slow-query log off
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+# Also re-run the application's slow SELECTs under EXPLAIN ANALYZE, on a background thread
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "off").lower() in ("1", "on", "true")
+
+CHAT_REQUESTS = Counter("youtrend_chat_requests_total", "Chat requests by how they were answered.", ["path"])
+STAGE_SECONDS = Histogram("youtrend_stage_duration_seconds", "Duration of request stages.", ["stage"])
+LLM_TOKENS = Counter("youtrend_llm_tokens_total", "LLM tokens by completion stage.", ["stage", "kind"])
+SQL_ROWS = Counter("youtrend_sql_rows_total", "Rows returned by SQL queries.", ["source"])
+SLOW_QUERIES = Counter("youtrend_slow_queries_total", "Queries slower than SLOW_QUERY_MS.", ["source"])
+
+_current = contextvars.ContextVar("trace", default=None)
+_explain_executor = None
+
+
+@contextmanager
+def trace(name, **attributes):
+    """
+    Collect the spans of one request and log them as a single JSON line when it ends.
+
+    Spans opened in the block, in this task or in tasks and threads started
+    from it with a copied context, are attached to the trace. With
+    `TRACING=off` the block runs with no bookkeeping.
+
+    :param name: Request type, e.g. "chat".
+    :param attributes: Fields logged with the trace.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+    record = {"trace": name, "id": uuid.uuid4().hex[:16], **attributes, "spans": []}
+    token = _current.set(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - started) * 1000, 2)
+        try:
+            _current.reset(token)
+        except ValueError:
+            # An async generator finished in another context
+            _current.set(None)
+        logger.info(f"trace {json.dumps(record, default=str)}")
+
+
+def annotate(**attributes):
+    """Add fields to the current trace; `path` also counts the request in CHAT_REQUESTS."""
+    if "path" in attributes:
+        CHAT_REQUESTS.inc(path=attributes["path"])
+    record = _current.get()
+    if record is not None:
+        record.update(attributes)
+
+
+def record_span(name, seconds, **attributes):
+    """
+    Record a stage timed by the caller.
+
+    :param name: Stage name, e.g. "plan", "sql", "answer" or "youtube".
+    :param seconds: Duration of the stage.
+    :param attributes: Row counts, token counts, cache hits and the like.
+        `prompt_tokens` and `completion_tokens` are also counted in LLM_TOKENS.
+    """
+    STAGE_SECONDS.observe(seconds, stage=name)
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if attributes.get(kind):
+            LLM_TOKENS.inc(attributes[kind], stage=name, kind=kind.split("_")[0])
+    record = _current.get()
+    if record is not None:
+        record["spans"].append({"span": name, "ms": round(seconds * 1000, 2), **attributes})
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a stage of the current request.
+
+    Yields a dict the block can add fields to, e.g. `rows` or `cache_hit`.
+    """
+    started = time.perf_counter()
+    fields = dict(attributes)
+    try:
+        yield fields
+    finally:
+        record_span(name, time.perf_counter() - started, **fields)
+
+
+def _explain(query, params, backend, seconds):
+    from src.backend.database.backends import get_backend
+
+    # Straight to the backend, so the EXPLAIN itself is not profiled
+    rows = get_backend(backend).execute_query(f"EXPLAIN ANALYZE {query}", params)
+    plan = "\n".join(str(row[-1]) for row in rows or [])
+    logger.warning(f"EXPLAIN ANALYZE of a {seconds * 1000:.0f} ms query:\n{query}\n{plan}")
+
+
+def profile_query(query, params, seconds, rows=None, source="sql", backend=None):
+    """
+    Count a query's rows and report it if it was slow.
+
+    Queries over `SLOW_QUERY_MS` are logged with their text; with
+    `SLOW_QUERY_EXPLAIN` on, the application's own SELECTs are re-run under
+    `EXPLAIN ANALYZE` on a background thread, so the slow request isn't delayed
+    further. Generated SQL is only logged: re-running it would execute an
+    already slow query again, outside the guardrails' read-only transaction
+    and timeout.
+
+    :param query: SQL text as executed.
+    :param params: Its parameters.
+    :param seconds: Execution time.
+    :param rows: Number of rows returned, if any.
+    :param source: "app" for the application's own SQL, "llm" for generated SQL.
+    :param backend: Query backend the query ran on, for the EXPLAIN.
+    """
+    global _explain_executor
+    if rows is not None:
+        SQL_ROWS.inc(rows, source=source)
+    if not SLOW_QUERY_MS or seconds * 1000 < SLOW_QUERY_MS:
+        return
+    SLOW_QUERIES.inc(source=source)
+    logger.warning(f"Slow {source} query ({seconds * 1000:.0f} ms): {' '.join(query.split())}")
+    if SLOW_QUERY_EXPLAIN and source == "app" and query.lstrip().lower().startswith(("select", "with")):
+        if _explain_executor is None:
+            _explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+        _explain_executor.submit(_explain, query, params, backend, seconds)
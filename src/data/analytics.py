@@ -0,0 +1,359 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from src.data import dataset
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+# Columns the analytics need from the processed dataset
+ANALYTICS_COLUMNS = [
+    "video_id", "title", "channelTitle", "category_name", "thumbnail_link",
+    "trending_date", "view_count", "likes", "dislikes", "comment_count",
+]
+
+# Count columns and the names of their per-snapshot gains and per-day velocities
+METRICS = {
+    "view_count": ("views_gained", "view_velocity"),
+    "likes": ("likes_gained", "like_velocity"),
+    "comment_count": ("comments_gained", "comment_velocity"),
+}
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+def _timestamps(series):
+    """Returns a timestamp column as UTC datetime64[ns] values."""
+    return pd.to_datetime(series, utc=True).to_numpy(dtype="datetime64[ns]")
+
+def sort_snapshots(df):
+    """
+    Sorts trending snapshots by video and date, the layout every other function works on.
+
+    Videos are factorized to integer codes and ordered with one `np.lexsort`,
+    so consecutive rows of a video sit next to each other and per-video
+    differences become plain array diffs.
+
+    Args:
+        df (pd.DataFrame): Trending rows with at least `video_id` and `trending_date`.
+
+    Returns:
+        tuple[pd.DataFrame, np.ndarray]: The sorted frame with a fresh index and
+            a boolean array that is True on the first snapshot of each video.
+    """
+    codes, _ = pd.factorize(df["video_id"], sort=False)
+    dates = _timestamps(df["trending_date"])
+    order = np.lexsort((dates, codes))
+
+    sorted_df = df.iloc[order].reset_index(drop=True)
+    sorted_df["trending_date"] = pd.to_datetime(dates[order], utc=True)
+    sorted_codes = codes[order]
+
+    first = np.ones(len(sorted_df), dtype=bool)
+    first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    return sorted_df, first
+
+def video_velocity(df, presorted=None):
+    """
+    Computes view, like and comment velocity between consecutive snapshots of each video.
+
+    Gains are differences to the video's previous snapshot and velocities are
+    gains per day, with gaps shorter than a day counted as one day. The first
+    snapshot of a video has no previous one, so its gains and velocities are NaN.
+
+    Args:
+        df (pd.DataFrame): Trending rows with `video_id`, `trending_date` and the count columns.
+        presorted (np.ndarray, optional): The first-snapshot mask from `sort_snapshots`,
+            when `df` is already its sorted output.
+
+    Returns:
+        pd.DataFrame: The sorted rows with `days_since_previous` and a gain and
+            velocity column per metric in `METRICS`.
+    """
+    if presorted is None:
+        df, first = sort_snapshots(df)
+    else:
+        first = presorted
+
+    dates = _timestamps(df["trending_date"]).astype(np.int64)
+    days = np.empty(len(df))
+    days[0:1] = np.nan
+    days[1:] = (dates[1:] - dates[:-1]) / NANOSECONDS_PER_DAY
+    days[first] = np.nan
+
+    result = df.copy()
+    result["days_since_previous"] = days
+    elapsed = np.maximum(days, 1.0)
+    for column, (gained_name, velocity_name) in METRICS.items():
+        values = df[column].to_numpy(dtype=np.float64)
+        gained = np.empty(len(df))
+        gained[0:1] = np.nan
+        gained[1:] = values[1:] - values[:-1]
+        gained[first] = np.nan
+        result[gained_name] = gained
+        result[velocity_name] = gained / elapsed
+    return result
+
+def engagement_ratios(df):
+    """
+    Adds like, comment and dislike rates per view to each snapshot.
+
+    Args:
+        df (pd.DataFrame): Trending rows with the count columns.
+
+    Returns:
+        pd.DataFrame: A copy of `df` with `like_rate`, `comment_rate` and
+            `dislike_rate`; NaN where a snapshot has no views.
+    """
+    result = df.copy()
+    views = df["view_count"].to_numpy(dtype=np.float64)
+    has_views = views > 0
+    for column, name in (("likes", "like_rate"), ("comment_count", "comment_rate"), ("dislikes", "dislike_rate")):
+        if column in df.columns:
+            result[name] = np.divide(
+                df[column].to_numpy(dtype=np.float64), views, out=np.full(len(df), np.nan), where=has_views
+            )
+    return result
+
+def time_on_trending(df, presorted=None):
+    """
+    Summarizes each video's stay on the trending list.
+
+    Args:
+        df (pd.DataFrame): Trending rows with `video_id` and `trending_date`.
+        presorted (np.ndarray, optional): See `video_velocity`.
+
+    Returns:
+        pd.DataFrame: One row per video with its latest snapshot's columns plus
+            `first_trending_date`, `last_trending_date`, `days_trending` (number of
+            snapshots) and `span_days` (calendar days from first to last, inclusive).
+    """
+    if presorted is None:
+        df, first = sort_snapshots(df)
+    else:
+        first = presorted
+
+    starts = np.flatnonzero(first)
+    ends = np.append(starts[1:], len(df)) - 1 if len(starts) else starts
+    dates = _timestamps(df["trending_date"])
+
+    result = df.iloc[ends].reset_index(drop=True)
+    result["first_trending_date"] = pd.to_datetime(dates[starts], utc=True)
+    result["last_trending_date"] = pd.to_datetime(dates[ends], utc=True)
+    result["days_trending"] = ends - starts + 1
+    result["span_days"] = (dates[ends] - dates[starts]).astype("timedelta64[D]").astype(np.int64) + 1
+    return result
+
+def share_over_time(df, by, metric="view_count", freq="D", top=None):
+    """
+    Computes each group's share of a metric per period.
+
+    Counts are cumulative per video, so a video contributes its highest value
+    within each period once, rather than once per daily snapshot.
+
+    Args:
+        df (pd.DataFrame): Trending rows with `video_id`, `trending_date`, `by` and `metric`.
+        by (str): Grouping column, e.g. `category_name` or `channelTitle`.
+        metric (str): Count column to share out.
+        freq (str): Pandas period alias: "D", "W" or "M".
+        top (int, optional): Keep only the largest `top` groups of each period.
+
+    Returns:
+        pd.DataFrame: Columns `period`, `by`, `metric` and `share` (0-1), ordered by
+            period and descending share.
+    """
+    period = pd.to_datetime(df["trending_date"], utc=True).dt.tz_convert(None).dt.to_period(freq).dt.start_time
+    period_codes, periods = pd.factorize(period, sort=True)
+    group_codes, groups = pd.factorize(df[by])
+    video_codes, videos = pd.factorize(df["video_id"])
+
+    # Rows with a missing date, group or video get code -1; packed as is they
+    # would land in a neighbouring cell, so they are left out
+    valid = (period_codes >= 0) & (group_codes >= 0) & (video_codes >= 0)
+    metric_values = df[metric].to_numpy(dtype=np.float64)
+    if not valid.all():
+        period_codes, group_codes, video_codes = period_codes[valid], group_codes[valid], video_codes[valid]
+        metric_values = metric_values[valid]
+
+    # Pack (period, group, video) into one integer key: one hash groupby
+    # instead of a three-column one, then bin sums per (period, group)
+    n_groups, n_videos = len(groups), len(videos)
+    keys = (period_codes.astype(np.int64) * n_groups + group_codes) * n_videos + video_codes
+    per_video = pd.Series(metric_values).groupby(keys, sort=False).max()
+    cells = per_video.index.to_numpy() // n_videos
+    totals = np.bincount(cells, weights=per_video.to_numpy(), minlength=len(periods) * n_groups)
+
+    present = np.flatnonzero(np.bincount(cells, minlength=len(periods) * n_groups))
+    period_index, group_index = np.divmod(present, n_groups)
+    values = totals[present]
+    shares = values / np.bincount(period_index, weights=values, minlength=len(periods))[period_index]
+
+    # Order by period, then descending share, and cut to the top groups before
+    # building the frame, so the label column is only materialized for kept rows
+    order = np.lexsort((-shares, period_index))
+    if top is not None:
+        sorted_periods = period_index[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_periods, sorted_periods)
+        order = order[rank < top]
+
+    return pd.DataFrame({
+        "period": periods[period_index[order]],
+        by: np.asarray(groups)[group_index[order]],
+        metric: values[order].astype(np.int64),
+        "share": shares[order],
+    })
+
+def category_share(df, metric="view_count", freq="D"):
+    """Each category's share of `metric` per period, see `share_over_time`."""
+    return share_over_time(df, "category_name", metric, freq)
+
+def channel_share(df, metric="view_count", freq="D", top=20):
+    """The `top` channels' share of `metric` per period, see `share_over_time`."""
+    return share_over_time(df, "channelTitle", metric, freq, top)
+
+def rising_scores(df, window_days=3):
+    """
+    Scores videos on how fast they are climbing right now.
+
+    The score of a video is taken at its latest snapshot:
+    `log1p(view_velocity) * (1 + relative_growth) * (1 + like_rate)`, where
+    `relative_growth` is the last gain over the views before it. Big videos
+    score through raw velocity and small ones through relative growth.
+    Only videos seen within `window_days` of the newest snapshot count.
+
+    Args:
+        df (pd.DataFrame): Trending rows with `video_id`, `trending_date` and the count columns.
+        window_days (float): How recent a video's latest snapshot must be.
+
+    Returns:
+        pd.DataFrame: One row per recent video with its latest snapshot, velocities
+            and `rising_score`, highest score first.
+    """
+    snapshots, first = sort_snapshots(df)
+    snapshots = video_velocity(snapshots, presorted=first)
+    latest = time_on_trending(snapshots, presorted=first)
+
+    cutoff = latest["last_trending_date"].max() - pd.Timedelta(days=window_days)
+    latest = latest[latest["last_trending_date"] >= cutoff]
+
+    views = latest["view_count"].to_numpy(dtype=np.float64)
+    gained = latest["views_gained"].to_numpy()
+    velocity = np.clip(latest["view_velocity"].to_numpy(), 0, None)
+    previous = views - gained
+    relative_growth = np.divide(gained, previous, out=np.zeros(len(latest)), where=previous > 0)
+    like_rate = np.divide(
+        latest["likes"].to_numpy(dtype=np.float64), views, out=np.zeros(len(latest)), where=views > 0
+    )
+
+    latest = latest.assign(
+        relative_growth=relative_growth,
+        like_rate=like_rate,
+        rising_score=np.nan_to_num(np.log1p(velocity) * (1 + np.clip(relative_growth, 0, None)) * (1 + like_rate)),
+    )
+    return latest.sort_values("rising_score", ascending=False, kind="stable").reset_index(drop=True)
+
+# Tool functions for the chatbot. They work on the processed dataset, loaded
+# once per version of the Parquet cache, and return JSON-ready records.
+
+_cache = {}
+_cache_lock = threading.Lock()
+# Tool results derived from the whole dataset, kept per version by their arguments
+MAX_CACHED_RESULTS = 32
+
+def _load():
+    """Returns the processed dataset and its per-snapshot and per-video derivations, cached."""
+    path = dataset.ensure_processed_cache()
+    mtime = os.path.getmtime(path)
+    with _cache_lock:
+        if _cache.get("mtime") != mtime:
+            df = dataset.get_dataset(columns=ANALYTICS_COLUMNS)
+            snapshots, first = sort_snapshots(df)
+            snapshots = engagement_ratios(video_velocity(snapshots, presorted=first))
+            _cache.update(
+                mtime=mtime, snapshots=snapshots, videos=time_on_trending(snapshots, presorted=first), df=df,
+                results={},
+            )
+            logger.info(f"Analytics computed over {len(df)} snapshots.")
+        return dict(_cache)
+
+def _derived(key, compute):
+    """
+    Returns `compute(df)` over the full dataset, computed once per dataset version and `key`.
+
+    Results are dropped with the rest of the cache when the Parquet file
+    changes; beyond `MAX_CACHED_RESULTS` keys the oldest is evicted.
+    """
+    data = _load()
+    results = data["results"]
+    with _cache_lock:
+        if key in results:
+            return results[key]
+    value = compute(data["df"])
+    with _cache_lock:
+        results[key] = value
+        while len(results) > MAX_CACHED_RESULTS:
+            del results[next(iter(results))]
+    return value
+
+def _records(df, columns, limit):
+    """Converts the first `limit` rows to JSON-ready dicts."""
+    out = df[columns].head(limit).copy()
+    for column in out.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        out[column] = out[column].dt.strftime("%Y-%m-%d")
+    for column in out.select_dtypes(include=["float"]).columns:
+        out[column] = out[column].round(4)
+    return out.astype(object).where(out.notna(), None).to_dict("records")
+
+def _in_category(df, category):
+    if not category:
+        return df
+    return df[df["category_name"].astype(str).str.lower() == category.lower()]
+
+VIDEO_COLUMNS = ["video_id", "title", "thumbnail_link", "channelTitle", "category_name"]
+
+def rising_videos(limit=10, category=None, window_days=3):
+    """Videos climbing fastest right now, by `rising_scores`."""
+    scores = _derived(("rising", window_days), lambda df: rising_scores(df, window_days))
+    columns = VIDEO_COLUMNS + ["view_count", "view_velocity", "relative_growth", "rising_score"]
+    return _records(_in_category(scores, category), columns, limit)
+
+def fastest_growing_videos(limit=10, metric="views", category=None, days=7):
+    """Snapshots with the highest views, likes or comments gained per day in the last `days` days."""
+    velocity_column = {"views": "view_velocity", "likes": "like_velocity", "comments": "comment_velocity"}[metric]
+    snapshots = _in_category(_load()["snapshots"], category)
+    recent = snapshots[snapshots["trending_date"] >= snapshots["trending_date"].max() - pd.Timedelta(days=days)]
+    best = recent.nlargest(limit, velocity_column).sort_values(velocity_column, ascending=False)
+    return _records(best, VIDEO_COLUMNS + ["trending_date", velocity_column], limit)
+
+def top_engagement_videos(limit=10, category=None, min_views=10_000):
+    """Videos with the highest like rate at their latest snapshot, among those with `min_views` views."""
+    videos = _in_category(_load()["videos"], category)
+    videos = videos[videos["view_count"] >= min_views].nlargest(limit, "like_rate")
+    return _records(videos, VIDEO_COLUMNS + ["view_count", "like_rate", "comment_rate"], limit)
+
+def longest_trending_videos(limit=10, category=None):
+    """Videos with the most trending snapshots."""
+    videos = _in_category(_load()["videos"], category).nlargest(limit, "days_trending")
+    return _records(videos, VIDEO_COLUMNS + ["days_trending", "first_trending_date", "last_trending_date"], limit)
+
+def category_share_over_time(metric="view_count", freq="W", periods=4):
+    """Each category's share of `metric` over the last `periods` periods."""
+    shares = _derived(("category_share", metric, freq), lambda df: category_share(df, metric, freq))
+    recent = shares[shares["period"].isin(shares["period"].drop_duplicates().nlargest(periods))]
+    return _records(recent, ["period", "category_name", metric, "share"], len(recent))
+
+def channel_share_over_time(metric="view_count", freq="W", periods=4, top=10):
+    """The `top` channels' share of `metric` over the last `periods` periods."""
+    shares = _derived(("channel_share", metric, freq, top), lambda df: channel_share(df, metric, freq, top))
+    recent = shares[shares["period"].isin(shares["period"].drop_duplicates().nlargest(periods))]
+    return _records(recent, ["period", "channelTitle", metric, "share"], len(recent))
+
+# Functions the chatbot can call as tools, by tool name
+TOOL_FUNCTIONS = {
+    "rising_videos": rising_videos,
+    "fastest_growing_videos": fastest_growing_videos,
+    "top_engagement_videos": top_engagement_videos,
+    "longest_trending_videos": longest_trending_videos,
+    "category_share_over_time": category_share_over_time,
+    "channel_share_over_time": channel_share_over_time,
+}
@@ -1,28 +1,362 @@
 import os
+import re
+import csv
+import json
+import hashlib
+from collections import deque
+import numpy as np
 import pandas as pd
 from src.backend.utils.logger import get_logger
 
 logger = get_logger()
 
 # Dataset paths
+DATA_DIR = "src/data"
 DATASET_PATH = "src/data/IN_youtube_trending_data.csv"
 CATEGORY_PATH = "src/data/IN_category_id.json"
-PROCESSED_CSV_PATH = "src/data/processed_dataset.csv"
+PROCESSED_PATH = "src/data/processed_dataset.parquet"
+PROCESSED_META_PATH = "src/data/processed_dataset.meta.json"
 
-def get_dataset():
+# Bump when process_dataset or optimize_dtypes change the cached output
+CACHE_VERSION = 1
+
+# Working-memory budget for the streaming reader
+DEFAULT_MEMORY_MB = int(os.getenv("DATASET_MEMORY_MB", "512"))
+
+CATEGORICAL_COLUMNS = ["category_name", "channelTitle", "categoryId"]
+DATETIME_COLUMNS = ["trending_date", "publishedAt"]
+
+# Regional exports are named <REGION>_youtube_trending_data.csv and <REGION>_category_id.json
+REGION_DATASET_FILE = re.compile(r"^([A-Z]{2})_youtube_trending_data\.csv$")
+REGION_CATEGORY_FILE = "{region}_category_id.json"
+
+def discover_regions(data_dir=DATA_DIR):
+    """
+    Finds the regional dataset and category file pairs in a directory.
+
+    Args:
+        data_dir (str): Directory holding the Kaggle exports.
+
+    Returns:
+        dict[str, tuple[str, str]]: Region code mapped to its dataset CSV and
+            category JSON paths, sorted by region. Datasets without a category
+            file are left out with a warning.
+    """
+    regions = {}
+    for name in sorted(os.listdir(data_dir)):
+        match = REGION_DATASET_FILE.match(name)
+        if not match:
+            continue
+        region = match.group(1)
+        category_path = os.path.join(data_dir, REGION_CATEGORY_FILE.format(region=region))
+        if not os.path.isfile(category_path):
+            logger.warning(f"Skipping {name}: {category_path} not found.")
+            continue
+        regions[region] = (os.path.join(data_dir, name), category_path)
+    return regions
+
+def load_categories(category_path=None):
+    """
+    Loads and normalizes the category metadata JSON.
+
+    Args:
+        category_path (str, optional): Category JSON to read. Defaults to `CATEGORY_PATH`.
+
+    Returns:
+        pd.DataFrame: A DataFrame with `categoryId` (str) and `category_name` columns.
+
+    Raises:
+        FileNotFoundError: If the category metadata file is missing.
+        ValueError: If the category JSON file is invalid or lacks the expected structure.
+    """
+    category_path = category_path or CATEGORY_PATH
+    if not os.path.isfile(category_path):
+        raise FileNotFoundError(f"Category file not found: {category_path}")
+
+    category_df = pd.read_json(category_path)
+
+    # Ensure 'items' column exists
+    if "items" not in category_df.columns or category_df["items"].isnull().all():   
+        raise ValueError("Invalid category file format: Missing or incorrect 'items' key.")
+
+    # Normalize category metadata
+    category_df = pd.json_normalize(category_df["items"])
+
+    if category_df.empty:
+        raise ValueError("Category metadata is empty after normalization.")
+
+    # Rename columns for better readability
+    category_df = category_df.rename(columns={"id": "categoryId", "snippet.title": "category_name"})
+
+    # Ensure categoryId is string for correct merging
+    category_df["categoryId"] = category_df["categoryId"].astype(str)
+
+    return category_df[["categoryId", "category_name"]]
+
+def process_dataset(dataset_df, category_df):
+    """
+    Merges category names into a raw dataset frame, fills missing values and removes duplicates.
+
+    Works on the full dataset as well as on a single chunk of it.
+
+    Args:
+        dataset_df (pd.DataFrame): Raw rows read from the trending CSV.
+        category_df (pd.DataFrame): Output of `load_categories`.
+
+    Returns:
+        pd.DataFrame: The processed rows with a fresh index.
+    """
+    # Ensure categoryId is string for correct lookups
+    dataset_df["categoryId"] = dataset_df["categoryId"].astype(str)
+
+    # Add category names from a small id -> name lookup instead of a merge,
+    # which would copy the whole frame
+    category_lookup = dict(zip(category_df["categoryId"], category_df["category_name"]))
+    merged_df = dataset_df
+    merged_df["category_name"] = merged_df["categoryId"].map(category_lookup)
+
+    # Handle NaN values in category and other essential columns
+    merged_df["channelTitle"] = merged_df["channelTitle"].fillna("Unknown")
+    merged_df["description"] = merged_df["description"].fillna("") 
+
+    # Remove duplicates and reset index
+    merged_df.drop_duplicates(inplace=True)
+    merged_df.reset_index(drop=True, inplace=True)
+
+    return merged_df
+
+def read_header(dataset_path=None):
+    """Returns the column names from the first line of the raw dataset CSV (default `DATASET_PATH`)."""
+    with open(dataset_path or DATASET_PATH, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f))
+
+def plan_chunks(max_memory_mb=DEFAULT_MEMORY_MB, sample_rows=2_000, dataset_path=None):
+    """
+    Derives a chunk size and de-duplication window from a memory budget.
+
+    The bytes per row are estimated from a sample of the CSV. Half of the
+    budget goes to the chunk in flight, allowing for the parsed frame and
+    the copies made while processing it, and a quarter to the 8-byte row
+    digests kept for de-duplication across chunks.
+
+    Args:
+        max_memory_mb (int): Working-memory budget on top of the interpreter itself.
+        sample_rows (int): Number of rows read to estimate the row size.
+        dataset_path (str, optional): CSV to sample. Defaults to `DATASET_PATH`.
+
+    Returns:
+        tuple[int, int]: The chunk size and the de-duplication window, in rows.
+    """
+    sample = pd.read_csv(dataset_path or DATASET_PATH, nrows=sample_rows)
+    bytes_per_row = max(1, sample.memory_usage(deep=True).sum() / max(1, len(sample)))
+    budget = max_memory_mb * 2**20
+
+    chunksize = max(1_000, int(budget * 0.5 / (bytes_per_row * 4)))
+    dedupe_window = max(chunksize, int(budget * 0.25 / 8))
+    return chunksize, dedupe_window
+
+def iter_dataset(chunksize=100_000, start_offset=0, max_memory_mb=None, dedupe_window=None,
+                 dataset_path=None, category_path=None):
+    """
+    Streams the processed YouTube trending dataset in chunks.
+
+    The raw CSV is read `chunksize` rows at a time and each chunk goes through
+    `process_dataset`, so memory stays proportional to the chunk size rather
+    than the file size. Duplicates are also removed across chunks through a
+    rolling window of 64-bit row digests: a row is dropped if an identical
+    row appeared within the last `dedupe_window` rows kept.
+
+    Args:
+        chunksize (int): Number of raw CSV rows per chunk.
+        start_offset (int): Byte offset of a row boundary to start reading from.
+            Used to read only the rows appended since a previous load.
+        max_memory_mb (int, optional): Memory budget. When set, `chunksize`
+            and `dedupe_window` are derived from it with `plan_chunks`.
+        dedupe_window (int, optional): Number of row digests remembered across
+            chunks. Defaults to 20 chunks' worth; 0 disables cross-chunk de-duplication.
+        dataset_path (str, optional): Raw CSV to read. Defaults to `DATASET_PATH`.
+        category_path (str, optional): Its category JSON. Defaults to `CATEGORY_PATH`.
+
+    Yields:
+        tuple[int, pd.DataFrame]: The chunk index (starting at 0) and the processed chunk.
+
+    Raises:
+        FileNotFoundError: If the dataset or category metadata file is missing.
+        ValueError: If the category JSON file is invalid or lacks the expected structure.
+        pd.errors.ParserError: If there is an issue parsing the CSV dataset.
+    """
+    dataset_path = dataset_path or DATASET_PATH
+    if not os.path.isfile(dataset_path):
+        raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+
+    if max_memory_mb is not None:
+        chunksize, dedupe_window = plan_chunks(max_memory_mb, dataset_path=dataset_path)
+        logger.info(f"Streaming dataset in chunks of {chunksize} rows within {max_memory_mb} MB.")
+    if dedupe_window is None:
+        dedupe_window = chunksize * 20
+
+    category_df = load_categories(category_path)
+
+    # Sorted digest arrays of recent chunks, oldest first
+    window = deque()
+    window_rows = 0
+
+    with open(dataset_path, "rb") as f:
+        if start_offset:
+            names = read_header(dataset_path)
+            f.seek(start_offset)
+            reader = pd.read_csv(f, chunksize=chunksize, header=None, names=names)
+        else:
+            reader = pd.read_csv(f, chunksize=chunksize)
+
+        with reader:
+            for chunk_index, chunk in enumerate(reader):
+                chunk = process_dataset(chunk, category_df)
+                if not dedupe_window or chunk.empty:
+                    yield chunk_index, chunk
+                    continue
+
+                digests = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                seen = np.zeros(len(digests), dtype=bool)
+                for previous in window:
+                    if not len(previous):
+                        continue
+                    positions = np.searchsorted(previous, digests).clip(max=len(previous) - 1)
+                    seen |= previous[positions] == digests
+                if seen.any():
+                    chunk = chunk[~seen].reset_index(drop=True)
+                    digests = digests[~seen]
+
+                # A chunk made only of repeats adds nothing to remember
+                if len(digests):
+                    window.append(np.sort(digests))
+                    window_rows += len(digests)
+                while len(window) > 1 and window_rows > dedupe_window:
+                    window_rows -= len(window.popleft())
+
+                yield chunk_index, chunk
+
+def get_dataset_chunks(max_memory_mb=DEFAULT_MEMORY_MB):
+    """
+    Streaming variant of `get_dataset` that stays within a memory budget.
+
+    Yields processed DataFrame chunks that can be passed straight to
+    `store_dataframe`.
+
+    Args:
+        max_memory_mb (int): Working-memory budget, see `plan_chunks`.
+
+    Yields:
+        pd.DataFrame: Processed, de-duplicated chunks of the dataset.
+    """
+    for _, chunk in iter_dataset(max_memory_mb=max_memory_mb):
+        yield chunk
+
+def optimize_dtypes(df):
+    """
+    Converts a processed dataset to compact dtypes in place.
+
+    Low-cardinality text columns become categoricals, integer columns are
+    downcast to the smallest type that holds their values (int32 for most
+    counts) and the ISO timestamp columns are parsed to UTC datetimes.
+
+    Args:
+        df (pd.DataFrame): Output of `process_dataset`.
+
+    Returns:
+        pd.DataFrame: The same DataFrame, for chaining.
+    """
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], utc=True, errors="coerce")
+
+    for column in df.select_dtypes(include=["integer"]).columns:
+        if df[column].min() >= np.iinfo(np.int32).min and df[column].max() <= np.iinfo(np.int32).max:
+            df[column] = df[column].astype(np.int32)
+
+    return df
+
+def _file_digest(path):
+    """Returns the BLAKE2 hex digest of a file, read in 1 MiB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_signature():
+    """Returns the cheap (mtime, size) signature of the dataset and category files."""
+    return {
+        path: [os.stat(path).st_mtime_ns, os.stat(path).st_size]
+        for path in (DATASET_PATH, CATEGORY_PATH)
+    }
+
+def _cache_is_valid():
+    """
+    Checks whether the processed cache matches the current source files.
+
+    Matching mtimes and sizes are trusted as is. When only the mtime changed
+    (a file was touched or copied), the content hash decides, and the stored
+    signature is refreshed so the next check is cheap again.
+    """
+    if not (os.path.isfile(PROCESSED_PATH) and os.path.isfile(PROCESSED_META_PATH)):
+        return False
+
+    with open(PROCESSED_META_PATH) as f:
+        meta = json.load(f)
+
+    if meta.get("version") != CACHE_VERSION:
+        return False
+
+    signature = _source_signature()
+    if meta.get("signature") == signature:
+        return True
+
+    for path, (_, size) in signature.items():
+        if meta["signature"].get(path, [None, None])[1] != size or meta["hashes"].get(path) != _file_digest(path):
+            return False
+
+    meta["signature"] = signature
+    with open(PROCESSED_META_PATH, "w") as f:
+        json.dump(meta, f)
+    return True
+
+def _write_cache(df):
+    """Writes the processed dataset and its source signature next to the raw files."""
+    df.to_parquet(PROCESSED_PATH, index=False)
+    meta = {
+        "version": CACHE_VERSION,
+        "signature": _source_signature(),
+        "hashes": {path: _file_digest(path) for path in (DATASET_PATH, CATEGORY_PATH)},
+    }
+    with open(PROCESSED_META_PATH, "w") as f:
+        json.dump(meta, f)
+    logger.info(f"Processed dataset cached at {PROCESSED_PATH}.")
+
+def get_dataset(columns=None, use_cache=True):
     """
     Loads, processes, and merges the YouTube trending dataset with category metadata.
 
     This function performs the following steps:
 
-    1. Checks if a previously processed dataset exists and loads it if available.
+    1. Returns the processed Parquet cache if it matches the current source files.
     2. Validates the existence of the raw dataset CSV and category JSON files.
     3. Loads the dataset from a CSV file and verifies it is not empty.
     4. Loads and normalizes category metadata from a JSON file.
     5. Merges category names into the main dataset based on categoryId.
     6. Handles missing values (NaNs) appropriately.
     7. Cleans the data by removing duplicates and resetting the index.
-    8. Saves the processed dataset as a CSV file for future use.
+    8. Converts columns to compact dtypes and saves the result as the Parquet cache.
+
+    Args:
+        columns (list[str], optional): Only load these columns. The cache is
+            columnar, so unused columns are never read from disk.
+        use_cache (bool): Read and write the processed Parquet cache. When False,
+            the raw CSV is processed every time; the dtypes are the same either way.
 
     Returns:
         pd.DataFrame: A processed DataFrame containing the YouTube trending dataset 
@@ -40,54 +374,32 @@ def get_dataset():
         if not os.path.isfile(DATASET_PATH):
             raise FileNotFoundError(f"Dataset file not found: {DATASET_PATH}")
 
-        if not os.path.isfile(CATEGORY_PATH):
-            raise FileNotFoundError(f"Category file not found: {CATEGORY_PATH}")
+        if use_cache:
+            try:
+                if _cache_is_valid():
+                    return pd.read_parquet(PROCESSED_PATH, columns=columns)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable dataset cache: {e}")
 
         # Load dataset
         dataset_df = pd.read_csv(DATASET_PATH)
         if dataset_df.empty:
             raise pd.errors.EmptyDataError("Dataset file is empty.")
 
-        # Log missing values before processing
-        # missing_values = dataset_df.isnull().sum()
-        # logger.info(f"Missing values in dataset before processing:\n{missing_values[missing_values > 0]}")
-
         # Load and validate category metadata
-        category_df = pd.read_json(CATEGORY_PATH)
-
-        # Ensure 'items' column exists
-        if "items" not in category_df.columns or category_df["items"].isnull().all():   
-            raise ValueError("Invalid category file format: Missing or incorrect 'items' key.")
+        category_df = load_categories()
 
-        # Normalize category metadata
-        category_df = pd.json_normalize(category_df["items"])
+        processed_df = process_dataset(dataset_df, category_df)
+        del dataset_df
+        optimize_dtypes(processed_df)
 
-        if category_df.empty:
-            raise ValueError("Category metadata is empty after normalization.")
+        if use_cache:
+            try:
+                _write_cache(processed_df)
+            except Exception as e:
+                logger.warning(f"Failed to write dataset cache: {e}")
 
-        # Rename columns for better readability
-        category_df = category_df.rename(columns={"id": "categoryId", "snippet.title": "category_name"})
-
-        # Ensure categoryId is string for correct merging
-        dataset_df["categoryId"] = dataset_df["categoryId"].astype(str)
-        category_df["categoryId"] = category_df["categoryId"].astype(str)
-
-        # Merge dataset with category names
-        merged_df = dataset_df.merge(category_df[["categoryId", "category_name"]], on="categoryId", how="left")
-
-        # Handle NaN values in category and other essential columns
-        merged_df["channelTitle"] = merged_df["channelTitle"].fillna("Unknown")
-        merged_df["description"] = merged_df["description"].fillna("") 
-
-        # # Log missing values after processing
-        # missing_values_after = merged_df.isnull().sum()
-        # logger.info(f"Missing values after merging:\n{missing_values_after[missing_values_after > 0]}")
-
-        # Remove duplicates, reset index, and save processed dataset
-        merged_df.drop_duplicates(inplace=True)
-        merged_df.reset_index(drop=True, inplace=True)
-
-        return merged_df
+        return processed_df[columns] if columns else processed_df
 
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
@@ -102,6 +414,23 @@ def get_dataset():
 
     return None
 
+def ensure_processed_cache():
+    """
+    Builds the processed Parquet cache if it is missing or stale.
+
+    Returns:
+        str: Path of the up-to-date Parquet file, for readers that query it directly.
+
+    Raises:
+        FileNotFoundError: If the cache could not be built from the raw files.
+    """
+    if not _cache_is_valid():
+        get_dataset(columns=["video_id"])
+        # A failed write leaves the old file and meta behind, which must not pass for fresh
+        if not _cache_is_valid():
+            raise FileNotFoundError(f"Processed dataset could not be built: {PROCESSED_PATH}")
+    return PROCESSED_PATH
+
 # # Run the function
 # df = get_dataset()
 # print(df.head()['trending_date'])
\ No newline at end of file
@@ -0,0 +1,366 @@
+import os
+import re
+import json
+import zlib
+import argparse
+import threading
+from contextlib import contextmanager
+import numpy as np
+from src.data import dataset
+from src.backend.utils.logger import get_logger
+
+logger = get_logger()
+
+# On-disk layout of the index, all under EMBEDDINGS_DIR:
+#   vectors.f32      row-major float32 matrix, one L2-normalised row per video, append-only
+#   ids.txt          video_id of each row, one per line, append-only
+#   lists.i32        IVF list of each row, append-only between retrainings
+#   centroids.f32    IVF centroids, rewritten when the lists are retrained
+#   meta.json        committed row count and index parameters, written last
+#   .lock            held by the process updating the index
+EMBEDDINGS_DIR = os.getenv("EMBEDDINGS_DIR", "src/data/embeddings")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+BATCH_SIZE = 4096
+EMBEDDING_COLUMNS = ["video_id", "title", "description"]
+
+# Bump when the features change; older indexes are rebuilt
+EMBEDDING_VERSION = 1
+
+# Title features count twice; only the start of a description is encoded, the
+# rest is mostly links and social handles
+TITLE_WEIGHT = 2.0
+DESCRIPTION_CHARS = 400
+
+# IVF parameters: below EXACT_SEARCH_ROWS every row is scored
+EXACT_SEARCH_ROWS = 5_000
+N_PROBE = int(os.getenv("EMBEDDING_NPROBE", "16"))
+TRAIN_SAMPLE = 20_000
+KMEANS_ITERATIONS = 10
+# Retrain the lists once the index has grown this much since the last training
+RETRAIN_GROWTH = 2.0
+
+_URL = re.compile(r"https?://\S+|www\.\S+|[\w.-]+@[\w.-]+")
+_WORD = re.compile(r"[^\W\d_]{2,}")
+STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our so that the this to was we
+    were will with you your me my i us all but not no do did can just get more new
+    ka ki ke ko hai se aur bhi ye yeh wo hi na ho tha thi
+""".split())
+
+def _path(name):
+    return os.path.join(EMBEDDINGS_DIR, name)
+
+def _features(text, weight, char_grams):
+    """Returns the hashed features of one text field as (token, weight) pairs."""
+    words = [w for w in _WORD.findall(_URL.sub(" ", text.lower())) if w not in STOPWORDS]
+    features = [(w, weight) for w in words]
+    features += [(f"{a} {b}", weight) for a, b in zip(words, words[1:])]
+    if char_grams:
+        # Character trigrams match plurals and inflections of title words
+        for w in words:
+            padded = f"#{w}#"
+            features += [(padded[i:i + 3], weight * 0.25) for i in range(len(padded) - 2)]
+    return features
+
+def encode(titles, descriptions=None, dim=EMBEDDING_DIM):
+    """
+    Embeds texts into L2-normalised float32 vectors with signed feature hashing.
+
+    Words, word bigrams and title character trigrams are hashed with CRC32 into
+    `dim` buckets, with the hash's top bit as the sign, so the encoder needs no
+    vocabulary or model files and embeds any batch independently. Counts are
+    damped with log1p so repeated words don't dominate.
+
+    Args:
+        titles (list[str]): Video titles, or free-text queries.
+        descriptions (list[str], optional): Descriptions, aligned with `titles`.
+        dim (int): Number of dimensions.
+
+    Returns:
+        np.ndarray: Array of shape (len(titles), dim).
+    """
+    rows, buckets, weights = [], [], []
+    for row, title in enumerate(titles):
+        features = _features(title or "", TITLE_WEIGHT, char_grams=True)
+        if descriptions is not None and descriptions[row]:
+            features += _features(descriptions[row][:DESCRIPTION_CHARS], 1.0, char_grams=False)
+        for token, weight in features:
+            rows.append(row)
+            buckets.append(zlib.crc32(token.encode()))
+            weights.append(weight)
+
+    hashes = np.array(buckets, dtype=np.uint32)
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    flat = np.array(rows, dtype=np.int64) * dim + (hashes & 0x7FFFFFFF) % dim
+    counts = np.bincount(flat, weights=signs * np.array(weights), minlength=len(titles) * dim)
+    vectors = (np.sign(counts) * np.log1p(np.abs(counts))).reshape(len(titles), dim).astype(np.float32)
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def _train_centroids(vectors, n_lists, seed=0):
+    """Spherical k-means on a sample of the rows."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[np.sort(rng.choice(len(vectors), min(len(vectors), TRAIN_SAMPLE), replace=False))]
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Empty lists restart from random rows
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+def _assign(vectors, centroids):
+    """Returns the nearest list of each row, in batches to bound memory."""
+    return np.concatenate([
+        np.argmax(vectors[i:i + BATCH_SIZE] @ centroids.T, axis=1).astype(np.int32)
+        for i in range(0, len(vectors), BATCH_SIZE)
+    ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+@contextmanager
+def _write_lock():
+    """Holds an exclusive lock on the index directory, so one process at a time updates it."""
+    os.makedirs(EMBEDDINGS_DIR, exist_ok=True)
+    with open(_path(".lock"), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _replace_file(name, data):
+    """Writes a whole file next to its destination and swaps it in, so readers never see it half-written."""
+    temporary = _path(f"{name}.tmp")
+    if isinstance(data, np.ndarray):
+        data.tofile(temporary)
+    else:
+        with open(temporary, "w") as f:
+            f.writelines(data)
+    os.replace(temporary, _path(name))
+
+def _read_meta():
+    try:
+        with open(_path("meta.json")) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if meta.get("version") != EMBEDDING_VERSION or meta.get("dim") != EMBEDDING_DIM:
+        return None
+    return meta
+
+def _write_meta(meta):
+    # Replaced atomically, so readers see either the old or the new row count
+    _replace_file("meta.json", [json.dumps(meta)])
+
+def _truncate(meta):
+    """Drops rows appended after the last committed meta.json, e.g. by an interrupted update."""
+    count = meta["count"] if meta else 0
+    for name, row_bytes in (("vectors.f32", EMBEDDING_DIM * 4), ("lists.i32", 4)):
+        if os.path.exists(_path(name)):
+            with open(_path(name), "r+b") as f:
+                f.truncate(count * row_bytes)
+    ids = _read_ids(count)
+    _replace_file("ids.txt", (f"{video_id}\n" for video_id in ids))
+    return ids
+
+def _read_ids(count):
+    try:
+        with open(_path("ids.txt")) as f:
+            return [line.rstrip("\n") for line, _ in zip(f, range(count))]
+    except FileNotFoundError:
+        return []
+
+def update_embeddings(df):
+    """
+    Adds embeddings for the videos in `df` that are not in the index yet.
+
+    Only unseen `video_id`s are encoded, in batches of `BATCH_SIZE`; existing
+    rows are never rewritten. New rows are appended to the vector, id and list
+    files and become visible when meta.json is replaced at the end. The IVF
+    centroids are retrained over all rows once the index has doubled since the
+    last training; otherwise new rows join their nearest existing list.
+    Updates hold a file lock, so concurrent loaders take turns, and rewritten
+    files are swapped in with `os.replace`.
+
+    Args:
+        df (pd.DataFrame): Rows with `video_id`, `title` and `description`;
+            a video's latest title and description win.
+
+    Returns:
+        int: Number of videos added.
+    """
+    with _write_lock():
+        return _update_embeddings(df)
+
+def _update_embeddings(df):
+    meta = _read_meta()
+    if meta is None:
+        for name in ("vectors.f32", "ids.txt", "lists.i32", "centroids.f32"):
+            if os.path.exists(_path(name)):
+                os.remove(_path(name))
+    known = set(_truncate(meta))
+
+    videos = df[EMBEDDING_COLUMNS].drop_duplicates("video_id", keep="last")
+    videos = videos[~videos["video_id"].astype(str).isin(known)]
+    if videos.empty and meta is not None:
+        return 0
+
+    count = meta["count"] if meta else 0
+    centroids = np.fromfile(_path("centroids.f32"), dtype=np.float32).reshape(-1, EMBEDDING_DIM) \
+        if meta and meta["n_lists"] else None
+
+    ids = videos["video_id"].astype(str).tolist()
+    titles = videos["title"].fillna("").astype(str).tolist()
+    descriptions = videos["description"].fillna("").astype(str).tolist()
+    with open(_path("vectors.f32"), "ab") as vector_file, open(_path("lists.i32"), "ab") as list_file:
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = encode(titles[start:start + BATCH_SIZE], descriptions[start:start + BATCH_SIZE])
+            vector_file.write(batch.tobytes())
+            lists = _assign(batch, centroids) if centroids is not None else np.zeros(len(batch), dtype=np.int32)
+            list_file.write(lists.tobytes())
+    with open(_path("ids.txt"), "a") as f:
+        f.writelines(f"{video_id}\n" for video_id in ids)
+
+    total = count + len(ids)
+    trained_on = meta["trained_on"] if meta else 0
+    n_lists = meta["n_lists"] if meta else 0
+    if total >= EXACT_SEARCH_ROWS and total >= trained_on * RETRAIN_GROWTH:
+        vectors = np.memmap(_path("vectors.f32"), dtype=np.float32, mode="r", shape=(total, EMBEDDING_DIM))
+        n_lists = int(min(max(np.sqrt(total), 16), 4096))
+        centroids = _train_centroids(vectors, n_lists)
+        _replace_file("centroids.f32", centroids)
+        _replace_file("lists.i32", _assign(vectors, centroids))
+        trained_on = total
+        logger.info(f"Embedding index retrained: {n_lists} lists over {total} videos.")
+
+    _write_meta({
+        "version": EMBEDDING_VERSION, "dim": EMBEDDING_DIM, "count": total,
+        "n_lists": n_lists, "trained_on": trained_on,
+    })
+    logger.info(f"Embedded {len(ids)} new videos; the index holds {total}.")
+    return len(ids)
+
+def build_embeddings(rebuild=False):
+    """
+    Brings the index up to date with the processed dataset.
+
+    Args:
+        rebuild (bool): Drop the existing index and encode every video again.
+
+    Returns:
+        int: Number of videos added.
+    """
+    df = dataset.get_dataset(columns=EMBEDDING_COLUMNS)
+    if df is None:
+        raise FileNotFoundError("The processed dataset is not available.")
+    with _write_lock():
+        if rebuild and os.path.exists(_path("meta.json")):
+            os.remove(_path("meta.json"))
+        return _update_embeddings(df)
+
+# Readers map the files lazily and share their pages across worker processes
+
+_index = {}
+_index_lock = threading.Lock()
+
+def _load():
+    """
+    Returns the memory-mapped index, reopened when an update commits new rows.
+
+    The index is never built here, on a request: `build_embeddings` (or
+    `python -m src.data.embeddings`) does that offline.
+
+    Raises:
+        FileNotFoundError: If no index has been built yet.
+    """
+    try:
+        mtime = os.path.getmtime(_path("meta.json"))
+    except FileNotFoundError:
+        mtime = None
+    with _index_lock:
+        if mtime is None or _index.get("mtime") != mtime:
+            meta = _read_meta()
+            if meta is None:
+                raise FileNotFoundError(
+                    f"No embedding index in '{EMBEDDINGS_DIR}'; build it with `python -m src.data.embeddings`."
+                )
+            count = meta["count"]
+            vectors = np.memmap(_path("vectors.f32"), dtype=np.float32, mode="r", shape=(count, EMBEDDING_DIM)) \
+                if count else np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+            index = {"mtime": mtime, "vectors": vectors, "ids": np.array(_read_ids(count)), "centroids": None}
+            if meta["n_lists"]:
+                lists = np.fromfile(_path("lists.i32"), dtype=np.int32, count=count)
+                index["centroids"] = np.fromfile(_path("centroids.f32"), dtype=np.float32).reshape(-1, EMBEDDING_DIM)
+                # Rows of each list, contiguous: list l owns rows[offsets[l]:offsets[l + 1]]
+                index["rows"] = np.argsort(lists, kind="stable").astype(np.int32)
+                index["offsets"] = np.searchsorted(lists[index["rows"]], np.arange(meta["n_lists"] + 1))
+            _index.clear()
+            _index.update(index)
+            logger.info(f"Embedding index mapped: {count} videos.")
+        return dict(_index)
+
+def nearest(queries, k=10, n_probe=N_PROBE):
+    """
+    Finds the videos closest to each query by cosine similarity.
+
+    All queries are encoded and scored together. Small indexes are searched
+    exhaustively; larger ones only score the rows of the `n_probe` IVF lists
+    whose centroids are nearest to each query.
+
+    Args:
+        queries (list[str]): Free-text queries.
+        k (int): Neighbours per query.
+        n_probe (int): IVF lists searched per query.
+
+    Returns:
+        list[list[tuple[str, float]]]: For each query, (video_id, similarity)
+            pairs, most similar first.
+
+    Raises:
+        FileNotFoundError: If no index has been built yet.
+    """
+    index = _load()
+    vectors, ids = index["vectors"], index["ids"]
+    encoded = encode(queries)
+    if index["centroids"] is None:
+        scores = encoded @ vectors.T if len(ids) else np.empty((len(queries), 0), dtype=np.float32)
+        candidates = [None] * len(queries)
+    else:
+        rows, offsets = index["rows"], index["offsets"]
+        centroid_scores = encoded @ index["centroids"].T
+        # Never spend a probe on an empty list
+        centroid_scores[:, np.diff(offsets) == 0] = -np.inf
+        probes = np.argsort(-centroid_scores, axis=1)[:, :n_probe]
+        candidates = [
+            np.sort(np.concatenate([rows[offsets[p]:offsets[p + 1]] for p in probe])) for probe in probes
+        ]
+        scores = [vectors[c] @ q for c, q in zip(candidates, encoded)]
+
+    results = []
+    for query_scores, rows in zip(scores, candidates):
+        top = np.argsort(-query_scores, kind="stable")[:k]
+        top = top[query_scores[top] > 0]
+        video_rows = rows[top] if rows is not None else top
+        results.append([(str(ids[r]), float(s)) for r, s in zip(video_rows, query_scores[top])])
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed new videos of the processed dataset.")
+    parser.add_argument("--rebuild", action="store_true", help="Re-encode every video.")
+    args = parser.parse_args()
+    added = build_embeddings(rebuild=args.rebuild)
+    print(f"{added} videos embedded.")
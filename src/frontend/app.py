@@ -1 +1,11 @@
-import streamlit as st
\ No newline at end of file
+"""
+Streamlit entry point; run from the repository root with the API up:
+
+    API_URL=http://localhost:8000 python -m streamlit run src/frontend/app.py
+"""
+import streamlit as st
+
+st.set_page_config(page_title="YouTube Trend Insights", page_icon=":material/trending_up:")
+
+page = st.navigation([st.Page("pages/chatbot.py", title="Chatbot", icon=":material/chat:", default=True)])
+page.run()
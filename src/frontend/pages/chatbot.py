@@ -1,41 +1,99 @@
+import time
+import uuid
 import streamlit as st
+from src.frontend.services import api_client
 
-def get_chat_history(conversation):
+WELCOME_MESSAGE = "Hello Buddy! How can I help you?"
+# Answers are reused for a repeated question within a browser session for this long
+ANSWER_TTL_SECONDS = 3600
+MAX_CACHED_ANSWERS = 1000
+
+class UncachedAnswer(Exception):
+    """An answer that is shown but not reused: an error message, or a stream without its end."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.text = text
+
+@st.cache_data(ttl=ANSWER_TTL_SECONDS, max_entries=MAX_CACHED_ANSWERS, show_spinner=False)
+def stream_answer(session_id, prompt_key, _prompt, _stats):
+    """
+    Stream the backend's answer into the current container and return its text.
+
+    The cache is keyed on the session and the normalized question only, so
+    asking the same thing again in a session replays the answer without calling
+    the API; `_stats` is filled with timings only when the API is called.
+    Streamlit does not cache a call that raises, so an error answer, or one
+    whose stream ended before the `done` event, is raised as `UncachedAnswer`
+    and the question is sent to the API again next time.
+    """
+    text = st.write_stream(api_client.stream_chat(_prompt, _stats))
+    if _stats.get("error") or "server_latency_ms" not in _stats:
+        raise UncachedAnswer(text)
+    return text
+
+def normalize(prompt):
+    return " ".join(prompt.lower().split())
+
+def get_chat_history():
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
-    st.session_state.chat_history.append(conversation)  
+        st.session_state.session_id = uuid.uuid4().hex
+        st.session_state.chat_history = [{"role": "ai", "content": WELCOME_MESSAGE}]
     return st.session_state.chat_history
 
+def render_message(message):
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+        if message.get("caption"):
+            st.caption(message["caption"])
+
+def answer(prompt):
+    """Show the question, stream the answer below it and add both to the history."""
+    history = get_chat_history()
+    question = {"role": "user", "content": prompt}
+    history.append(question)
+    render_message(question)
+
+    with st.chat_message("ai"):
+        stats = {}
+        started = time.perf_counter()
+        try:
+            text = stream_answer(st.session_state.session_id, normalize(prompt), prompt, stats)
+        except UncachedAnswer as e:
+            text = e.text
+        except api_client.APIError:
+            st.error("Sorry, I couldn't reach the YouTube Trend Insights service. Please try again.")
+            return
+        if "time_to_first_token_ms" in stats:
+            caption = (f"first token {stats['time_to_first_token_ms']:.0f} ms · "
+                       f"answered in {stats['latency_ms'] / 1000:.1f} s")
+        else:
+            caption = f"from this session's answers in {(time.perf_counter() - started) * 1000:.0f} ms"
+        st.caption(caption)
+    history.append({"role": "ai", "content": text, "caption": caption})
+
 def render_chat_bot():
     """
-        A simple chatbot interface using Streamlit that responds to user queries about YouTube trends.
+        A chatbot interface using Streamlit that answers questions about YouTube trends.
 
         Features:
-        - Displays a welcome message to new users.
-        - Captures and displays user input in a chat format.
+        - Streams each answer from the backend token by token as it is generated.
+        - Reuses the answer to a question already asked in the session.
+        - Draws each earlier message once per rerun and appends new ones, without a second rerun.
         - Provides an option to clear the chat session.
 
         Usage:
         Call this function within a Streamlit app to render a chatbot interface.
     """
-    # Display welcome message only once per session
-    if "welcome_message" not in st.session_state:
-        with st.chat_message("ai"):
-            st.write('Hello Buddy! How can I help you?')
-        st.session_state.welcome_message = True
+    # Clear before drawing, so the cleared history is not shown for one more run
+    if st.bottom.button("Clear Chat"):
+        st.session_state.clear()
+
+    for message in get_chat_history():
+        render_message(message)
 
-    # Capture user input
     user_query = st.chat_input("Ask me about YouTube trends")
     if user_query:
-        with st.chat_message("user"):
-            input = {"role":"user","content":f"{user_query}"}
-            chat = get_chat_history(input)
-            for message in chat:
-                st.write(message['content'])
-            
-    # Button to clear chat
-    if st._bottom.button("Clear Chat"):
-        st.session_state.clear()
+        answer(user_query)
 
-        
-render_chat_bot()
\ No newline at end of file
+render_chat_bot()
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.frontend.utils.logger import get_logger
+
+logger = get_logger()
+
+API_URL = os.getenv("API_URL", "http://localhost:8000").rstrip("/")
+# Seconds to connect, and to wait between bytes of a response (an answer can take a while to start)
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "120"))
+# Keep-alive connections shared by all browser sessions of this Streamlit process
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+
+session = None
+_session_lock = threading.Lock()
+
+
+class APIError(Exception):
+    """The backend could not be reached or returned an error."""
+
+
+def get_session():
+    """
+    Return the process-wide HTTP session, creating it on first use.
+
+    The session keeps up to `POOL_SIZE` connections to the API alive, so each
+    question reuses an open TCP connection instead of paying a new handshake.
+    Idempotent requests are retried on connection errors; chat requests are not,
+    since the backend may already be answering.
+    """
+    global session
+    with _session_lock:
+        if session is None:
+            retry = Retry(total=2, connect=2, read=0, backoff_factor=0.2, allowed_methods={"GET"})
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+
+def ask(prompt):
+    """
+    Ask the backend a question and wait for the whole answer.
+
+    :param prompt: The user's question.
+    :return: Dict with `message` and the server-side `latency_ms`.
+    :raises APIError: When the request fails.
+    """
+    try:
+        response = get_session().post(
+            f"{API_URL}/chat", json={"prompt": prompt}, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        logger.error(f"Chat request failed: {e}")
+        raise APIError(str(e)) from e
+
+
+def stream_chat(prompt, stats=None):
+    """
+    Ask the backend a question and yield the answer as it is produced.
+
+    Reads the Server-Sent Events of `/chat/stream` over a pooled connection.
+
+    :param prompt: The user's question.
+    :param stats: Optional dict filled in as the stream runs with
+        `time_to_first_token_ms` (as seen by this client), `latency_ms`, the
+        server's own `server_time_to_first_token_ms` and `server_latency_ms`,
+        and `error`, true when the server answered with an error message.
+    :return: Iterator of answer text fragments.
+    :raises APIError: When the request fails or the stream breaks off.
+    """
+    stats = stats if stats is not None else {}
+    started = time.perf_counter()
+    try:
+        with get_session().post(
+            f"{API_URL}/chat/stream", json={"prompt": prompt}, stream=True, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        ) as response:
+            response.raise_for_status()
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                    if event == "token":
+                        if "time_to_first_token_ms" not in stats:
+                            stats["time_to_first_token_ms"] = (time.perf_counter() - started) * 1000
+                        yield data
+                    elif event == "done":
+                        stats["server_time_to_first_token_ms"] = data.get("time_to_first_token_ms")
+                        stats["server_latency_ms"] = data.get("latency_ms")
+                        stats["error"] = data.get("error", False)
+    except requests.RequestException as e:
+        logger.error(f"Streaming chat request failed: {e}")
+        raise APIError(str(e)) from e
+    finally:
+        stats["latency_ms"] = (time.perf_counter() - started) * 1000
+
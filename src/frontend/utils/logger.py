@@ -6,10 +6,16 @@ log_file = 'youtrend_insights.log'
 log_dir = 'logs/app'
 log_level=logging.INFO
 
-def get_logger():
 
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+class _LogFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates the log directory when the file is first opened."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def get_logger():
 
     log_file_path = os.path.join(log_dir, log_file)
     logger = logging.getLogger(__name__)
@@ -20,7 +26,7 @@ def get_logger():
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG) 
 
-        file_handler = RotatingFileHandler(log_file_path, maxBytes=5*1024*1024, backupCount=3)
+        file_handler = _LogFileHandler(log_file_path, maxBytes=5*1024*1024, backupCount=3, delay=True)
         file_handler.setLevel(logging.INFO)
 
         log_format = '%(asctime)s - %(levelname)s - %(message)s'
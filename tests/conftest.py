@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+from benchmarks.stubs import llm_stub
+from benchmarks.synthetic import write_raw_dataset
+from src.backend.database import duckdb_backend
+from src.backend.models import llm_model, prompt, router
+from src.backend.services.response_cache import ResponseCache
+from src.data import dataset
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Point the LLM clients at a local stub; the test configures its tool calls."""
+    server, config = llm_stub.serve(latency=0, token_interval=0, tokens=3)
+    monkeypatch.setenv("groq_api_key", "test")
+    monkeypatch.setattr(llm_model, "GROQ_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(llm_model, "client", None)
+    monkeypatch.setattr(llm_model, "async_client", None)
+    monkeypatch.setattr(llm_model, "response_cache", ResponseCache())
+    monkeypatch.setattr(prompt, "schema_section", lambda: "youtube_trending_data: video_id TEXT")
+    monkeypatch.setattr(router, "route", lambda user_prompt: None)
+    # Record the tool results sent back to the model
+    config.tool_results = []
+    compact_result = llm_model.compact_result
+
+    def record_result(result, budget):
+        config.tool_results.append(result)
+        return compact_result(result, budget)
+
+    monkeypatch.setattr(llm_model, "compact_result", record_result)
+    yield config
+    server.shutdown()
+
+
+@pytest.fixture
+def duckdb_dataset(tmp_path, monkeypatch):
+    """DuckDB backend over a small synthetic dataset, with no database loaded yet."""
+    csv_path, category_path = write_raw_dataset(str(tmp_path), 200)
+    monkeypatch.setattr(dataset, "DATASET_PATH", csv_path)
+    monkeypatch.setattr(dataset, "CATEGORY_PATH", category_path)
+    monkeypatch.setattr(dataset, "PROCESSED_PATH", str(tmp_path / "processed.parquet"))
+    monkeypatch.setattr(dataset, "PROCESSED_META_PATH", str(tmp_path / "processed.meta.json"))
+    monkeypatch.setattr(duckdb_backend, "database", None)
+    monkeypatch.setattr(duckdb_backend, "_database_mtime", None)
+    monkeypatch.setattr(duckdb_backend, "_database_checked_at", 0.0)
+    monkeypatch.setattr(duckdb_backend, "_local", threading.local())
+    return tmp_path
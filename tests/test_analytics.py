@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+from src.data.analytics import share_over_time
+
+
+def test_share_over_time_leaves_out_rows_without_a_group():
+    df = pd.DataFrame({
+        "video_id": ["a", "b", "c", "d"],
+        "trending_date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"],
+        "category_name": [np.nan, "Gaming", "Gaming", np.nan],
+        "view_count": [100, 10, 20, 500],
+    })
+
+    shares = share_over_time(df, "category_name")
+
+    assert list(shares["category_name"]) == ["Gaming", "Gaming"]
+    assert list(shares["view_count"]) == [10, 20]
+    assert list(shares["share"]) == [1.0, 1.0]
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from benchmarks import harness, synthetic
+from src.data import dataset
+
+
+def test_synthetic_frames_are_reproducible():
+    pd.testing.assert_frame_equal(synthetic.make_frame(500, seed=3), synthetic.make_frame(500, seed=3))
+    assert not synthetic.make_frame(500, seed=3).equals(synthetic.make_frame(500, seed=4))
+
+
+def test_synthetic_chunks_continue_the_trending_days():
+    frames = list(synthetic.iter_frames(1000, chunksize=300))
+    assert [len(frame) for frame in frames] == [300, 300, 300, 100]
+    days = pd.concat(frames)["trending_date"]
+    # 200 snapshots per trending day, across chunk boundaries
+    assert days.value_counts().tolist() == [200] * 5
+    assert days.is_monotonic_increasing
+
+
+def test_synthetic_raw_dataset_processes_like_the_real_one(tmp_path, monkeypatch):
+    csv_path, category_path = synthetic.write_raw_dataset(str(tmp_path), 400, chunksize=150)
+    monkeypatch.setattr(dataset, "DATASET_PATH", csv_path)
+    monkeypatch.setattr(dataset, "CATEGORY_PATH", category_path)
+    monkeypatch.setattr(dataset, "PROCESSED_PATH", str(tmp_path / "processed.parquet"))
+    monkeypatch.setattr(dataset, "PROCESSED_META_PATH", str(tmp_path / "processed.meta.json"))
+
+    processed = dataset.get_dataset()
+    assert set(synthetic.make_frame(10).columns) <= set(processed.columns)
+    assert processed["category_name"].notna().all()
+
+
+def test_measure_times_each_call_without_its_setup():
+    calls, setups = [], []
+    result = harness.measure(lambda: calls.append(1), iterations=4, items=10, warmup=2, setup=lambda: setups.append(1))
+    assert len(calls) == 6 and len(setups) == 6
+    assert result["iterations"] == 4 and result["concurrency"] == 1
+    assert result["items_per_s"] == pytest.approx(result["ops_per_s"] * 10, rel=1e-3)
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_measure_spreads_calls_over_threads():
+    calls = []
+    result = harness.measure(lambda: calls.append(1), iterations=20, concurrency=4, warmup=0)
+    assert len(calls) == 20 and result["concurrency"] == 4
+
+
+def test_run_metadata_records_the_commit():
+    metadata = harness.run_metadata()
+    assert len(metadata["commit"]) == 40
+    assert metadata["cpu_count"] >= 1
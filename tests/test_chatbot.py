@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+from src.frontend.services import api_client
+
+ERROR_ANSWER = "An error occurred while processing your request."
+CHATBOT_PAGE = str(Path(__file__).parents[1] / "src" / "frontend" / "pages" / "chatbot.py")
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Stand-in for the streaming API: answers in order from `answers`, counting the calls."""
+    calls = []
+    answers = []
+
+    def stream_chat(prompt, stats=None):
+        calls.append(prompt)
+        text, error = answers.pop(0)
+        stats["time_to_first_token_ms"] = stats["latency_ms"] = 1.0
+        yield text
+        stats.update(server_time_to_first_token_ms=1.0, server_latency_ms=1.0, error=error)
+
+    monkeypatch.setattr(api_client, "stream_chat", stream_chat)
+    return calls, answers
+
+
+def ask(app, prompt):
+    app.chat_input[0].set_value(prompt).run()
+    return app.chat_message[-1].markdown[0].value
+
+
+def test_only_successful_answers_are_replayed(backend):
+    calls, answers = backend
+    answers += [(ERROR_ANSWER, True), ("Five videos.", False)]
+    app = AppTest.from_file(CHATBOT_PAGE).run()
+
+    assert ask(app, "top videos") == ERROR_ANSWER
+    assert ask(app, "top videos") == "Five videos."
+    assert ask(app, "Top  videos") == "Five videos."
+    assert calls == ["top videos", "top videos"]
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pytest
+from benchmarks.synthetic import write_raw_dataset
+from src.data import dataset
+from src.data.dataset import iter_dataset
+
+
+@pytest.fixture
+def raw_dataset(tmp_path, monkeypatch):
+    csv_path, category_path = write_raw_dataset(str(tmp_path), 50)
+    monkeypatch.setattr(dataset, "DATASET_PATH", csv_path)
+    monkeypatch.setattr(dataset, "CATEGORY_PATH", category_path)
+    monkeypatch.setattr(dataset, "PROCESSED_PATH", str(tmp_path / "processed.parquet"))
+    monkeypatch.setattr(dataset, "PROCESSED_META_PATH", str(tmp_path / "processed.meta.json"))
+    return csv_path
+
+
+def test_iter_dataset_skips_a_chunk_of_repeated_rows(tmp_path):
+    csv_path, category_path = write_raw_dataset(str(tmp_path), 3)
+    rows = pd.read_csv(csv_path)
+    # Chunks of two rows: two new rows, the same two again, then one more new row
+    pd.concat([rows.iloc[:2], rows.iloc[:2], rows.iloc[2:3]]).to_csv(csv_path, index=False)
+
+    chunks = list(iter_dataset(2, dataset_path=csv_path, category_path=category_path))
+
+    assert [len(chunk) for _, chunk in chunks] == [2, 0, 1]
+    assert list(chunks[2][1]["video_id"]) == [rows["video_id"][2]]
+
+
+def test_get_dataset_has_the_same_dtypes_with_and_without_the_cache(raw_dataset):
+    uncached = dataset.get_dataset(use_cache=False)
+    built = dataset.get_dataset()
+    cached = dataset.get_dataset()
+
+    assert dict(uncached.dtypes) == dict(built.dtypes) == dict(cached.dtypes)
+
+
+def test_ensure_processed_cache_refuses_a_stale_file_when_the_rebuild_fails(raw_dataset, monkeypatch):
+    assert dataset.ensure_processed_cache() == dataset.PROCESSED_PATH
+
+    # The source changes, then writing the new cache fails
+    with open(raw_dataset, "a") as f:
+        f.write(pd.read_csv(raw_dataset).iloc[:1].to_csv(header=False, index=False))
+    os.utime(raw_dataset, (0, 0))
+
+    def disk_full(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", disk_full)
+    with pytest.raises(FileNotFoundError):
+        dataset.ensure_processed_cache()
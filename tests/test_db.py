@@ -0,0 +1,79 @@
+import duckdb
+import pandas as pd
+import psycopg2.errors
+import pytest
+from src.backend.database import db
+
+
+class FakeCursor:
+    """Records the statements and COPY buffers sent by the load functions."""
+
+    def __init__(self, copy_error=None):
+        self.statements = []
+        self.copies = []
+        self.copy_error = copy_error
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.statements.append(" ".join(query.split()))
+
+    def copy_expert(self, query, buffer):
+        self.copies.append((" ".join(query.split()), buffer.getvalue()))
+        if self.copy_error is not None:
+            error, self.copy_error = self.copy_error, None
+            raise error
+
+
+@pytest.fixture
+def snapshots():
+    # The chunk repeats the key of its first row; the later snapshot must win
+    return pd.DataFrame({
+        "video_id": ["a", "b", "a"],
+        "trending_date": ["2024-01-01", "2024-01-01", "2024-01-01"],
+        "title": ["first", "other", "latest"],
+    })
+
+
+def test_upsert_keeps_the_last_row_of_a_repeated_key(snapshots):
+    cursor = FakeCursor()
+    db.upsert_dataframe(cursor, snapshots, "videos")
+    merge = cursor.statements[-1]
+    assert f"{db.STAGING_ROW_COLUMN} BIGSERIAL" in cursor.statements[0]
+
+    # Run the merge against staging rows numbered in COPY order
+    connection = duckdb.connect()
+    connection.execute(
+        "CREATE TABLE videos (video_id TEXT, trending_date TEXT, title TEXT, PRIMARY KEY (video_id, trending_date))"
+    )
+    connection.execute("INSERT INTO videos VALUES ('b', '2024-01-01', 'stale')")
+    staging = snapshots.assign(**{db.STAGING_ROW_COLUMN: range(1, len(snapshots) + 1)})
+    connection.execute("CREATE TABLE videos_staging AS SELECT * FROM staging")
+    connection.execute(merge)
+
+    rows = connection.execute("SELECT video_id, title FROM videos ORDER BY video_id").fetchall()
+    assert rows == [("a", "latest"), ("b", "other")]
+
+
+def test_copy_falls_back_to_upsert_on_a_repeated_key(snapshots):
+    cursor = FakeCursor(copy_error=psycopg2.errors.UniqueViolation("duplicate key"))
+    db.copy_or_upsert_dataframe(cursor, snapshots, "videos")
+
+    assert cursor.statements[0] == "SAVEPOINT copy_chunk;"
+    assert cursor.statements[1] == "ROLLBACK TO SAVEPOINT copy_chunk;"
+    assert any(statement.startswith("INSERT INTO videos") for statement in cursor.statements)
+    assert cursor.statements[-1] == "RELEASE SAVEPOINT copy_chunk;"
+    # The chunk was copied twice: into the table, then into the staging table
+    assert [query.split()[1] for query, _ in cursor.copies] == ["videos", "videos_staging"]
+
+
+def test_copy_without_conflict_does_not_upsert(snapshots):
+    cursor = FakeCursor()
+    db.copy_or_upsert_dataframe(cursor, snapshots, "videos")
+
+    assert cursor.statements == ["SAVEPOINT copy_chunk;", "RELEASE SAVEPOINT copy_chunk;"]
+    assert len(cursor.copies) == 1
+
+
+def test_copy_buffer_keeps_empty_strings_apart_from_nulls():
+    df = pd.DataFrame({"title": ["", None], "likes": [1.0, float("nan")]})
+    assert db.dataframe_to_copy_buffer(df).getvalue() == f',1\n{db.COPY_NULL},{db.COPY_NULL}\n'
@@ -0,0 +1,55 @@
+import os
+import threading
+
+import pytest
+from src.backend.database import backends, duckdb_backend
+from src.backend.database.summaries import VIDEO_STATS_TABLE
+from src.data import dataset
+
+
+@pytest.fixture
+def backend(duckdb_dataset):
+    return duckdb_backend
+
+
+def reload_parquet(backend, monkeypatch):
+    """Give the Parquet cache a new mtime and make the next query notice it."""
+    os.utime(dataset.PROCESSED_PATH, (1, 1))
+    monkeypatch.setattr(backend, "_database_checked_at", 0.0)
+
+
+def test_queries_and_summaries_run_on_the_processed_dataset(backend):
+    videos = backend.execute_query("SELECT count(DISTINCT video_id) FROM youtube_trending_data", fetch="one")[0]
+    assert videos > 0
+    assert backend.execute_query(f"SELECT count(*) FROM {VIDEO_STATS_TABLE}", fetch="one") == (videos,)
+
+
+def test_concurrent_first_queries_build_and_load_the_database_once(backend, monkeypatch):
+    builds, loads = [], []
+    get_dataset, load = dataset.get_dataset, backend._load
+    monkeypatch.setattr(dataset, "get_dataset", lambda **kwargs: builds.append(kwargs) or get_dataset(**kwargs))
+    monkeypatch.setattr(backend, "_load", lambda path: loads.append(path) or load(path))
+    barrier = threading.Barrier(8)
+
+    def first_query():
+        barrier.wait()
+        backend.execute_query("SELECT 1")
+
+    threads = [threading.Thread(target=first_query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == len(loads) == 1
+
+
+def test_a_reload_leaves_cursors_on_the_old_database_usable(backend, monkeypatch):
+    old_cursor = backend.get_connection()
+    version = backends.get_data_version("duckdb")
+
+    reload_parquet(backend, monkeypatch)
+    new_cursor = backend.get_connection()
+
+    assert new_cursor is not old_cursor
+    assert backends.get_data_version("duckdb") != version
+    assert old_cursor.execute("SELECT count(*) FROM youtube_trending_data").fetchone()[0] > 0
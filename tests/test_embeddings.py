@@ -0,0 +1,132 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.backend.database import search
+from src.data import embeddings
+
+TOPICS = ["cricket match highlights", "bollywood movie trailer", "cooking recipe paneer", "gaming live stream"]
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """An empty embedding index under tmp_path, with no index mapped yet."""
+    monkeypatch.setattr(embeddings, "EMBEDDINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(embeddings, "_index", {})
+    return tmp_path
+
+
+def videos(count, start=0):
+    return pd.DataFrame({
+        "video_id": [f"v{i:04d}" for i in range(start, start + count)],
+        "title": [f"{TOPICS[i % len(TOPICS)]} part {i}" for i in range(start, start + count)],
+        "description": [f"episode {i} http://example.com/{i}" for i in range(start, start + count)],
+    })
+
+
+def read_meta(index_dir):
+    return json.loads((index_dir / "meta.json").read_text())
+
+
+def test_encode_is_normalised_and_deterministic():
+    vectors = embeddings.encode(["Cricket highlights", ""], ["", None])
+    assert vectors.shape == (2, embeddings.EMBEDDING_DIM) and vectors.dtype == np.float32
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[1].any()
+    assert np.array_equal(vectors, embeddings.encode(["Cricket highlights", ""], ["", None]))
+
+
+def test_nearest_finds_the_matching_videos(index_dir):
+    assert embeddings.update_embeddings(videos(8)) == 8
+    (matches,) = embeddings.nearest(["cricket highlights"], k=3)
+    assert [video_id for video_id, _ in matches[:2]] == ["v0000", "v0004"]
+    assert all(score > 0 for _, score in matches)
+
+
+def test_updates_only_add_unseen_videos(index_dir):
+    embeddings.update_embeddings(videos(8))
+    assert embeddings.update_embeddings(videos(12)) == 4
+    assert embeddings.update_embeddings(videos(12)) == 0
+    assert (index_dir / "ids.txt").read_text().split() == [f"v{i:04d}" for i in range(12)]
+    assert read_meta(index_dir)["count"] == 12
+    # A reader that mapped the old index picks up the new rows
+    assert len(embeddings._load()["ids"]) == 12
+
+
+def test_rows_of_an_interrupted_update_are_dropped(index_dir):
+    embeddings.update_embeddings(videos(4))
+    # Rows appended without their meta.json commit
+    with open(index_dir / "vectors.f32", "ab") as f:
+        f.write(np.ones((2, embeddings.EMBEDDING_DIM), dtype=np.float32).tobytes())
+    with open(index_dir / "ids.txt", "a") as f:
+        f.write("v0004\nv0005\n")
+
+    assert embeddings.update_embeddings(videos(6)) == 2
+    assert (index_dir / "vectors.f32").stat().st_size == 6 * embeddings.EMBEDDING_DIM * 4
+    assert (index_dir / "ids.txt").read_text().split() == [f"v{i:04d}" for i in range(6)]
+
+
+def test_ivf_lists_are_trained_and_retrained_as_the_index_grows(index_dir, monkeypatch):
+    monkeypatch.setattr(embeddings, "EXACT_SEARCH_ROWS", 100)
+    embeddings.update_embeddings(videos(50))
+    assert read_meta(index_dir)["n_lists"] == 0
+
+    embeddings.update_embeddings(videos(60, start=50))
+    meta = read_meta(index_dir)
+    assert meta["n_lists"] == 16 and meta["trained_on"] == 110
+    # Below twice the trained size, new rows join the existing lists
+    embeddings.update_embeddings(videos(50, start=110))
+    assert read_meta(index_dir)["trained_on"] == 110
+    lists = np.fromfile(index_dir / "lists.i32", dtype=np.int32)
+    assert len(lists) == 160 and lists.max() < 16
+
+    embeddings.update_embeddings(videos(60, start=160))
+    assert read_meta(index_dir)["trained_on"] == 220
+
+
+def test_probing_every_list_matches_the_exact_search(index_dir, monkeypatch):
+    monkeypatch.setattr(embeddings, "EXACT_SEARCH_ROWS", 100)
+    embeddings.update_embeddings(videos(200))
+    queries = ["cricket highlights", "paneer recipe"]
+
+    ivf = embeddings.nearest(queries, k=10, n_probe=16)
+    probed = embeddings.nearest(queries, k=10, n_probe=1)
+    monkeypatch.setattr(embeddings, "_index", {"mtime": None})
+    (index_dir / "meta.json").write_text(json.dumps({**read_meta(index_dir), "n_lists": 0}))
+    exact = embeddings.nearest(queries, k=10)
+
+    assert [[video_id for video_id, _ in matches] for matches in ivf] == \
+        [[video_id for video_id, _ in matches] for matches in exact]
+    assert np.allclose([[score for _, score in matches] for matches in ivf],
+                       [[score for _, score in matches] for matches in exact])
+    # A single probe only returns rows that the exhaustive search scores the same
+    for matches, everything in zip(probed, embeddings.nearest(queries, k=200)):
+        scores = dict(everything)
+        assert all(np.isclose(scores[video_id], score) for video_id, score in matches)
+
+
+def test_nearest_without_an_index_raises(index_dir):
+    with pytest.raises(FileNotFoundError):
+        embeddings.nearest(["anything"])
+
+
+def test_semantic_search_without_an_index_returns_an_error(index_dir):
+    assert "not been built" in search.semantic_search("feel-good videos")["error"]
+
+
+def test_semantic_search_ranks_videos_by_similarity(index_dir, monkeypatch):
+    embeddings.update_embeddings(videos(8))
+    queried = []
+
+    def execute_query(query, params=None):
+        queried.append(params)
+        return [(video_id, f"title {video_id}", "", "channel", "Sports", 100) for video_id in params[:-1]]
+
+    monkeypatch.setattr(search, "execute_query", execute_query)
+    results = search.semantic_search(["cricket highlights", "cricket match"], limit=2, category="Sports")
+
+    assert [result["video_id"] for result in results] == ["v0000", "v0004"]
+    assert results[0]["rank"] >= results[1]["rank"] > 0
+    # Over-fetched for the category filter, which is passed last
+    assert queried[0][-1] == "Sports" and len(set(queried[0][:-1])) == len(queried[0]) - 1
@@ -0,0 +1,84 @@
+import pytest
+from src.backend.database import guardrails
+from src.backend.database.guardrails import QueryRejected, check_plan, check_query
+
+
+def _plan(*relations, cost=100.0):
+    scans = [{"Node Type": "Seq Scan", "Relation Name": name, "Schema": "public"} for name in relations]
+    return [{"Plan": {"Node Type": "Limit", "Total Cost": cost, "Plans": [{"Node Type": "Append", "Plans": scans}]}}]
+
+
+def test_plan_over_the_regions_view_reads_its_partitions():
+    # EXPLAIN shows the partitions behind trending_all_regions, not the view
+    plan = _plan("youtube_trending_regions_in", "youtube_trending_regions_us")
+    assert check_plan(plan) == 100.0
+
+
+def test_plan_over_other_relations_is_rejected():
+    with pytest.raises(QueryRejected, match="Table not allowed"):
+        check_plan(_plan("youtube_trending_regions_in", "pg_authid"))
+    with pytest.raises(QueryRejected, match="Table not allowed"):
+        check_plan(_plan("youtube_trending_regions_secret"))
+
+
+def test_plan_that_writes_or_costs_too_much_is_rejected():
+    plan = _plan("youtube_trending_data")
+    plan[0]["Plan"]["Plans"][0]["Node Type"] = "ModifyTable"
+    with pytest.raises(QueryRejected, match="modify or lock"):
+        check_plan(plan)
+    with pytest.raises(QueryRejected, match="too expensive"):
+        check_plan(_plan("youtube_trending_data", cost=10_000), max_cost=1_000)
+
+
+def test_plan_in_another_schema_is_rejected():
+    plan = _plan("youtube_trending_data")
+    plan[0]["Plan"]["Plans"][0]["Plans"][0]["Schema"] = "private"
+    with pytest.raises(QueryRejected, match="Table not allowed"):
+        check_plan(plan)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT title FROM youtube_trending_data", "SELECT * FROM (SELECT title FROM youtube_trending_data) AS guarded_query LIMIT 100"),
+    ("SELECT title FROM youtube_trending_data LIMIT 5;", "SELECT title FROM youtube_trending_data LIMIT 5"),
+    ("select 1 limit 500", "SELECT * FROM (select 1 limit 500) AS guarded_query LIMIT 100"),
+    ("SELECT 1 LIMIT 5 OFFSET 10", "SELECT * FROM (SELECT 1 LIMIT 5 OFFSET 10) AS guarded_query LIMIT 100"),
+    ("WITH t AS (SELECT 1) SELECT * FROM t LIMIT 3", "WITH t AS (SELECT 1) SELECT * FROM t LIMIT 3"),
+    ("-- top videos\nSELECT 'drop; delete' LIMIT 1", "SELECT 'drop; delete' LIMIT 1"),
+])
+def test_check_query_caps_the_rows_of_read_queries(query, expected):
+    assert check_query(query) == expected
+
+
+@pytest.mark.parametrize("query, reason", [
+    ("", "empty"),
+    ("SELECT 1; SELECT 2", "single statement"),
+    ("DELETE FROM youtube_trending_data", "Only SELECT"),
+    ("WITH gone AS (DELETE FROM youtube_trending_data RETURNING *) SELECT * FROM gone", "DELETE"),
+    ("SELECT * INTO copy_table FROM youtube_trending_data", "INTO"),
+    ("SELECT pg_sleep(10)", "pg_sleep"),
+    ("SELECT pg_catalog.pg_read_file('/etc/passwd')", "pg_read_file"),
+    ("SELECT * FROM youtube_trending_data FOR SHARE", "locking"),
+    ("/* comment */ SELECT 1 /* ; DROP TABLE x */; DROP TABLE youtube_trending_data", "single statement"),
+])
+def test_check_query_rejects_anything_but_one_read_query(query, reason):
+    with pytest.raises(QueryRejected, match=reason):
+        check_query(query)
+
+
+@pytest.fixture
+def duckdb_guardrails(duckdb_dataset, monkeypatch):
+    monkeypatch.setattr(guardrails, "QUERY_BACKEND", "duckdb")
+
+
+def test_guarded_query_on_duckdb_caps_rows_and_bytes(duckdb_guardrails):
+    result = guardrails.execute_guarded_query("SELECT video_id FROM youtube_trending_data", max_rows=7)
+    assert result["columns"] == ["video_id"]
+    assert len(result["rows"]) == 7
+
+    result = guardrails.execute_guarded_query("SELECT video_id, title FROM youtube_trending_data", max_bytes=200)
+    assert 0 < len(result["rows"]) < 10
+
+
+def test_guarded_query_on_duckdb_rejects_invalid_sql(duckdb_guardrails):
+    with pytest.raises(QueryRejected, match="invalid"):
+        guardrails.execute_guarded_query("SELECT no_such_column FROM youtube_trending_data")
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+from src.backend.models import llm_model
+
+ERROR_ANSWER = "An error occurred while processing your request."
+
+
+def run_both(user_prompt):
+    sync_answer = llm_model.run_conversation(user_prompt)
+    llm_model.get_response_cache().clear()
+    async_answer = asyncio.run(llm_model.arun_conversation(user_prompt))
+    return sync_answer, async_answer
+
+
+@pytest.mark.parametrize("arguments", ["{}", json.dumps({"query": 5}), json.dumps({"query": " "}), "[1]", "{not json"])
+def test_malformed_query_arguments_are_answered_with_an_error(stub, arguments):
+    stub.arguments = arguments
+    assert run_both("what is trending") == ("token0 token1 token2 ",) * 2
+    assert len(stub.tool_results) == 2
+    assert all(result["error"].startswith("Invalid arguments") for result in stub.tool_results)
+
+
+def test_unknown_tool_gets_an_error_message(stub):
+    stub.tool_name = "drop_everything"
+    assert run_both("what is trending") == ("token0 token1 token2 ",) * 2
+    assert stub.tool_results == [{"error": "Unknown function: drop_everything"}] * 2
+
+
+def test_failed_answer_completion_returns_the_error_answer(stub):
+    stub.tool_name = "drop_everything"
+    stub.answer_status = 400
+    assert run_both("what is trending") == (ERROR_ANSWER, ERROR_ANSWER)
+
+
+def test_call_tool_rejects_non_string_query():
+    assert llm_model.call_tool(llm_model.cached_query, {"query": 5})["error"].startswith("Invalid arguments")
+    assert llm_model.call_tool(llm_model.cached_query, {"sql": "SELECT 1"})["error"].startswith("Invalid arguments")
+
+
+def test_answers_are_cached_only_when_every_tool_call_succeeded(stub, monkeypatch):
+    stub.tool_name = "trending_now"
+    stub.arguments = "{}"
+    monkeypatch.setattr(llm_model, "_tool_functions", {"trending_now": lambda: {"columns": ["video_id"], "rows": [["a"]]}})
+    llm_model.run_conversation("what is trending")
+    assert llm_model.get_response_cache().get_answer("what is trending") is not None
+    llm_model.get_response_cache().clear()
+    asyncio.run(llm_model.arun_conversation("what is trending"))
+    assert llm_model.get_response_cache().get_answer("what is trending") is not None
+
+
+def test_answers_built_on_failed_tool_calls_are_not_cached(stub, monkeypatch):
+    def database_down(query):
+        raise ConnectionError("database is down")
+
+    async def database_down_async(query):
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(llm_model, "execute_guarded_query", database_down)
+    monkeypatch.setattr(llm_model, "execute_guarded_query_async", database_down_async)
+    llm_model.run_conversation("what is trending")
+    asyncio.run(llm_model.arun_conversation("what is trending"))
+    assert stub.tool_results == [None, None]
+    assert llm_model.get_response_cache().get_answer("what is trending") is None
+
+    stub.arguments = "{}"
+    run_both("what is trending")
+    assert llm_model.get_response_cache().get_answer("what is trending") is None
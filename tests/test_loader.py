@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+
+import pytest
+from benchmarks.synthetic import write_raw_dataset
+from src.backend.database import loader
+from src.data import dataset
+
+
+class ProgressTable:
+    """The ingestion_progress table, kept in memory and written through the load's cursor."""
+
+    def __init__(self):
+        self.rows = {}
+        self.committed = []
+
+    def execute_query(self, query, params=None, fetch="all"):
+        if query.startswith("DELETE"):
+            self.rows.pop(params, None)
+        elif "SELECT last_chunk, chunksize" in query:
+            return self.rows.get(params)
+
+    @contextmanager
+    def connection(self):
+        progress = self
+
+        class Connection:
+            pending = None
+
+            def cursor(self):
+                return self
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, query, params=None):
+                self.pending = params
+
+            def commit(self):
+                table_name, source, chunk_index, rows, chunksize = self.pending
+                progress.rows[(table_name, source)] = (chunk_index, chunksize)
+                progress.committed.append(chunk_index)
+
+        yield Connection()
+
+
+@pytest.fixture
+def progress(tmp_path, monkeypatch):
+    """load_dataset over a 2500-row synthetic dataset, with the database replaced by a ProgressTable."""
+    csv_path, category_path = write_raw_dataset(str(tmp_path), 2500)
+    monkeypatch.setattr(dataset, "DATASET_PATH", csv_path)
+    monkeypatch.setattr(dataset, "CATEGORY_PATH", category_path)
+    monkeypatch.setattr(loader, "DATASET_PATH", csv_path)
+
+    table = ProgressTable()
+    monkeypatch.setattr(loader, "execute_query", table.execute_query)
+    monkeypatch.setattr(loader, "get_connection", table.connection)
+    monkeypatch.setattr(loader, "migrate", lambda table_name: None)
+    monkeypatch.setattr(loader, "embed_chunk", lambda chunk: None)
+    monkeypatch.setattr(loader, "refresh_summaries", lambda table_name: None)
+    return table
+
+
+def writer(written, fail_at=None):
+    def write_chunk(cursor, chunk, table_name):
+        if len(written) == fail_at:
+            raise OSError("connection reset")
+        written.append(len(chunk))
+    return write_chunk
+
+
+def test_each_chunk_commits_with_its_progress(progress, monkeypatch):
+    written = []
+    monkeypatch.setitem(loader.LOAD_METHODS, "copy", writer(written))
+    stats = loader.load_dataset("videos", chunksize=1000)
+
+    assert stats["chunks"] == len(written) == 3
+    assert stats["rows"] == sum(written)
+    assert progress.committed == [0, 1, 2]
+
+
+def test_an_interrupted_load_resumes_after_the_last_committed_chunk(progress, monkeypatch):
+    written = []
+    monkeypatch.setitem(loader.LOAD_METHODS, "copy", writer(written, fail_at=2))
+    with pytest.raises(OSError):
+        loader.load_dataset("videos", chunksize=1000)
+    assert progress.committed == [0, 1]
+
+    monkeypatch.setitem(loader.LOAD_METHODS, "copy", writer(written))
+    stats = loader.load_dataset("videos", chunksize=1000)
+    assert stats["chunks"] == 1
+    assert progress.committed == [0, 1, 2]
+
+
+def test_resuming_with_another_chunksize_is_refused(progress, monkeypatch):
+    monkeypatch.setitem(loader.LOAD_METHODS, "copy", writer([], fail_at=1))
+    with pytest.raises(OSError):
+        loader.load_dataset("videos", chunksize=1000)
+
+    with pytest.raises(ValueError, match="chunks of 1000 rows"):
+        loader.load_dataset("videos", chunksize=500)
+    # Starting over is allowed
+    monkeypatch.setitem(loader.LOAD_METHODS, "copy", writer([]))
+    assert loader.load_dataset("videos", chunksize=500, resume=False)["chunks"] == 5
+
+
+def test_progress_recorded_before_chunk_sizes_were_kept_still_resumes(monkeypatch):
+    monkeypatch.setattr(loader, "execute_query", lambda query, params=None, fetch="all": (4, None))
+    assert loader.get_last_chunk("videos", "data.csv", 1000) == 4
+
+
+def test_unknown_load_methods_are_refused():
+    with pytest.raises(ValueError):
+        loader.load_dataset("videos", method="insert")
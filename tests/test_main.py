@@ -0,0 +1,40 @@
+import json
+
+from fastapi.testclient import TestClient
+from src.backend.main import app
+from src.backend.services import youtube_service
+from src.backend.services.quota import QuotaScheduler
+
+
+def stream_events(prompt):
+    """POST to /chat/stream and return its events as (name, data) pairs."""
+    with TestClient(app) as client:
+        response = client.post("/chat/stream", json={"prompt": prompt})
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_reports_a_successful_answer(stub):
+    events = stream_events("what is trending")
+    assert "".join(data for name, data in events if name == "token") == "token0 token1 token2 "
+    assert events[-1][0] == "done" and events[-1][1]["error"] is False
+
+
+def test_stream_flags_an_error_answer(stub):
+    stub.answer_status = 400
+    events = stream_events("what is trending")
+    assert events[-1][0] == "done" and events[-1][1]["error"] is True
+
+
+def test_metrics_expose_the_youtube_quota(monkeypatch):
+    scheduler = QuotaScheduler(daily_quota=500)
+    scheduler.call("videos.list", lambda: None)
+    monkeypatch.setattr(youtube_service, "scheduler", scheduler)
+    metrics = TestClient(app).get("/metrics").text
+
+    assert 'youtrend_youtube_calls_total{result="calls"} 1' in metrics
+    assert "youtrend_youtube_quota_used 1" in metrics
+    assert "youtrend_youtube_quota_limit 500" in metrics
@@ -0,0 +1,118 @@
+import threading
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+from src.backend.database import pool as pool_module
+from src.backend.database.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, healthy=True):
+        self.closed = 0
+        self.healthy = healthy
+        self.in_transaction = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, query):
+                if not connection.healthy:
+                    raise psycopg2.OperationalError("server closed the connection")
+
+        return Cursor()
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_INTRANS if self.in_transaction else extensions.TRANSACTION_STATUS_IDLE
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Connections opened by the pool under test, in order."""
+    connections = []
+
+    def connect(**kwargs):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    monkeypatch.setattr(pool_module.psycopg2, "connect", connect)
+    return connections
+
+
+def test_connections_are_reused_and_opened_lazily(opened):
+    pool = ConnectionPool(min_size=1, max_size=3)
+    assert len(opened) == 1
+
+    first = pool.getconn()
+    second = pool.getconn()
+    pool.putconn(first)
+    assert pool.getconn() is first
+    assert len(opened) == 2
+    assert pool.stats() == {"opened": 2, "idle": 0, "max_size": 3}
+    pool.putconn(second)
+
+
+def test_checkout_times_out_when_every_connection_is_busy(opened):
+    pool = ConnectionPool(min_size=0, max_size=1, timeout=0.05)
+    pool.getconn()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+
+
+def test_waiting_checkout_gets_the_returned_connection(opened):
+    pool = ConnectionPool(min_size=0, max_size=1, timeout=5)
+    held = pool.getconn()
+    checked_out = []
+    waiter = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+    waiter.start()
+    pool.putconn(held)
+    waiter.join()
+    assert checked_out == [held]
+
+
+def test_open_transactions_are_rolled_back_on_check_in(opened):
+    pool = ConnectionPool(min_size=1, max_size=1)
+    with pool.connection() as connection:
+        connection.in_transaction = True
+    assert connection.rollbacks == 1 and not connection.in_transaction
+
+
+def test_broken_connections_are_replaced(opened):
+    pool = ConnectionPool(min_size=1, max_size=1)
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection():
+            raise psycopg2.OperationalError("connection reset")
+    assert opened[0].closed
+
+    with pool.connection() as connection:
+        assert connection is opened[1]
+
+
+def test_unhealthy_idle_connections_are_discarded_on_checkout(opened):
+    pool = ConnectionPool(min_size=1, max_size=1, health_check_interval=0)
+    opened[0].healthy = False
+    assert pool.getconn() is opened[1]
+    assert opened[0].closed
+
+
+def test_closed_pool_refuses_checkouts(opened):
+    pool = ConnectionPool(min_size=2, max_size=2)
+    pool.closeall()
+    assert all(connection.closed for connection in opened)
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from src.backend.database.db import TABLE
+from src.backend.database.schema import REGIONS_VIEW
+from src.backend.database.summaries import SUMMARY_TABLES
+from src.backend.models import prompt
+
+
+def test_scope_mentions_every_region_once_the_view_is_listed(monkeypatch):
+    monkeypatch.setattr(prompt, "schema_section", lambda: "youtube_trending_data: video_id TEXT")
+    assert "trending videos in India." in prompt.system_prompt()
+
+    monkeypatch.setattr(
+        prompt, "schema_section",
+        lambda: "youtube_trending_data: video_id TEXT\ntrending_all_regions (every region): region TEXT",
+    )
+    assert "in several countries" in prompt.system_prompt()
+
+
+def test_query_results_are_sent_as_trimmed_columnar_json():
+    result = {
+        "columns": ["video_id", "title", "description", "likes_ratio", "tag_list"],
+        "rows": [["abc", "x" * 300, "long text", 0.123456789, [f"t{i}" for i in range(20)]]],
+    }
+    compact = json.loads(prompt.compact_result(result, max_tokens=1000))
+    assert compact["columns"] == ["video_id", "title", "likes_ratio", "tag_list"]
+    video_id, title, likes_ratio, tags = compact["rows"][0]
+    assert len(title) == prompt.TEXT_LIMITS["title"] and title.endswith("…")
+    assert likes_ratio == 0.1235
+    assert tags == [f"t{i}" for i in range(prompt.LIST_LIMIT)] + ["…"]
+
+
+def test_records_become_columns_and_keep_non_ascii_text():
+    content = prompt.compact_result([{"video_id": "a", "title": "क्रिकेट"}, {"video_id": "b", "title": None}], 1000)
+    assert content == '{"columns":["video_id","title"],"rows":[["a","क्रिकेट"],["b",null]]}'
+
+
+def test_rows_over_the_budget_are_left_out_and_counted():
+    result = {"columns": ["video_id", "view_count"], "rows": [[f"video{i:04d}", i] for i in range(500)]}
+    content = prompt.compact_result(result, max_tokens=300)
+    compact = json.loads(content)
+    assert prompt.estimate_tokens(content) <= 300
+    assert 0 < len(compact["rows"]) < 500
+    assert compact["rows"][0] == ["video0000", 0]
+    assert compact["omitted_rows"] == 500 - len(compact["rows"])
+
+
+def test_errors_are_passed_through():
+    assert prompt.compact_result({"error": "Query failed."}, 10) == '{"error":"Query failed."}'
+
+
+def test_answer_messages_drop_the_schema_prompt():
+    messages = [{"role": "system", "content": "long schema"}, {"role": "user", "content": "top videos"}]
+    assert prompt.answer_messages(messages) == [
+        {"role": "system", "content": prompt.ANSWER_INSTRUCTIONS},
+        {"role": "user", "content": "top videos"},
+    ]
+
+
+def test_result_budget_is_shared_between_tool_calls(monkeypatch):
+    monkeypatch.setattr(prompt, "TOKEN_BUDGET", 1000)
+    messages = [{"role": "system", "content": "x"}, {"role": "user", "content": "y" * 400}]
+    used = prompt.message_tokens(prompt.answer_messages(messages))
+    assert prompt.result_budget(messages, [1, 2]) == (1000 - used) // 2
+    assert prompt.result_budget(messages * 20, [1]) == prompt.MIN_RESULT_TOKENS
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """information_schema of a database holding only the main table, counting the lookups."""
+    lookups = []
+
+    def execute_query(query, params):
+        lookups.append(params[0])
+        return [("video_id", "text"), ("trending_date", "timestamp with time zone")] if params[0] == TABLE else None
+
+    monkeypatch.setattr(prompt, "execute_query", execute_query)
+    monkeypatch.setattr(prompt, "_schema", None)
+    monkeypatch.setattr(prompt, "_schema_expires", 0.0)
+    return lookups
+
+
+def test_schema_section_reads_the_live_columns_and_caches_them(catalog, monkeypatch):
+    schema = prompt.schema_section()
+    assert f"{TABLE}: video_id TEXT, trending_date TIMESTAMPTZ" in schema.splitlines()
+    # Summary tables fall back to their static columns; the regions view is left out
+    assert all(any(line.startswith(f"{name} (") for line in schema.splitlines()) for name in SUMMARY_TABLES)
+    assert REGIONS_VIEW not in schema
+
+    lookups = len(catalog)
+    monkeypatch.setattr(prompt, "SCHEMA_RETRY_SECONDS", 3600)
+    assert prompt.schema_section() == schema
+    assert len(catalog) == lookups
+
+
+def test_a_fallback_schema_is_retried_sooner(catalog, monkeypatch):
+    monkeypatch.setattr(prompt, "SCHEMA_RETRY_SECONDS", 0)
+    prompt.schema_section()
+    lookups = len(catalog)
+    prompt.schema_section()
+    assert len(catalog) == 2 * lookups
@@ -0,0 +1,169 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import pytest
+from benchmarks.synthetic import write_raw_dataset
+from src.backend.database import region_loader
+from src.data.dataset import discover_regions
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Two small regional datasets."""
+    for region in ("IN", "US"):
+        write_raw_dataset(str(tmp_path), 2500, chunksize=1000, region=region)
+    return tmp_path
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """Runs the workers on threads, recording each pool started, with no database or retry delay."""
+    started = []
+
+    class Pool(ThreadPoolExecutor):
+        def __init__(self, max_workers, mp_context=None):
+            super().__init__(max_workers=max_workers)
+            started.append(max_workers)
+
+    queries = []
+    monkeypatch.setattr(region_loader, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(region_loader, "RETRY_DELAY", 0)
+    monkeypatch.setattr(region_loader, "ensure_region_table", lambda regions: None)
+    monkeypatch.setattr(region_loader, "ensure_progress_table", lambda: None)
+    monkeypatch.setattr(region_loader, "execute_query", lambda query, params=None, fetch="all": queries.append(query))
+    return started, queries
+
+
+def fake_load_region(outcomes, calls):
+    """A load_region that raises, in turn, the errors queued for a region, then succeeds."""
+    def load_region(region, dataset_path, category_path, max_memory_mb, method, resume):
+        calls.append((region, resume))
+        if outcomes.get(region):
+            raise outcomes[region].pop(0)
+        return {"region": region, "rows": 10, "chunks": 1, "seconds": 1.0, "rows_per_second": 10.0}
+    return load_region
+
+
+def test_discover_regions_pairs_datasets_with_their_categories(data_dir):
+    (data_dir / "GB_youtube_trending_data.csv").write_text("video_id\n")
+    (data_dir / "notes.txt").write_text("")
+    regions = discover_regions(str(data_dir))
+    assert list(regions) == ["IN", "US"]
+    assert regions["IN"] == (str(data_dir / "IN_youtube_trending_data.csv"), str(data_dir / "IN_category_id.json"))
+
+
+def test_every_region_is_loaded_once(data_dir, pools, monkeypatch):
+    started, queries = pools
+    calls = []
+    monkeypatch.setattr(region_loader, "load_region", fake_load_region({}, calls))
+    stats = region_loader.load_regions(data_dir=str(data_dir), workers=8, resume=False)
+
+    assert sorted(calls) == [("IN", False), ("US", False)]
+    assert started == [2]
+    assert stats["rows"] == 20 and stats["failed"] == {}
+    assert queries == [f"ANALYZE {region_loader.REGION_TABLE};"]
+
+
+def test_unknown_regions_are_refused(data_dir, pools):
+    with pytest.raises(FileNotFoundError, match="BR"):
+        region_loader.load_regions(["IN", "BR"], data_dir=str(data_dir))
+
+
+def test_unknown_load_methods_are_refused(data_dir):
+    with pytest.raises(ValueError):
+        region_loader.load_regions(data_dir=str(data_dir), method="insert")
+
+
+def test_failed_regions_are_retried_and_resume(data_dir, pools, monkeypatch):
+    calls = []
+    outcomes = {"IN": [OSError("connection reset")]}
+    monkeypatch.setattr(region_loader, "load_region", fake_load_region(outcomes, calls))
+    stats = region_loader.load_regions(["IN"], data_dir=str(data_dir), resume=False)
+
+    # The retry keeps the chunks committed by the failed attempt
+    assert calls == [("IN", False), ("IN", True)]
+    assert list(stats["regions"]) == ["IN"] and stats["failed"] == {}
+
+
+def test_regions_are_given_up_after_max_attempts(data_dir, pools, monkeypatch):
+    _, queries = pools
+    calls = []
+    outcomes = {"US": [ValueError("bad row")] * 3}
+    monkeypatch.setattr(region_loader, "load_region", fake_load_region(outcomes, calls))
+    stats = region_loader.load_regions(data_dir=str(data_dir), max_attempts=2)
+
+    assert calls.count(("US", True)) == 2
+    assert stats["failed"] == {"US": "bad row"}
+    assert list(stats["regions"]) == ["IN"]
+
+
+def test_a_crashed_pool_is_restarted_for_the_remaining_regions(data_dir, pools, monkeypatch):
+    started, _ = pools
+    calls = []
+    outcomes = {"IN": [BrokenProcessPool("worker killed")]}
+    monkeypatch.setattr(region_loader, "load_region", fake_load_region(outcomes, calls))
+    stats = region_loader.load_regions(["IN"], data_dir=str(data_dir), workers=1)
+
+    assert started == [1, 1]
+    assert list(stats["regions"]) == ["IN"]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Records the chunks written by load_region and the statements run on its cursor."""
+    written, statements = [], []
+
+    class Connection:
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query, params=None):
+            statements.append(params)
+
+        def commit(self):
+            pass
+
+    @contextmanager
+    def get_connection():
+        yield Connection()
+
+    def write_chunk(cursor, chunk, table_name, key_columns=None):
+        written.append((table_name, len(chunk), set(chunk["region"]), key_columns))
+
+    monkeypatch.setattr(region_loader, "get_connection", get_connection)
+    monkeypatch.setitem(region_loader.LOAD_METHODS, "copy", write_chunk)
+    monkeypatch.setattr(region_loader, "reset_progress", lambda table_name, source: None)
+    return written, statements
+
+
+def test_load_region_writes_each_chunk_to_its_partition(data_dir, database, monkeypatch):
+    written, statements = database
+    monkeypatch.setattr(region_loader, "get_last_chunk", lambda table_name, source, chunksize: -1)
+    dataset_path, category_path = discover_regions(str(data_dir))["US"]
+    result = region_loader.load_region("US", dataset_path, category_path, max_memory_mb=1, resume=False)
+
+    assert result["chunks"] == len(written) == 3
+    assert {table_name for table_name, *_ in written} == {"youtube_trending_regions_us"}
+    assert all(regions == {"US"} for *_, regions, _ in written)
+    assert all(key_columns == region_loader.REGION_KEY_COLUMNS for *_, key_columns in written)
+    # One progress row per chunk, recorded with the chunk size it was read with
+    assert [params[2] for params in statements] == [0, 1, 2]
+    assert {params[4] for params in statements} == {1000}
+    assert result["rows"] == sum(rows for _, rows, *_ in written)
+
+
+def test_load_region_resumes_after_the_last_committed_chunk(data_dir, database, monkeypatch):
+    written, statements = database
+    monkeypatch.setattr(region_loader, "get_last_chunk", lambda table_name, source, chunksize: 1)
+    dataset_path, category_path = discover_regions(str(data_dir))["IN"]
+    result = region_loader.load_region("IN", dataset_path, category_path, max_memory_mb=1)
+
+    assert result["chunks"] == 1
+    assert [params[2] for params in statements] == [2]
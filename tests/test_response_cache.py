@@ -0,0 +1,31 @@
+import pytest
+from src.backend.services.response_cache import ResponseCache
+
+CACHED = "top 10 most viewed videos this week"
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(similarity_threshold=0.5)
+    cache.set_answer(CACHED, ["SELECT 1"], "cached answer")
+    return cache
+
+
+@pytest.mark.parametrize("prompt", [
+    "Top 10 most viewed videos this week?",
+    "show me the 10 most viewed videos this week",
+    "top 10 highest viewed video this week",
+])
+def test_paraphrase_hits(cache, prompt):
+    assert cache.get_answer(prompt) == {"sql": ["SELECT 1"], "answer": "cached answer"}
+
+
+@pytest.mark.parametrize("prompt", [
+    "top 10 most viewed videos this month",
+    "top 10 most viewed videos this week in India",
+    "top 10 most viewed music videos this week",
+    "top 5 most viewed videos this week",
+    "top 10 least viewed videos this week",
+])
+def test_near_misses_are_not_served(cache, prompt):
+    assert cache.get_answer(prompt) is None
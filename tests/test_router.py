@@ -0,0 +1,15 @@
+import pytest
+from src.backend.models.router import DEFAULT_LIMIT, parse
+
+
+def test_who_questions_go_to_the_llm():
+    assert parse("who has the most views") is None
+
+
+@pytest.mark.parametrize("prompt, limit", [
+    ("what is the most liked video", 1),
+    ("most liked videos", DEFAULT_LIMIT),
+    ("top 5 most liked video", 5),
+])
+def test_limit_follows_the_noun(prompt, limit):
+    assert parse(prompt)["limit"] == limit
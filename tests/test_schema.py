@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+
+import pytest
+from src.backend.database import schema
+
+
+class FakeDatabase:
+    """Answers the catalog queries of the migrations and records every statement."""
+
+    def __init__(self, version=0, columns=None, primary_key=False):
+        self.version = version
+        self.columns = columns or {}
+        self.primary_key = primary_key
+        self.statements = []
+        self.commits = 0
+        self._result = None
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return self
+
+    def commit(self):
+        self.commits += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        query = " ".join(query.split())
+        self.statements.append(query)
+        if query.startswith(f"SELECT version FROM {schema.SCHEMA_VERSION_TABLE}"):
+            self._result = [(self.version,)] if self.version else []
+        elif "information_schema.columns" in query:
+            self._result = list(self.columns.items())
+        elif "information_schema.table_constraints" in query:
+            self._result = [(self.primary_key,)]
+        elif query.startswith(f"INSERT INTO {schema.SCHEMA_VERSION_TABLE}"):
+            self.version = params[1]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(schema, "get_connection", database.connection)
+    return database
+
+
+def statements_like(database, prefix):
+    return [statement for statement in database.statements if statement.startswith(prefix)]
+
+
+def test_migrations_are_ordered():
+    versions = [version for version, _, _ in schema.MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert schema.LATEST_VERSION == versions[-1]
+
+
+def test_a_missing_table_is_created_and_migrated_to_the_latest_version(database):
+    assert schema.migrate("videos") == schema.LATEST_VERSION
+
+    create = statements_like(database, "CREATE TABLE videos")
+    assert len(create) == 1 and "PRIMARY KEY (video_id, trending_date)" in create[0]
+    assert "trending_date TIMESTAMPTZ NOT NULL" in create[0]
+    assert statements_like(database, "CREATE INDEX IF NOT EXISTS videos_view_count_idx")
+    assert statements_like(database, "ALTER TABLE videos ADD COLUMN IF NOT EXISTS tag_list")
+    # One transaction per migration, each with its version bump
+    assert database.commits == 1 + len(schema.MIGRATIONS)
+    assert database.version == schema.LATEST_VERSION
+
+
+def test_only_pending_migrations_run(database):
+    database.version = 2
+    assert schema.migrate("videos") == 3
+    assert not statements_like(database, "CREATE TABLE videos")
+    assert not statements_like(database, "CREATE INDEX IF NOT EXISTS videos_view_count_idx")
+    assert statements_like(database, "ALTER TABLE videos ADD COLUMN IF NOT EXISTS tag_list")
+
+
+def test_migrate_stops_at_the_target(database):
+    assert schema.migrate("videos", target=1) == 1
+    assert not statements_like(database, "CREATE INDEX")
+
+
+def test_text_columns_of_an_old_table_are_converted(database):
+    database.columns = {"video_id": "text", "trending_date": "text", "publishedat": "text", "categoryid": "smallint"}
+    schema.migrate("videos", target=2)
+
+    alter = statements_like(database, "ALTER TABLE videos ALTER COLUMN")
+    assert alter == [
+        "ALTER TABLE videos ALTER COLUMN publishedat TYPE TIMESTAMPTZ USING publishedAt::timestamptz, "
+        "ALTER COLUMN trending_date TYPE TIMESTAMPTZ USING trending_date::timestamptz;"
+    ]
+    # Repeated snapshots are removed before the primary key is added
+    assert statements_like(database, "DELETE FROM videos a USING videos b")
+    assert statements_like(database, "ALTER TABLE videos ADD PRIMARY KEY (video_id, trending_date);")
+
+
+@pytest.mark.parametrize("region, partition", [("IN", "youtube_trending_regions_in"), ("us", "youtube_trending_regions_us")])
+def test_region_partition(region, partition):
+    assert schema.region_partition(region) == partition
+
+
+@pytest.mark.parametrize("region", ["USA", "I1", "in; DROP TABLE x", ""])
+def test_region_partition_rejects_invalid_codes(region):
+    with pytest.raises(ValueError):
+        schema.region_partition(region)
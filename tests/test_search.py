@@ -0,0 +1,71 @@
+import pytest
+from src.backend.database import duckdb_backend, search
+from src.backend.database.db import TABLE
+
+
+@pytest.fixture
+def videos(duckdb_dataset, monkeypatch):
+    """The DuckDB backend with three videos matching 'zebra' in their title, tags or description."""
+    monkeypatch.setattr(search, "QUERY_BACKEND", "duckdb")
+    connection = duckdb_backend.connect()
+    for video_id, title, tags, description, category in [
+        ("in_description", "Morning walk", [], "We saw a zebra", "Travel & Events"),
+        ("in_title", "Zebra crossing", [], "", "Travel & Events"),
+        ("in_tags", "Safari day", ["zebra", "lion"], "", "Pets & Animals"),
+    ]:
+        connection.execute(
+            f"""
+            INSERT INTO {TABLE} BY NAME
+            SELECT * REPLACE (? AS video_id, ? AS title, ?::VARCHAR[] AS tag_list, ? AS description, ? AS category_name)
+            FROM {TABLE} LIMIT 1
+            """,
+            [video_id, title, tags, description, category],
+        )
+    return connection
+
+
+def video_ids(results):
+    return [result["video_id"] for result in results]
+
+
+def test_title_hits_rank_above_tag_hits_above_description_hits(videos):
+    results = search.search_videos("zebra")
+    assert video_ids(results) == ["in_title", "in_tags", "in_description"]
+    assert set(results[0]) == set(search.RESULT_COLUMNS)
+
+
+def test_filters_and_limit(videos):
+    assert video_ids(search.search_videos("zebra", category="travel & events")) == ["in_title", "in_description"]
+    assert video_ids(search.search_videos("zebra", tags=["Lion"])) == ["in_tags"]
+    assert video_ids(search.search_videos("zebra", limit=1)) == ["in_title"]
+
+
+def test_videos_are_reported_once_at_their_latest_snapshot(videos):
+    videos.execute(
+        f"INSERT INTO {TABLE} BY NAME SELECT * REPLACE (trending_date + INTERVAL 1 DAY AS trending_date, "
+        f"'Zebra crossing again' AS title) FROM {TABLE} WHERE video_id = 'in_title'"
+    )
+    results = search.search_videos("zebra")
+    assert video_ids(results).count("in_title") == 1
+    assert results[0]["title"] == "Zebra crossing again"
+
+
+def test_a_query_without_words_finds_nothing(videos):
+    assert search.search_videos("?!") == []
+
+
+def test_postgres_search_uses_the_search_vector(monkeypatch):
+    queries = []
+    monkeypatch.setattr(search, "QUERY_BACKEND", "postgres")
+    monkeypatch.setattr(search, "execute_query", lambda query, params, backend: queries.append((query, params)) or [])
+
+    assert search.search_videos('"world cup" -highlights', limit=500, category="Sports", tags=["Cricket"]) == []
+    query, params = queries[0]
+    assert "t.search_vector @@ q.query" in query and "t.tag_list && %s::text[]" in query
+    assert params == ('"world cup" -highlights', "Sports", ["cricket"], search.MAX_RESULTS)
+
+
+def test_a_failed_search_returns_an_error(monkeypatch):
+    monkeypatch.setattr(search, "QUERY_BACKEND", "postgres")
+    monkeypatch.setattr(search, "execute_query", lambda query, params, backend: None)
+    assert search.search_videos("cricket") == {"error": "Search failed."}
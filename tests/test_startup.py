@@ -0,0 +1,11 @@
+import os
+
+import pytest
+from benchmarks.bench_import_time import import_once
+
+
+@pytest.mark.parametrize("module", ["src.backend.main", "src.frontend.services.api_client"])
+def test_importing_defers_heavy_modules_and_writes_nothing(module, tmp_path):
+    _, _, loaded = import_once(module, str(tmp_path))
+    assert loaded == []
+    assert os.listdir(tmp_path) == []
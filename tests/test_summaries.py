@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+
+import pytest
+from benchmarks.synthetic import write_raw_dataset
+from src.backend.database import duckdb_backend, summaries
+from src.backend.database.db import TABLE
+from src.data import dataset
+
+
+class DuckDBCursor:
+    """Runs the Postgres refresh statements on DuckDB, which shares their dialect but for the placeholders."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        query = duckdb_backend.translate(query).replace("%(since)s", "$since")
+        result = self.connection.execute(query, {"since": params["since"]} if "$since" in query else None)
+        row = result.fetchone() if result.description and result.description[0][0] == "Count" else None
+        self.rowcount = row[0] if row else -1
+
+
+@pytest.fixture
+def database(duckdb_dataset, monkeypatch):
+    """
+    DuckDB copy of the synthetic dataset, one row per (video_id, trending_date)
+    as in Postgres. The summaries computed by the DuckDB backend's own queries
+    are kept as expected_<table>.
+    """
+    # Six trending days, so videos come back and have a velocity
+    write_raw_dataset(str(duckdb_dataset), 1200)
+    connection = duckdb_backend._load(dataset.ensure_processed_cache())
+    connection.execute(f"CREATE TABLE snapshots AS SELECT DISTINCT ON (video_id, trending_date) * FROM {TABLE}")
+    connection.execute(f"DROP TABLE {TABLE}")
+    connection.execute(f"ALTER TABLE snapshots RENAME TO {TABLE}")
+    for table_name in summaries.SUMMARY_TABLES:
+        connection.execute(f"DROP TABLE {table_name}")
+        connection.execute(f"CREATE TABLE expected_{table_name} AS {duckdb_backend.SUMMARY_QUERIES[table_name]}")
+
+    @contextmanager
+    def get_connection():
+        class Connection:
+            def cursor(self):
+                return DuckDBCursor(connection)
+
+            def commit(self):
+                pass
+
+        yield Connection()
+
+    monkeypatch.setattr(summaries, "get_connection", get_connection)
+    return connection
+
+
+def assert_summaries_match(connection):
+    for table_name in summaries.SUMMARY_TABLES:
+        expected = connection.execute(f"SELECT count(*) FROM expected_{table_name}").fetchone()[0]
+        assert expected > 0
+        for left, right in ((table_name, f"expected_{table_name}"), (f"expected_{table_name}", table_name)):
+            difference = connection.execute(f"SELECT count(*) FROM (FROM {left} EXCEPT ALL FROM {right})").fetchone()
+            assert difference == (0,), f"{left} has rows missing from {right}"
+
+
+def test_full_refresh_matches_the_duckdb_summaries(database):
+    stats = summaries.refresh_summaries()
+    assert_summaries_match(database)
+    assert stats[summaries.VIDEO_STATS_TABLE] == database.execute(
+        f"SELECT count(DISTINCT video_id) FROM {TABLE}"
+    ).fetchone()[0]
+
+
+def test_incremental_refresh_matches_a_full_rebuild(database):
+    since = database.execute(f"SELECT quantile_disc(trending_date, 0.6) FROM {TABLE}").fetchone()[0]
+    database.execute(f"CREATE TABLE later AS FROM {TABLE} WHERE trending_date >= ?", [since])
+    database.execute(f"DELETE FROM {TABLE} WHERE trending_date >= ?", [since])
+    summaries.refresh_summaries()
+
+    database.execute(f"INSERT INTO {TABLE} FROM later")
+    summaries.refresh_summaries(since=since)
+    assert_summaries_match(database)
+
+
+def test_summary_tables_have_their_keys_and_indexes():
+    class Recorder:
+        statements = []
+
+        def execute(self, query, params=None):
+            self.statements.append(query)
+
+    cursor = Recorder()
+    summaries.ensure_summary_tables(cursor)
+    created = [statement for statement in cursor.statements if statement.startswith("CREATE TABLE")]
+    assert len(created) == len(summaries.SUMMARY_TABLES)
+    assert any("PRIMARY KEY (channel_id, day)" in statement for statement in created)
+    indexes = sum(len(spec["indexes"]) for spec in summaries.SUMMARY_TABLES.values())
+    assert len(cursor.statements) == len(created) + indexes
@@ -0,0 +1,122 @@
+import contextvars
+import json
+import threading
+
+import pytest
+from src.backend.models import llm_model
+from src.backend.utils import metrics, tracing
+
+
+@pytest.fixture
+def traces(monkeypatch):
+    """The trace records logged, parsed back from their JSON lines."""
+    logged = []
+
+    def info(message):
+        if message.startswith("trace "):
+            logged.append(json.loads(message[len("trace "):]))
+
+    monkeypatch.setattr(tracing.logger, "info", info)
+    return logged
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty metrics registry, so only the metrics made by the test are rendered."""
+    monkeypatch.setattr(metrics, "_registry", [])
+    monkeypatch.setattr(metrics, "_collectors", [])
+
+
+def test_counters_and_histograms_render_in_the_prometheus_format(registry):
+    requests = metrics.Counter("requests_total", "Requests.", ["path"])
+    latency = metrics.Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(path='say "hi"')
+    requests.inc(2, path='say "hi"')
+    for seconds in (0.05, 0.5, 5.0):
+        latency.observe(seconds)
+    metrics.register_collector(lambda: [("cache_size", "gauge", "Entries.", [({"cache": "answers"}, 7)])])
+
+    assert metrics.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="say \\"hi\\""} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_count 3",
+        "latency_seconds_sum 5.55",
+        "# HELP cache_size Entries.",
+        "# TYPE cache_size gauge",
+        'cache_size{cache="answers"} 7',
+    ]
+
+
+def test_percentile():
+    assert metrics.percentile([], 50) is None
+    assert metrics.percentile([5, 1, 3, 2, 4], 50) == 3
+    assert metrics.percentile(range(1, 101), 95) == 95
+
+
+def test_a_trace_collects_the_spans_of_its_threads(traces):
+    with tracing.trace("chat", prompt="hi") as record:
+        with tracing.span("sql", source="app") as fields:
+            fields["rows"] = 3
+        context = contextvars.copy_context()
+        worker = threading.Thread(target=context.run, args=(tracing.record_span, "youtube", 0.25), kwargs={"hits": 1})
+        worker.start()
+        worker.join()
+        tracing.annotate(path="llm")
+
+    assert traces == [record]
+    assert record["trace"] == "chat" and record["prompt"] == "hi" and record["path"] == "llm"
+    assert [span["span"] for span in record["spans"]] == ["sql", "youtube"]
+    assert record["spans"][0]["rows"] == 3 and record["spans"][1] == {"span": "youtube", "ms": 250.0, "hits": 1}
+
+
+def test_spans_outside_a_trace_only_feed_the_metrics(traces):
+    tokens = tracing.LLM_TOKENS._values.copy()
+    tracing.record_span("answer", 0.1, prompt_tokens=40, completion_tokens=0)
+    assert traces == []
+    assert tracing.LLM_TOKENS._values.get(("answer", "prompt")) == tokens.get(("answer", "prompt"), 0) + 40
+    assert tracing.LLM_TOKENS._values.get(("answer", "completion")) == tokens.get(("answer", "completion"))
+
+
+@pytest.fixture
+def explained(monkeypatch):
+    """Slow-query log at 10 ms with EXPLAIN on; records the queries sent to be explained."""
+    submitted = []
+
+    class Executor:
+        def submit(self, function, query, *args):
+            submitted.append(query)
+
+    monkeypatch.setattr(tracing, "SLOW_QUERY_MS", 10)
+    monkeypatch.setattr(tracing, "SLOW_QUERY_EXPLAIN", True)
+    monkeypatch.setattr(tracing, "_explain_executor", Executor())
+    return submitted
+
+
+def test_only_slow_application_selects_are_explained(explained):
+    slow = tracing.SLOW_QUERIES._values.copy()
+    tracing.profile_query("SELECT 1", None, 0.001, rows=1, source="app")
+    tracing.profile_query("SELECT 2", None, 0.5, rows=1, source="app")
+    tracing.profile_query("SELECT 3", None, 0.5, rows=1, source="llm")
+    tracing.profile_query("ANALYZE videos", None, 0.5, source="app")
+
+    assert explained == ["SELECT 2"]
+    assert tracing.SLOW_QUERIES._values[("app",)] == slow.get(("app",), 0) + 2
+    assert tracing.SLOW_QUERIES._values[("llm",)] == slow.get(("llm",), 0) + 1
+
+
+def test_a_chat_request_is_traced_stage_by_stage(stub, traces, monkeypatch):
+    stub.tool_name = "trending_now"
+    stub.arguments = "{}"
+    monkeypatch.setattr(llm_model, "_tool_functions", {"trending_now": lambda: {"columns": ["video_id"], "rows": []}})
+    llm_model.run_conversation("what is trending")
+
+    (record,) = traces
+    assert record["trace"] == "chat" and record["path"] == "llm"
+    assert [span["span"] for span in record["spans"]] == ["plan", "tools", "answer"]
+    assert record["spans"][0]["prompt_tokens"] > 0
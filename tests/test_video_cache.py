@@ -0,0 +1,29 @@
+from src.backend.services import video_cache
+from src.backend.services.video_cache import VideoCache
+
+
+def test_video_cache_expires_entries_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(video_cache.time, "time", lambda: now[0])
+    cache = VideoCache(path=None, ttl=60)
+    cache.set_many({"a": {"title": "A"}, "gone": None})
+
+    now[0] += 59
+    assert cache.get_many(["a", "gone", "b"]) == ({"a": {"title": "A"}, "gone": None}, ["b"])
+    now[0] += 2
+    assert cache.get_many(["a", "gone"]) == ({}, ["a", "gone"])
+
+
+def test_video_cache_evicts_the_least_recently_used_entry():
+    cache = VideoCache(path=None, max_entries=2)
+    cache.set_many({"a": 1, "b": 2})
+    cache.get_many(["a"])
+    cache.set_many({"c": 3})
+
+    assert cache.get_many(["a", "b", "c"]) == ({"a": 1, "c": 3}, ["b"])
+
+
+def test_video_cache_persists_to_sqlite(tmp_path):
+    path = str(tmp_path / "videos.sqlite")
+    VideoCache(path=path).set_many({"a": {"title": "A"}})
+    assert VideoCache(path=path).get_many(["a"]) == ({"a": {"title": "A"}}, [])
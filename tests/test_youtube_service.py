@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+from benchmarks.stubs import youtube_stub
+from benchmarks.stubs.fake_youtube import FakeYouTube
+from src.backend.services import youtube_service
+from src.backend.services.quota import QuotaScheduler, RequestCoalescer
+from src.backend.services.video_cache import VideoCache
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """youtube_service with a memory-only cache and an unthrottled scheduler."""
+    monkeypatch.setattr(youtube_service, "video_cache", VideoCache(path=None))
+    monkeypatch.setattr(youtube_service, "coalescer", RequestCoalescer())
+    monkeypatch.setattr(youtube_service, "scheduler", QuotaScheduler(requests_per_second=1000, sleep=lambda s: None))
+    monkeypatch.setattr(youtube_service, "_local", threading.local())
+    return youtube_service
+
+
+def video_ids(count):
+    return [f"v{i:04d}" for i in range(count)]
+
+
+def test_lookups_are_batched_fifty_ids_per_call(service):
+    api = FakeYouTube(latency=0, missing={"v0007"})
+    details = service.get_video_details(video_ids(120) + video_ids(10), youtube=api)
+
+    assert api.calls == 3
+    assert sorted(api.requested_ids) == video_ids(120)
+    assert len(details) == 120
+    assert details["v0007"] is None
+    assert details["v0008"]["url"] == "https://www.youtube.com/watch?v=v0008"
+
+
+def test_cached_videos_cost_no_calls(service):
+    api = FakeYouTube(latency=0, missing={"v0001"})
+    first = service.get_video_details(video_ids(60), youtube=api)
+    assert service.get_video_details(video_ids(60), youtube=api) == first
+    assert api.calls == 2
+
+
+def test_lookups_through_the_http_stub(service, monkeypatch):
+    server, api = youtube_stub.serve(latency=0)
+    monkeypatch.setattr(service, "YOUTUBE_API_KEY", "stub")
+    monkeypatch.setattr(service, "YOUTUBE_API_ENDPOINT", f"http://127.0.0.1:{server.server_port}/youtube/v3/")
+    try:
+        links = service.get_video_links(video_ids(75))
+    finally:
+        server.shutdown()
+
+    assert api.calls == 2
+    assert links[0] == "**[Video v0000](https://www.youtube.com/watch?v=v0000)**"
+
+
+def test_lookups_stop_at_the_daily_quota(service, monkeypatch):
+    monkeypatch.setattr(service, "scheduler", QuotaScheduler(requests_per_second=1000, daily_quota=2))
+    api = FakeYouTube(latency=0)
+    details = service.get_video_details(video_ids(150), youtube=api)
+
+    assert api.calls == 2
+    assert len(details) == 100
+    assert service.scheduler.stats()["rejected"] == 1
+    assert service.get_video_links(["v0149"], youtube=api) == ["Error fetching details for video `v0149`."]
+
+
+def test_an_exhausted_api_quota_stops_further_calls(service):
+    api = FakeYouTube(latency=0, daily_quota=1)
+    service.get_video_details(video_ids(50), youtube=api)
+    service.get_video_details(video_ids(100)[50:], youtube=api)
+    service.get_video_details(video_ids(150)[100:], youtube=api)
+
+    # The second call is refused by the API; the third never leaves the scheduler
+    assert api.calls == 2
+    stats = service.scheduler.stats()
+    assert stats["quota_used"] == stats["daily_quota"]
+    assert stats["rejected"] == 1